@@ -9,6 +9,9 @@ db = SQLAlchemy()
 
 def create_app(config=None):
     """Create and configure the Flask application."""
+    from app.utils.startup import StartupTimer, finish_startup
+    startup = StartupTimer()
+    
     app = Flask(__name__)
     
     # Load configuration
@@ -24,13 +27,99 @@ def create_app(config=None):
     app.config['ADMIN_PASSWORD'] = os.environ.get('ADMIN_PASSWORD', 'shabbatlink2024')
     app.config['FRONTEND_URL'] = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
     
+    # Email delivery (used by the email worker, not by requests)
+    app.config['EMAIL_TRANSPORT'] = os.environ.get('EMAIL_TRANSPORT', 'console')  # 'console' or 'smtp'
+    app.config['EMAIL_FROM'] = os.environ.get('EMAIL_FROM', 'ShabbatLink <noreply@shabbatlink.com>')
+    app.config['SMTP_HOST'] = os.environ.get('SMTP_HOST', 'localhost')
+    app.config['SMTP_PORT'] = int(os.environ.get('SMTP_PORT', '25'))
+    app.config['SMTP_USERNAME'] = os.environ.get('SMTP_USERNAME')
+    app.config['SMTP_PASSWORD'] = os.environ.get('SMTP_PASSWORD')
+    app.config['SMTP_USE_TLS'] = os.environ.get('SMTP_USE_TLS', 'false').lower() == 'true'
+    
+    # Bulk day-of emails cover matches finalized within this many days (one event)
+    app.config['EVENT_WINDOW_DAYS'] = int(os.environ.get('EVENT_WINDOW_DAYS', '6'))
+    
+    # Unused, unexpired magic links allowed per email before requests stop sending
+    app.config['MAGIC_LINK_MAX_OUTSTANDING'] = int(os.environ.get('MAGIC_LINK_MAX_OUTSTANDING', '3'))
+    
+    # Rate limiting for public registration/login routes (see utils/rate_limit.py)
+    app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    app.config['RATE_LIMIT_STORE'] = os.environ.get('RATE_LIMIT_STORE', 'memory')  # 'memory' or 'database'
+    app.config['RATE_LIMIT_PER_IP'] = os.environ.get('RATE_LIMIT_PER_IP', '30/minute')
+    app.config['RATE_LIMIT_PER_EMAIL'] = os.environ.get('RATE_LIMIT_PER_EMAIL', '5/minute')
+    app.config['RATE_LIMIT_TRUST_PROXY'] = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+    app.config['RATE_LIMIT_PROXY_HOPS'] = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', '1'))  # Proxies appending to X-Forwarded-For
+    
+    # Activity log retention (used by `manage.py archive-activity`)
+    app.config['ACTIVITY_RETENTION_DAYS'] = int(os.environ.get('ACTIVITY_RETENTION_DAYS', '90'))
+    app.config['ACTIVITY_ARCHIVE_DIR'] = os.environ.get('ACTIVITY_ARCHIVE_DIR', 'archive/activity')
+    
+    # On-demand cProfile of admin requests (see utils/profiler.py)
+    app.config['PROFILER_ENABLED'] = os.environ.get('PROFILER_ENABLED', 'false').lower() == 'true'
+    app.config['PROFILER_DIR'] = os.environ.get('PROFILER_DIR', 'profiles')
+    app.config['PROFILER_TOP'] = int(os.environ.get('PROFILER_TOP', '30'))
+    
+    # 'sync' registers in the request; 'async' queues registrations for
+    # `manage.py intake-worker` and answers 202 (see services/registration_intake.py)
+    app.config['INTAKE_MODE'] = os.environ.get('INTAKE_MODE', 'sync')
+    
+    # Stored responses for retried requests (see utils/idempotency.py)
+    app.config['IDEMPOTENCY_TTL_SECONDS'] = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+    
+    # Only one matching run at a time (see utils/job_lock.py)
+    app.config['MATCHING_LOCK_LEASE_SECONDS'] = int(os.environ.get('MATCHING_LOCK_LEASE_SECONDS', '600'))
+    app.config['MATCHING_LOCK_WAIT_SECONDS'] = int(os.environ.get('MATCHING_LOCK_WAIT_SECONDS', '60'))
+    
+    # Slow-query log with background EXPLAIN (see utils/slow_queries.py); 0 disables
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '250'))
+    app.config['SLOW_QUERY_LOG_SIZE'] = int(os.environ.get('SLOW_QUERY_LOG_SIZE', '200'))
+    app.config['SLOW_QUERY_LOG_PARAMETERS'] = os.environ.get('SLOW_QUERY_LOG_PARAMETERS', 'false').lower() == 'true'
+    
+    # Primary key ids (see utils/ids.py)
+    app.config['ID_FORMAT'] = os.environ.get('ID_FORMAT', 'uuid7')  # 'uuid7' or 'uuid4'
+    app.config['ID_STORAGE'] = os.environ.get('ID_STORAGE', 'string')  # 'string' or 'native'
+    
+    # SQLite tuning for multi-worker deployments (see utils/sqlite_profile.py)
+    app.config['SQLITE_PROFILE'] = os.environ.get('SQLITE_PROFILE', 'default')  # 'default' or 'production'
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    app.config['SQLITE_CACHE_SIZE_KB'] = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '65536'))
+    app.config['SQLITE_SINGLE_WRITER'] = os.environ.get('SQLITE_SINGLE_WRITER', 'true').lower() == 'true'
+    
+    # Apply pending migrations on startup instead of via `manage.py migrate`
+    app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', 'false').lower() == 'true'
+    
     # Apply any custom config
     if config:
         app.config.update(config)
+    startup.mark('config')
     
     # Initialize extensions
     db.init_app(app)
     
+    # Before anything opens a connection: Id column storage, then SQLite pragmas
+    from app.utils.ids import init_ids
+    init_ids(app)
+    from app.utils.sqlite_profile import init_sqlite_profile
+    init_sqlite_profile(app)
+    
+    # Request/SQL metrics; registered first so its after_request hook runs
+    # last and includes the unit-of-work commit
+    from app.utils.metrics import init_metrics
+    init_metrics(app)
+    
+    # One commit per request (see utils/unit_of_work.py)
+    from app.utils.unit_of_work import init_unit_of_work
+    init_unit_of_work(app)
+    
+    from app.utils.rate_limit import init_rate_limiting
+    init_rate_limiting(app)
+    
+    from app.utils.profiler import init_profiler
+    init_profiler(app)
+    
+    from app.utils.slow_queries import init_slow_query_log
+    init_slow_query_log(app)
+    
     # Configure CORS - allow both local development and production frontend
     allowed_origins = [
         app.config['FRONTEND_URL'],
@@ -43,18 +132,22 @@ def create_app(config=None):
         r"/api/*": {
             "origins": allowed_origins,
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "X-Profile", "Idempotency-Key"],
+            "expose_headers": ["Idempotent-Replayed"],
             "supports_credentials": True
         }
     })
+    startup.mark('extensions')
     
-    # Register blueprints
+    # Register blueprints. Their modules import only what routing needs; the
+    # matching engine and email templates load on first use
     from app.routes.guests import guests_bp
     from app.routes.hosts import hosts_bp
     from app.routes.auth import auth_bp
     from app.routes.admin import admin_bp
     from app.routes.matches import matches_bp
     from app.routes.attendance import attendance_bp
+    from app.routes.intake import intake_bp
     
     app.register_blueprint(guests_bp, url_prefix='/api/guests')
     app.register_blueprint(hosts_bp, url_prefix='/api/hosts')
@@ -62,9 +155,16 @@ def create_app(config=None):
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(matches_bp, url_prefix='/api/matches')
     app.register_blueprint(attendance_bp, url_prefix='/api/attendance')
+    app.register_blueprint(intake_bp, url_prefix='/api/intake')
+    startup.mark('blueprints')
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # The schema is created and upgraded by `manage.py migrate` (see
+    # migrations/runner.py), not on every boot
+    if app.config['AUTO_MIGRATE']:
+        from app.migrations import upgrade
+        with app.app_context():
+            upgrade(db.engine, log=app.logger.info)
+        startup.mark('migrations')
     
+    finish_startup(app, startup)
     return app
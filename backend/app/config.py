@@ -90,6 +90,7 @@ class EmailType(str, Enum):
     HOST_SUBMISSION_CONFIRMATION = "host_submission_confirmation"
     MAGIC_LINK = "magic_link"
     MATCH_REQUEST_TO_HOST = "match_request_to_host"
+    MATCH_REQUEST_DIGEST_TO_HOST = "match_request_digest_to_host"
     MATCH_CONFIRMED_GUEST = "match_confirmed_guest"
     MATCH_CONFIRMED_HOST = "match_confirmed_host"
     MATCH_DECLINED_ADMIN = "match_declined_admin"
@@ -105,6 +106,14 @@ class EmailStatus(str, Enum):
     FAILED = "failed"
 
 
+class IntakeStatus(str, Enum):
+    """Queued registration status (INTAKE_MODE=async)."""
+    PENDING = "pending"
+    APPLIED = "applied"
+    REJECTED = "rejected"
+    FAILED = "failed"
+
+
 class ActivityType(str, Enum):
     """Activity log action types."""
     GUEST_REGISTERED = "guest_registered"
@@ -121,3 +130,4 @@ class ActivityType(str, Enum):
     MATCH_FINALIZED = "match_finalized"
     GUEST_CONFIRMED_ATTENDANCE = "guest_confirmed_attendance"
     NOSHOW_REPORTED = "noshow_reported"
+    BULK_EMAILS_QUEUED = "bulk_emails_queued"
@@ -10,7 +10,12 @@ CRITICAL INVARIANTS:
 - No guest is ever assigned to multiple hosts
 - No host capacity ever goes negative
 - party_size is correctly subtracted from capacity
+
+stats include pair counters and `phase_ms` (eligibility, scoring, sorting,
+assignment, explanation, invariants). Eligibility time is the pair loop minus
+time spent scoring.
 """
+import time
 from typing import List, Dict, Tuple
 from app.matching.interface import MatchingEngineInterface
 from app.matching.data_types import (
@@ -20,6 +25,7 @@ from app.matching.data_types import (
 from app.matching.eligibility import is_eligible
 from app.matching.scoring import calculate_total_score
 from app.matching.explainer import generate_explanation
+from app.matching.timing import PhaseTimer
 
 
 class DefaultMatchingEngine(MatchingEngineInterface):
@@ -40,6 +46,10 @@ class DefaultMatchingEngine(MatchingEngineInterface):
         config: MatchingConfig
     ) -> MatchingResult:
         """Generate matches between guests and hosts."""
+        timer = PhaseTimer()
+        perf_counter = time.perf_counter
+        pairs_checked = pairs_eligible = pairs_scored = pairs_above_threshold = 0
+        scoring_seconds = sorting_seconds = explanation_seconds = 0.0
         
         # Track remaining capacity per host
         remaining_capacity: Dict[str, int] = {
@@ -61,6 +71,7 @@ class DefaultMatchingEngine(MatchingEngineInterface):
         # Calculate scores and eligible hosts for each guest
         guest_options: List[Tuple[GuestData, List[Tuple[str, float]]]] = []
         
+        pairs_started = perf_counter()
         for guest in guests:
             # Skip flagged guests with too many no-shows
             if guest.is_flagged and guest.no_show_count >= 2:
@@ -69,23 +80,38 @@ class DefaultMatchingEngine(MatchingEngineInterface):
             
             # Find all eligible hosts and their scores
             eligible_hosts = []
+            pairs_checked += len(hosts)
             for host in hosts:
                 capacity = remaining_capacity[host.id]
                 if is_eligible(guest, host, capacity):
+                    pairs_eligible += 1
+                    scoring_started = perf_counter()
                     score = calculate_total_score(
                         guest, host, capacity, total_capacity, config
                     )
+                    scoring_seconds += perf_counter() - scoring_started
+                    pairs_scored += 1
                     if score >= config.min_score_threshold:
                         eligible_hosts.append((host.id, score))
             
             # Sort by score descending
+            sorting_started = perf_counter()
             eligible_hosts.sort(key=lambda x: x[1], reverse=True)
+            sorting_seconds += perf_counter() - sorting_started
+            pairs_above_threshold += len(eligible_hosts)
             guest_options.append((guest, eligible_hosts))
         
+        pairs_seconds = perf_counter() - pairs_started
+        timer.add('eligibility', pairs_seconds - scoring_seconds - sorting_seconds)
+        timer.add('scoring', scoring_seconds)
+        
         # Sort guests by number of options (fewest first = hardest to place)
-        guest_options.sort(key=lambda x: len(x[1]))
+        with timer.phase('sorting'):
+            guest_options.sort(key=lambda x: len(x[1]))
+        timer.add('sorting', sorting_seconds)
         
         # Assign guests
+        assignment_started = perf_counter()
         for guest, options in guest_options:
             if guest.id in assigned_guests:
                 # Should never happen, but safety check
@@ -110,12 +136,16 @@ class DefaultMatchingEngine(MatchingEngineInterface):
             if matched_host_id:
                 host = host_lookup[matched_host_id]
                 
+                explanation_started = perf_counter()
+                why_fit = generate_explanation(guest, host)
+                explanation_seconds += perf_counter() - explanation_started
+                
                 # Create match
                 match = ProposedMatch(
                     guest_id=guest.id,
                     host_id=matched_host_id,
                     score=next(s for h, s in options if h == matched_host_id),
-                    why_fit=generate_explanation(guest, host),
+                    why_fit=why_fit,
                     alternatives=alternatives
                 )
                 matches.append(match)
@@ -132,8 +162,12 @@ class DefaultMatchingEngine(MatchingEngineInterface):
             else:
                 unmatched.append(guest.id)
         
+        timer.add('assignment', perf_counter() - assignment_started - explanation_seconds)
+        timer.add('explanation', explanation_seconds)
+        
         # Verify invariants
-        self._verify_invariants(matches, guests, hosts, remaining_capacity)
+        with timer.phase('invariants'):
+            self._verify_invariants(matches, guests, hosts, remaining_capacity)
         
         return MatchingResult(
             matches=matches,
@@ -143,7 +177,12 @@ class DefaultMatchingEngine(MatchingEngineInterface):
                 'matched_guests': len(matches),
                 'unmatched_guests': len(unmatched),
                 'hosts_used': len(set(m.host_id for m in matches)),
-                'total_hosts': len(hosts)
+                'total_hosts': len(hosts),
+                'pairs_checked': pairs_checked,
+                'pairs_eligible': pairs_eligible,
+                'pairs_scored': pairs_scored,
+                'pairs_above_threshold': pairs_above_threshold,
+                'phase_ms': timer.as_ms()
             }
         )
     
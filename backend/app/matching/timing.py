@@ -0,0 +1,35 @@
+"""
+Phase timing for matching runs.
+
+Plain Python (no Flask/SQLAlchemy), shared by the engine and the adapter so a
+run's stats carry one `phase_ms` dict covering both sides.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class PhaseTimer:
+    """Accumulates wall-clock time per named phase, in the order phases first appear."""
+
+    def __init__(self):
+        self._seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+
+    def update(self, phase_ms: Dict[str, float]) -> None:
+        """Merge phases already reported in milliseconds (e.g. from engine stats)."""
+        for name, ms in phase_ms.items():
+            self.add(name, ms / 1000)
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self._seconds.items()}
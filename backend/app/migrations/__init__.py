@@ -0,0 +1,4 @@
+"""Schema migrations (`python manage.py migrate`); see runner.py."""
+from app.migrations.runner import MIGRATIONS, pending, upgrade
+
+__all__ = ['MIGRATIONS', 'pending', 'upgrade']
@@ -0,0 +1,88 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module in app/migrations with a VERSION, a NAME and an
+upgrade(connection) function, listed in MIGRATIONS. upgrade() applies the
+pending ones in order, recording each in the schema_migrations table, all
+in one transaction (PostgreSQL and SQLite both have transactional DDL): if
+one fails, none of them is applied and the next run starts over.
+
+Concurrent runs (several workers starting at once) are serialized: on
+PostgreSQL by an advisory lock for the transaction, on SQLite by BEGIN
+IMMEDIATE. The applied versions are re-read once the lock is held.
+
+v0001 creates every table from the current models, so on a new database
+it already builds the latest schema. Later migrations therefore check
+before they change anything (CREATE INDEX IF NOT EXISTS, adding a column
+only if it is missing); they do real work only on databases created by an
+older version.
+"""
+import zlib
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+
+from app.migrations import (
+    v0001_baseline, v0002_catch_up_columns, v0003_query_indexes, v0004_rate_limit_bucket_index,
+    v0005_widen_email_lease_owner
+)
+
+
+MIGRATIONS = [
+    v0001_baseline, v0002_catch_up_columns, v0003_query_indexes, v0004_rate_limit_bucket_index,
+    v0005_widen_email_lease_owner
+]
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+def _lock(connection):
+    """Begin the migration transaction, holding the migration lock."""
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({zlib.crc32(b'schema_migrations')})")
+    elif connection.dialect.name == 'sqlite':
+        connection.connection.dbapi_connection.execute('BEGIN IMMEDIATE')
+
+
+def applied_versions(connection):
+    """Versions already applied, or an empty set on a database never migrated."""
+    if not connection.dialect.has_table(connection, schema_migrations.name):
+        return set()
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine):
+    """Migrations not yet applied to the database."""
+    with engine.connect() as connection:
+        done = applied_versions(connection)
+    return [migration for migration in MIGRATIONS if migration.VERSION not in done]
+
+
+def upgrade(engine, log=print):
+    """Apply every pending migration. Returns the versions applied."""
+    if not pending(engine):
+        return []
+
+    applied = []
+    with engine.connect() as connection:
+        _lock(connection)
+        schema_migrations.create(connection, checkfirst=True)
+        done = applied_versions(connection)
+
+        for migration in MIGRATIONS:
+            if migration.VERSION in done:
+                continue
+            migration.upgrade(connection)
+            connection.execute(insert(schema_migrations).values(
+                version=migration.VERSION, name=migration.NAME, applied_at=datetime.utcnow()
+            ))
+            applied.append(migration.VERSION)
+            log(f"Applied migration {migration.VERSION:04d} {migration.NAME}")
+
+        connection.commit()
+    return applied
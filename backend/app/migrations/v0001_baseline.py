@@ -0,0 +1,11 @@
+"""Create every table (and its indexes) that does not exist yet, from the models."""
+from app import db
+import app.models  # noqa: F401 - registers every table on db.metadata
+
+
+VERSION = 1
+NAME = 'baseline'
+
+
+def upgrade(connection):
+    db.metadata.create_all(connection)
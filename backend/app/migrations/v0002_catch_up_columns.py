@@ -0,0 +1,70 @@
+"""
+Bring databases created before migrations up to the current columns.
+
+Until now new columns only reached existing databases by hand (ALTER TABLE
+notes in the README):
+
+- matches.version (compare-and-swap status changes), matches.snapshot_hwm
+- the email outbox columns, with emails.body now nullable
+- magic_links.token_hash replacing the raw token. The table is recreated:
+  links only live 15 minutes.
+"""
+from sqlalchemy import inspect
+
+from app.models import Email, MagicLink
+
+
+VERSION = 2
+NAME = 'catch_up_columns'
+
+ADD_COLUMNS = {
+    'matches': [
+        ('version', 'INTEGER NOT NULL DEFAULT 1'),
+        ('snapshot_hwm', 'TIMESTAMP')
+    ],
+    'emails': [
+        ('template_id', 'VARCHAR(100)'),
+        ('params', 'JSON'),
+        ('attempts', 'INTEGER NOT NULL DEFAULT 0'),
+        ('next_attempt_at', 'TIMESTAMP'),
+        ('lease_owner', 'VARCHAR(100)'),
+        ('lease_expires_at', 'TIMESTAMP'),
+        ('last_error', 'TEXT')
+    ]
+}
+
+
+def _columns(connection, table):
+    return {column['name']: column for column in inspect(connection).get_columns(table)}
+
+
+def _rebuild_sqlite_table(connection, table):
+    """Recreate a table from its model, keeping its rows (SQLite cannot ALTER a column)."""
+    old = f'{table.name}_before_v{VERSION:04d}'
+    for index in inspect(connection).get_indexes(table.name):
+        connection.exec_driver_sql(f'DROP INDEX IF EXISTS {index["name"]}')
+    connection.exec_driver_sql(f'ALTER TABLE {table.name} RENAME TO {old}')
+    table.create(connection)
+
+    kept = ', '.join(name for name in _columns(connection, old) if name in table.columns)
+    connection.exec_driver_sql(f'INSERT INTO {table.name} ({kept}) SELECT {kept} FROM {old}')
+    connection.exec_driver_sql(f'DROP TABLE {old}')
+
+
+def upgrade(connection):
+    for table, columns in ADD_COLUMNS.items():
+        existing = _columns(connection, table)
+        for name, ddl in columns:
+            if name not in existing:
+                connection.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}')
+
+    # Emails queued from templates have no stored body
+    if not _columns(connection, 'emails')['body']['nullable']:
+        if connection.dialect.name == 'sqlite':
+            _rebuild_sqlite_table(connection, Email.__table__)
+        else:
+            connection.exec_driver_sql('ALTER TABLE emails ALTER COLUMN body DROP NOT NULL')
+
+    if 'token_hash' not in _columns(connection, 'magic_links'):
+        MagicLink.__table__.drop(connection)
+        MagicLink.__table__.create(connection)
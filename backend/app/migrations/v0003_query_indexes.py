@@ -0,0 +1,59 @@
+"""
+Indexes for the queries the app actually runs (see benchmarks/query_plans.py).
+
+matches:
+- (host_id, status): host detail pages, seats taken per host, host digests
+- (guest_id, status): guest detail pages, a guest's current match
+- (status, created_at): the admin match list filtered by status, proposals
+  to send, the dashboard's stale-proposal count
+- (created_at): the unfiltered admin match list, newest first
+- PostgreSQL only: partial indexes on the active statuses, i.e. the guest
+  ids that already have a match (dashboard, matching run) and the hosts
+  with committed seats. They only hold the rows still in play, which stay
+  few while declined matches pile up. SQLite cannot use a partial index
+  for `status IN (?, ...)` with bound parameters, so it skips them.
+
+emails:
+- (created_at): the admin outbox list, newest first
+- (status, created_at): the email worker claiming the oldest queued emails
+- (lease_owner): the email worker loading the batch it just claimed
+
+activity_logs:
+- (created_at): archiving, rollups and the admin activity list. The model
+  declares it, but create_all skips the existing table on databases created
+  before that, so it is created here.
+"""
+from app.models.match import ACTIVE_STATUSES, COMMITTED_STATUSES
+
+
+VERSION = 3
+NAME = 'query_indexes'
+
+
+def _in(statuses):
+    return ', '.join(f"'{status}'" for status in statuses)
+
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS ix_matches_host_status ON matches (host_id, status)',
+    'CREATE INDEX IF NOT EXISTS ix_matches_guest_status ON matches (guest_id, status)',
+    'CREATE INDEX IF NOT EXISTS ix_matches_status_created ON matches (status, created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_matches_created_at ON matches (created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_emails_created_at ON emails (created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_emails_status_created ON emails (status, created_at)',
+    'CREATE INDEX IF NOT EXISTS ix_emails_lease_owner ON emails (lease_owner)',
+    'CREATE INDEX IF NOT EXISTS ix_activity_logs_created_at ON activity_logs (created_at)'
+]
+
+POSTGRESQL_INDEXES = [
+    f'CREATE INDEX IF NOT EXISTS ix_matches_active_guest ON matches (guest_id) '
+    f'WHERE status IN ({_in(ACTIVE_STATUSES)})',
+    f'CREATE INDEX IF NOT EXISTS ix_matches_committed_host ON matches (host_id) '
+    f'WHERE status IN ({_in(COMMITTED_STATUSES)})'
+]
+
+
+def upgrade(connection):
+    statements = INDEXES + (POSTGRESQL_INDEXES if connection.dialect.name == 'postgresql' else [])
+    for statement in statements:
+        connection.exec_driver_sql(statement)
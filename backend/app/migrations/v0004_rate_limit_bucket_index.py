@@ -0,0 +1,15 @@
+"""
+Index rate_limit_buckets.updated_at, so `manage.py sweep-rate-limit-buckets`
+finds idle buckets without scanning the table. The model declares it; this
+adds it to databases created before.
+"""
+
+
+VERSION = 4
+NAME = 'rate_limit_bucket_index'
+
+
+def upgrade(connection):
+    connection.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)'
+    )
@@ -0,0 +1,22 @@
+"""
+Widen emails.lease_owner from 64 to 100 characters, like
+registration_intake.lease_owner.
+
+The email worker's claim id is "<hostname>-<pid>:<12 hex digits>", and long
+hostnames (Kubernetes pod names, FQDNs) pushed it past 64 characters, which
+PostgreSQL rejects on every claim. SQLite does not enforce VARCHAR lengths,
+so there is nothing to change there.
+"""
+from sqlalchemy import inspect
+
+
+VERSION = 5
+NAME = 'widen_email_lease_owner'
+
+
+def upgrade(connection):
+    if connection.dialect.name == 'sqlite':
+        return
+    column = next(column for column in inspect(connection).get_columns('emails') if column['name'] == 'lease_owner')
+    if (column['type'].length or 0) < 100:
+        connection.exec_driver_sql('ALTER TABLE emails ALTER COLUMN lease_owner TYPE VARCHAR(100)')
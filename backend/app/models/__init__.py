@@ -5,5 +5,13 @@ from app.models.match import Match
 from app.models.magic_link import MagicLink
 from app.models.email import Email
 from app.models.activity_log import ActivityLog
+from app.models.activity_rollup import ActivityRollup
+from app.models.rate_limit_bucket import RateLimitBucket
+from app.models.job_lease import JobLease
+from app.models.registration_intake import RegistrationIntake
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ['Guest', 'Host', 'Match', 'MagicLink', 'Email', 'ActivityLog']
+__all__ = [
+    'Guest', 'Host', 'Match', 'MagicLink', 'Email', 'ActivityLog', 'ActivityRollup', 'RateLimitBucket', 'JobLease',
+    'RegistrationIntake', 'IdempotencyKey'
+]
@@ -1,22 +1,22 @@
 """ActivityLog model for audit trail."""
-import uuid
 from datetime import datetime
 from app import db
+from app.utils.ids import Id, new_id
 
 
 class ActivityLog(db.Model):
     """Activity log for tracking all actions."""
     __tablename__ = 'activity_logs'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
     action_type = db.Column(db.String(100), nullable=False)
     actor = db.Column(db.String(50), nullable=False)  # 'admin', 'system', 'guest', 'host'
     target_type = db.Column(db.String(50), nullable=True)  # 'guest', 'host', 'match'
-    target_id = db.Column(db.String(36), nullable=True)
+    target_id = db.Column(Id, nullable=True)
     details = db.Column(db.JSON, nullable=True)
     
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     
     @classmethod
     def log(cls, action_type, actor='system', target_type=None, target_id=None, details=None):
@@ -0,0 +1,26 @@
+"""ActivityRollup model - daily activity counts kept after raw logs are archived."""
+from app import db
+
+
+class ActivityRollup(db.Model):
+    """Number of activity log entries per day, action type and actor."""
+    __tablename__ = 'activity_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'action_type', 'actor', name='uq_activity_rollup_day_action_actor'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    
+    day = db.Column(db.Date, nullable=False, index=True)
+    action_type = db.Column(db.String(100), nullable=False)
+    actor = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        """Convert to dictionary."""
+        return {
+            'day': self.day.isoformat(),
+            'action_type': self.action_type,
+            'actor': self.actor,
+            'count': self.count
+        }
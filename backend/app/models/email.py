@@ -1,42 +1,88 @@
-"""Email model for simulated email queue."""
-import uuid
-from datetime import datetime
+"""Email model for the outbound email queue (outbox)."""
+from datetime import datetime, timedelta
 from app import db
+from app.utils.ids import Id, new_id
 from app.config import EmailStatus
 
 
 class Email(db.Model):
-    """Email model for simulated email sending."""
+    """Email model - one row per outbound message, delivered by the email worker."""
     __tablename__ = 'emails'
+    __table_args__ = (
+        db.Index('ix_emails_created_at', 'created_at'),  # Admin outbox list
+        db.Index('ix_emails_status_created', 'status', 'created_at'),  # Worker claims, oldest queued first
+        db.Index('ix_emails_lease_owner', 'lease_owner'),  # Worker loads the batch it claimed
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
     to_email = db.Column(db.String(255), nullable=False)
     to_name = db.Column(db.String(255), nullable=True)
     email_type = db.Column(db.String(100), nullable=False)
     subject = db.Column(db.String(500), nullable=False)
-    body = db.Column(db.Text, nullable=False)
+    
+    # Stored as template + parameters; the body is rendered on delivery/view
+    template_id = db.Column(db.String(100), nullable=True)
+    params = db.Column(db.JSON, nullable=True)
+    body = db.Column(db.Text, nullable=True)  # Only set on rows queued before templates
     
     status = db.Column(db.String(20), nullable=False, default=EmailStatus.QUEUED.value)
     sent_at = db.Column(db.DateTime, nullable=True)
     
+    # Outbox delivery state (see services/email_delivery.py)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)  # None = deliver asap
+    lease_owner = db.Column(db.String(100), nullable=True)  # Claim id of the worker delivering it
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     def mark_sent(self):
-        """Mark the email as sent (simulated)."""
+        """Mark the email as delivered and release the worker's lease."""
         self.status = EmailStatus.SENT.value
         self.sent_at = datetime.utcnow()
+        self.lease_owner = None
+        self.lease_expires_at = None
+    
+    def mark_failed_attempt(self, error, max_attempts, backoff_seconds):
+        """Record a failed delivery; retry later with exponential backoff or give up."""
+        self.attempts += 1
+        self.last_error = str(error)[:2000]
+        self.lease_owner = None
+        self.lease_expires_at = None
+        
+        if self.attempts >= max_attempts:
+            self.status = EmailStatus.FAILED.value
+            self.next_attempt_at = None
+        else:
+            delay = backoff_seconds * (2 ** (self.attempts - 1))
+            self.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+    
+    def render_body(self):
+        """Render the body from its template (or return a legacy stored body)."""
+        if self.body is not None:
+            return self.body
+        
+        from app.services.email_templates import render_body
+        return render_body(self.template_id, self.params or {})
     
-    def to_dict(self):
-        """Convert to dictionary."""
-        return {
+    def to_dict(self, include_body=False):
+        """Convert to dictionary (metadata only unless include_body)."""
+        data = {
             'id': self.id,
             'to_email': self.to_email,
             'to_name': self.to_name,
             'email_type': self.email_type,
             'subject': self.subject,
-            'body': self.body,
             'status': self.status,
             'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
             'created_at': self.created_at.isoformat()
         }
+        
+        if include_body:
+            data['body'] = self.render_body()
+        
+        return data
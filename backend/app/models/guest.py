@@ -1,14 +1,14 @@
 """Guest model for dinner attendees."""
-import uuid
 from datetime import datetime
 from app import db
+from app.utils.ids import Id, new_id
 
 
 class Guest(db.Model):
     """Guest model - a person looking to attend Friday night dinner."""
     __tablename__ = 'guests'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
     # Profile data (reusable)
     full_name = db.Column(db.String(255), nullable=False)
@@ -53,6 +53,30 @@ class Guest(db.Model):
     # Relationships
     matches = db.relationship('Match', backref='guest', lazy='dynamic')
     
+    @classmethod
+    def from_registration(cls, data):
+        """Build a new guest from validated registration data."""
+        return cls(
+            full_name=data['full_name'],
+            email=data['email'],
+            phone=data['phone'],
+            gender=data['gender'],
+            party_size=data['party_size'],
+            neighborhood=data['neighborhood'],
+            max_travel_time=data['max_travel_time'],
+            languages=data['languages'],
+            kosher_requirement=data['kosher_requirement'],
+            contribution_range=data['contribution_range'],
+            vibe_chabad=data['vibe_chabad'],
+            vibe_social=data['vibe_social'],
+            vibe_formality=data['vibe_formality'],
+            attended_jlc_before=data.get('attended_jlc_before', False),
+            facebook_url=data.get('facebook_url'),
+            instagram_handle=data.get('instagram_handle'),
+            notes_to_admin=data.get('notes_to_admin'),
+            no_show_acknowledged=data['no_show_acknowledged']
+        )
+    
     def to_dict(self, include_private=False):
         """Convert to dictionary for API responses."""
         data = {
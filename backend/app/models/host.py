@@ -1,14 +1,14 @@
 """Host model for dinner hosts."""
-import uuid
 from datetime import datetime
 from app import db
+from app.utils.ids import Id, new_id
 
 
 class Host(db.Model):
     """Host model - a person offering seats for Friday night dinner."""
     __tablename__ = 'hosts'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
     # Profile data (reusable)
     full_name = db.Column(db.String(255), nullable=False)
@@ -42,6 +42,27 @@ class Host(db.Model):
     # Relationships
     matches = db.relationship('Match', backref='host', lazy='dynamic')
     
+    @classmethod
+    def from_registration(cls, data):
+        """Build a new host from validated registration data."""
+        return cls(
+            full_name=data['full_name'],
+            email=data['email'],
+            phone=data['phone'],
+            neighborhood=data['neighborhood'],
+            address=data['address'],
+            seats_available=data['seats_available'],
+            languages=data['languages'],
+            kosher_level=data['kosher_level'],
+            contribution_preference=data['contribution_preference'],
+            vibe_chabad=data['vibe_chabad'],
+            vibe_social=data['vibe_social'],
+            vibe_formality=data['vibe_formality'],
+            tagline=data.get('tagline'),
+            private_notes=data.get('private_notes'),
+            no_show_acknowledged=data['no_show_acknowledged']
+        )
+    
     def to_dict(self, include_private=False, include_address=False):
         """Convert to dictionary for API responses."""
         data = {
@@ -94,16 +115,40 @@ class Host(db.Model):
         
         return data
     
-    def get_remaining_capacity(self):
-        """Calculate remaining seat capacity based on confirmed matches."""
-        from app.models.match import Match
+    @staticmethod
+    def _active_statuses():
         from app.config import MatchStatus
+        return [MatchStatus.ACCEPTED.value, MatchStatus.CONFIRMED.value, MatchStatus.REQUESTED.value, MatchStatus.PROPOSED.value]
+    
+    @classmethod
+    def seats_taken_by_host(cls):
+        """Seats taken by active matches, for every host, in one query: {host_id: seats}."""
+        from app.models.match import Match
+        from app.models.guest import Guest
+        
+        rows = db.session.query(
+            Match.host_id, db.func.sum(Guest.party_size)
+        ).join(Guest, Guest.id == Match.guest_id).filter(
+            Match.status.in_(cls._active_statuses())
+        ).group_by(Match.host_id).all()
+        
+        return {host_id: int(seats or 0) for host_id, seats in rows}
+    
+    def get_remaining_capacity(self, seats_taken=None):
+        """
+        Calculate remaining seat capacity based on active matches.
+        
+        Pass seats_taken (from seats_taken_by_host) when listing many hosts.
+        """
+        from app.models.match import Match
+        from app.models.guest import Guest
         
-        # Count seats taken by accepted/confirmed matches
-        active_matches = Match.query.filter(
-            Match.host_id == self.id,
-            Match.status.in_([MatchStatus.ACCEPTED.value, MatchStatus.CONFIRMED.value, MatchStatus.REQUESTED.value, MatchStatus.PROPOSED.value])
-        ).all()
+        if seats_taken is None:
+            seats_taken = db.session.query(
+                db.func.coalesce(db.func.sum(Guest.party_size), 0)
+            ).join(Match, Guest.id == Match.guest_id).filter(
+                Match.host_id == self.id,
+                Match.status.in_(self._active_statuses())
+            ).scalar()
         
-        seats_taken = sum(m.guest.party_size for m in active_matches)
         return self.seats_available - seats_taken
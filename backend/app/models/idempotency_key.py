@@ -0,0 +1,13 @@
+"""IdempotencyKey model - stored responses for retried requests (see utils/idempotency.py)."""
+from app import db
+
+
+class IdempotencyKey(db.Model):
+    """The response to one Idempotency-Key, kept until expires_at."""
+    __tablename__ = 'idempotency_keys'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of method, path and client key
+    request_hash = db.Column(db.String(32), nullable=False)  # Truncated sha256 of the body
+    status_code = db.Column(db.SmallInteger, nullable=True)  # Set once the view has answered
+    response = db.Column(db.JSON, nullable=True)
+    expires_at = db.Column(db.Float, nullable=False, index=True)  # Epoch seconds
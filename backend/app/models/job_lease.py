@@ -0,0 +1,16 @@
+"""JobLease model - one row per cluster-wide job lock (see utils/job_lock.py)."""
+from app import db
+
+
+class JobLease(db.Model):
+    """Who holds a job, until when, and the result of its last completed run."""
+    __tablename__ = 'job_leases'
+    
+    name = db.Column(db.String(100), primary_key=True)  # e.g. 'matching'
+    holder = db.Column(db.String(36), nullable=True)  # Null when free
+    acquired_at = db.Column(db.Float, nullable=True)  # Epoch seconds
+    expires_at = db.Column(db.Float, nullable=True)  # A crashed holder's lease lapses here
+    
+    # Last completed run, handed to requests that waited on it
+    result = db.Column(db.JSON, nullable=True)
+    completed_at = db.Column(db.Float, nullable=True)
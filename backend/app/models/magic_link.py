@@ -1,42 +1,69 @@
 """MagicLink model for profile editing authentication."""
-import uuid
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 from app import db
+from app.utils.ids import Id, new_id
 
 
 class MagicLink(db.Model):
     """Magic link for profile editing authentication (NOT for match actions)."""
     __tablename__ = 'magic_links'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
-    email = db.Column(db.String(255), nullable=False)
-    token = db.Column(db.String(64), unique=True, nullable=False)
+    email = db.Column(db.String(255), nullable=False, index=True)
+    # SHA-256 of the emailed token; the raw token is never stored
+    token_hash = db.Column(db.LargeBinary(32), unique=True, nullable=False)
     user_type = db.Column(db.String(10), nullable=False)  # 'guest' or 'host'
-    user_id = db.Column(db.String(36), nullable=False)
+    user_id = db.Column(Id, nullable=False)
     
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     used_at = db.Column(db.DateTime, nullable=True)
     
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
+    @staticmethod
+    def hash_token(token):
+        """Fixed-width digest stored and looked up instead of the raw token."""
+        return hashlib.sha256(token.encode()).digest()
+    
     @classmethod
     def create_for_user(cls, email, user_type, user_id, expires_minutes=15):
-        """Create a new magic link for a user."""
+        """
+        Create a new magic link for a user.
+        
+        The raw token is only available as `magic_link.token` on the returned
+        (unsaved) object, for building the emailed URL.
+        """
         token = secrets.token_urlsafe(32)
         expires_at = datetime.utcnow() + timedelta(minutes=expires_minutes)
         
         magic_link = cls(
             email=email,
-            token=token,
+            token_hash=cls.hash_token(token),
             user_type=user_type,
             user_id=user_id,
             expires_at=expires_at
         )
+        magic_link.token = token
         
         return magic_link
     
+    @classmethod
+    def find_by_token(cls, token):
+        """Look up a link by the raw token from the URL."""
+        return cls.query.filter_by(token_hash=cls.hash_token(token)).first()
+    
+    @classmethod
+    def count_outstanding(cls, email):
+        """Number of unused, unexpired links for an email."""
+        return cls.query.filter(
+            cls.email == email,
+            cls.used_at.is_(None),
+            cls.expires_at > datetime.utcnow()
+        ).count()
+    
     def is_valid(self):
         """Check if the magic link is still valid."""
         return self.used_at is None and datetime.utcnow() < self.expires_at
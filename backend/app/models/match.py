@@ -1,26 +1,47 @@
 """Match model for guest-host pairings."""
-import uuid
 from datetime import datetime
 from app import db
+from app.utils.ids import Id, new_id
 from app.config import MatchStatus
 
 
+# A guest with a match in one of these is matched; these hold a host's seats
+ACTIVE_STATUSES = (
+    MatchStatus.PROPOSED.value, MatchStatus.REQUESTED.value, MatchStatus.ACCEPTED.value, MatchStatus.CONFIRMED.value
+)
+COMMITTED_STATUSES = (MatchStatus.REQUESTED.value, MatchStatus.ACCEPTED.value, MatchStatus.CONFIRMED.value)
+
+
 class Match(db.Model):
     """Match model - a pairing between a guest and host."""
     __tablename__ = 'matches'
+    # Indexes for the admin and matching queries (see migrations/v0003_query_indexes.py)
+    __table_args__ = (
+        db.Index('ix_matches_host_status', 'host_id', 'status'),
+        db.Index('ix_matches_guest_status', 'guest_id', 'status'),
+        db.Index('ix_matches_status_created', 'status', 'created_at'),
+        db.Index('ix_matches_created_at', 'created_at'),
+        # The PostgreSQL-only partial indexes are created by the migration alone:
+        # a postgresql_where here would import the PostgreSQL dialect at startup
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     
     # Foreign keys
-    guest_id = db.Column(db.String(36), db.ForeignKey('guests.id'), nullable=False)
-    host_id = db.Column(db.String(36), db.ForeignKey('hosts.id'), nullable=False)
+    guest_id = db.Column(Id, db.ForeignKey('guests.id'), nullable=False)
+    host_id = db.Column(Id, db.ForeignKey('hosts.id'), nullable=False)
     
     # Match details
     status = db.Column(db.String(20), nullable=False, default=MatchStatus.PROPOSED.value)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped by services/match_state.py
     match_score = db.Column(db.Float, nullable=True)
     why_its_a_fit = db.Column(db.Text, nullable=True)
     admin_notes = db.Column(db.Text, nullable=True)
     
+    # Latest guest/host updated_at the matching run read (proposals only); a
+    # guest or host changed after this makes the proposal stale
+    snapshot_hwm = db.Column(db.DateTime, nullable=True)
+    
     # Status timestamps
     requested_at = db.Column(db.DateTime, nullable=True)  # When sent to host
     responded_at = db.Column(db.DateTime, nullable=True)  # When host accepted/declined
@@ -42,9 +63,11 @@ class Match(db.Model):
             'guest_id': self.guest_id,
             'host_id': self.host_id,
             'status': self.status,
+            'version': self.version,
             'match_score': self.match_score,
             'why_its_a_fit': self.why_its_a_fit,
             'admin_notes': self.admin_notes,
+            'snapshot_hwm': self.snapshot_hwm.isoformat() if self.snapshot_hwm else None,
             'requested_at': self.requested_at.isoformat() if self.requested_at else None,
             'responded_at': self.responded_at.isoformat() if self.responded_at else None,
             'finalized_at': self.finalized_at.isoformat() if self.finalized_at else None,
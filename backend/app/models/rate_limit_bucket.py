@@ -0,0 +1,11 @@
+"""RateLimitBucket model - shared token-bucket state for multi-worker deployments."""
+from app import db
+
+
+class RateLimitBucket(db.Model):
+    """One token bucket (see utils/rate_limit.py, RATE_LIMIT_STORE=database)."""
+    __tablename__ = 'rate_limit_buckets'
+    
+    key = db.Column(db.String(300), primary_key=True)  # '<endpoint>:<ip|email>:<value>'
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False, index=True)  # Epoch seconds of the last refill
@@ -0,0 +1,46 @@
+"""RegistrationIntake model - registrations queued for the intake worker."""
+from datetime import datetime
+from app import db
+from app.utils.ids import Id, new_id
+from app.config import IntakeStatus
+
+
+FAILED_MESSAGE = "Your registration could not be processed. Please contact us."
+
+
+class RegistrationIntake(db.Model):
+    """A validated guest/host registration waiting to be applied (INTAKE_MODE=async)."""
+    __tablename__ = 'registration_intake'
+    __table_args__ = (
+        db.Index('ix_registration_intake_status_created', 'status', 'created_at'),
+    )
+    
+    id = db.Column(Id, primary_key=True, default=new_id)  # Tracking id
+    
+    kind = db.Column(db.String(10), nullable=False)  # 'guest' or 'host'
+    payload = db.Column(db.JSON, nullable=False)  # The request body, already validated
+    status = db.Column(db.String(20), nullable=False, default=IntakeStatus.PENDING.value)
+    
+    # Outcome
+    result_id = db.Column(Id, nullable=True)  # Created guest/host id
+    error = db.Column(db.Text, nullable=True)  # Why it was rejected (or the worker's error if failed)
+    
+    # Claimed by a worker until lease_expires_at (see services/registration_intake.py)
+    lease_owner = db.Column(db.String(100), nullable=True, index=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        """Status for the submitter's poll (no payload)."""
+        return {
+            'tracking_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'id': self.result_id,
+            'error': FAILED_MESSAGE if self.status == IntakeStatus.FAILED.value else self.error,
+            'created_at': self.created_at.isoformat(),
+            'processed_at': self.processed_at.isoformat() if self.processed_at else None
+        }
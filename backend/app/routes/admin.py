@@ -1,12 +1,18 @@
 """Admin API endpoints."""
-from datetime import datetime
+import os
+from datetime import date, datetime
 from functools import wraps
-from flask import Blueprint, request, current_app
+from flask import Blueprint, Response, request, current_app, send_file
+from sqlalchemy.orm import defer, joinedload
 from app import db
-from app.models import Guest, Host, Match, Email, ActivityLog
+from app.models import Guest, Host, Match, Email, ActivityLog, ActivityRollup
 from app.services.email_service import EmailService
+from app.services.match_state import CONFLICT_MESSAGE, transition, transition_many, update_in_status
 from app.utils.responses import success_response, error_response
-from app.utils.tokens import generate_session_token, verify_session_token, generate_action_token
+from app.utils.idempotency import idempotent
+from app.utils.tokens import (
+    generate_session_token, verify_session_token, generate_action_token, generate_multi_target_token
+)
 from app.config import MatchStatus, ActivityType
 
 admin_bp = Blueprint('admin', __name__)
@@ -26,6 +32,12 @@ def admin_required(f):
         if not session:
             return error_response("Invalid or expired session", status_code=401)
         
+        if current_app.config['PROFILER_ENABLED']:
+            from app.utils.profiler import profile_view, requested_mode
+            mode = requested_mode()
+            if mode:
+                return profile_view(f, args, kwargs, mode)
+        
         return f(*args, **kwargs)
     return decorated_function
 
@@ -64,17 +76,12 @@ def get_dashboard():
         ])
     ).distinct().count()
     
-    pending_decisions = Match.query.filter(
-        Match.status == MatchStatus.REQUESTED.value
-    ).count()
-    
-    confirmed_matches = Match.query.filter(
-        Match.status == MatchStatus.CONFIRMED.value
-    ).count()
-    
-    accepted_awaiting = Match.query.filter(
-        Match.status == MatchStatus.ACCEPTED.value
-    ).count()
+    status_counts = dict(
+        db.session.query(Match.status, db.func.count(Match.id)).group_by(Match.status).all()
+    )
+    pending_decisions = status_counts.get(MatchStatus.REQUESTED.value, 0)
+    confirmed_matches = status_counts.get(MatchStatus.CONFIRMED.value, 0)
+    accepted_awaiting = status_counts.get(MatchStatus.ACCEPTED.value, 0)
     
     # Calculate alerts
     alerts = []
@@ -89,9 +96,13 @@ def get_dashboard():
         ])
     ).distinct()
     
-    unmatched_guests = Guest.query.filter(
+    # (and, in the same query, how many of them need strict kosher)
+    unmatched_guests, strict_kosher_unmatched = db.session.query(
+        db.func.count(Guest.id),
+        db.func.count(db.case((Guest.kosher_requirement == 'Full kosher only', 1)))
+    ).filter(
         ~Guest.id.in_(matched_guest_ids)
-    ).count()
+    ).one()
     
     if unmatched_guests > 0:
         alerts.append({
@@ -100,11 +111,6 @@ def get_dashboard():
         })
     
     # Strict kosher unmatched
-    strict_kosher_unmatched = Guest.query.filter(
-        Guest.kosher_requirement == 'Full kosher only',
-        ~Guest.id.in_(matched_guest_ids)
-    ).count()
-    
     if strict_kosher_unmatched > 0:
         alerts.append({
             'type': 'error',
@@ -112,11 +118,12 @@ def get_dashboard():
         })
     
     # Hosts with unused capacity
-    hosts_with_capacity = []
-    for host in Host.query.all():
-        remaining = host.get_remaining_capacity()
-        if remaining > 0:
-            hosts_with_capacity.append(host.full_name)
+    seats_taken = Host.seats_taken_by_host()
+    hosts_with_capacity = [
+        host_id
+        for host_id, seats_available in db.session.query(Host.id, Host.seats_available)
+        if seats_available - seats_taken.get(host_id, 0) > 0
+    ]
     
     if hosts_with_capacity:
         alerts.append({
@@ -124,6 +131,23 @@ def get_dashboard():
             'message': f"{len(hosts_with_capacity)} host(s) have unused capacity"
         })
     
+    # Proposals whose guest or host changed after the matching run read them
+    stale_proposals = Match.query.join(
+        Guest, Guest.id == Match.guest_id
+    ).join(
+        Host, Host.id == Match.host_id
+    ).filter(
+        Match.status == MatchStatus.PROPOSED.value,
+        Match.snapshot_hwm.isnot(None),
+        db.or_(Guest.updated_at > Match.snapshot_hwm, Host.updated_at > Match.snapshot_hwm)
+    ).count()
+    
+    if stale_proposals > 0:
+        alerts.append({
+            'type': 'warning',
+            'message': f"{stale_proposals} proposed match(es) involve a guest or host updated since matching ran"
+        })
+    
     # Accepted matches awaiting finalization
     if accepted_awaiting > 0:
         alerts.append({
@@ -139,7 +163,8 @@ def get_dashboard():
             'guests_placed': guests_with_match,
             'pending_decisions': pending_decisions,
             'confirmed_matches': confirmed_matches,
-            'accepted_awaiting': accepted_awaiting
+            'accepted_awaiting': accepted_awaiting,
+            'stale_proposals': stale_proposals
         },
         'alerts': alerts
     })
@@ -153,29 +178,31 @@ def list_guests():
     
     guests = Guest.query.order_by(Guest.created_at.desc()).all()
     
+    # Current (active) match per guest, loaded in one query
+    current_matches = {}
+    for match_id, guest_id, status in db.session.query(Match.id, Match.guest_id, Match.status).filter(
+        Match.status.in_([
+            MatchStatus.PROPOSED.value,
+            MatchStatus.REQUESTED.value,
+            MatchStatus.ACCEPTED.value,
+            MatchStatus.CONFIRMED.value
+        ])
+    ).order_by(Match.created_at):
+        current_matches.setdefault(guest_id, (match_id, status))
+    
     result = []
     for guest in guests:
         guest_data = guest.to_dict(include_private=True)
         
-        # Get current match status
-        current_match = Match.query.filter(
-            Match.guest_id == guest.id,
-            Match.status.in_([
-                MatchStatus.PROPOSED.value,
-                MatchStatus.REQUESTED.value,
-                MatchStatus.ACCEPTED.value,
-                MatchStatus.CONFIRMED.value
-            ])
-        ).first()
-        
-        guest_data['match_status'] = current_match.status if current_match else 'unmatched'
-        guest_data['match_id'] = current_match.id if current_match else None
+        current_match = current_matches.get(guest.id)
+        guest_data['match_status'] = current_match[1] if current_match else 'unmatched'
+        guest_data['match_id'] = current_match[0] if current_match else None
         
         # Filter by status if requested
         if status_filter:
             if status_filter == 'unmatched' and current_match:
                 continue
-            elif status_filter != 'unmatched' and (not current_match or current_match.status != status_filter):
+            elif status_filter != 'unmatched' and (not current_match or current_match[1] != status_filter):
                 continue
         
         result.append(guest_data)
@@ -194,7 +221,9 @@ def get_guest_detail(guest_id):
     guest_data = guest.to_dict(include_private=True)
     
     # Get match history
-    matches = Match.query.filter_by(guest_id=guest_id).order_by(Match.created_at.desc()).all()
+    matches = Match.query.options(joinedload(Match.host)).filter_by(
+        guest_id=guest_id
+    ).order_by(Match.created_at.desc()).all()
     guest_data['matches'] = [m.to_dict(include_host_details=True) for m in matches]
     
     return success_response(data=guest_data)
@@ -202,6 +231,7 @@ def get_guest_detail(guest_id):
 
 @admin_bp.route('/guests/<guest_id>/flag', methods=['POST'])
 @admin_required
+@idempotent
 def flag_guest(guest_id):
     """Flag a guest for no-show or other issues."""
     guest = Guest.query.get(guest_id)
@@ -214,8 +244,6 @@ def flag_guest(guest_id):
     if data.get('increment_noshow', False):
         guest.no_show_count += 1
     
-    db.session.commit()
-    
     ActivityLog.log(
         ActivityType.GUEST_FLAGGED.value,
         actor='admin',
@@ -223,7 +251,7 @@ def flag_guest(guest_id):
         target_id=guest.id,
         details={'reason': data.get('reason', 'Manual flag by admin')}
     )
-    db.session.commit()
+    db.session.flush()  # Stamps updated_at before serializing
     
     return success_response(
         message="Guest flagged successfully",
@@ -237,17 +265,28 @@ def list_hosts():
     """List all hosts with capacity info."""
     hosts = Host.query.order_by(Host.created_at.desc()).all()
     
+    # Seats taken and match counts for every host, one grouped query each
+    seats_taken = Host.seats_taken_by_host()
+    match_counts = {}
+    for host_id, status, count in db.session.query(
+        Match.host_id, Match.status, db.func.count(Match.id)
+    ).group_by(Match.host_id, Match.status):
+        match_counts[(host_id, status)] = count
+    
     result = []
     for host in hosts:
         host_data = host.to_dict(include_private=True, include_address=True)
-        host_data['remaining_capacity'] = host.get_remaining_capacity()
+        host_data['remaining_capacity'] = host.get_remaining_capacity(seats_taken.get(host.id, 0))
         
         # Count matches by status
         host_data['match_counts'] = {
-            'proposed': Match.query.filter_by(host_id=host.id, status=MatchStatus.PROPOSED.value).count(),
-            'requested': Match.query.filter_by(host_id=host.id, status=MatchStatus.REQUESTED.value).count(),
-            'accepted': Match.query.filter_by(host_id=host.id, status=MatchStatus.ACCEPTED.value).count(),
-            'confirmed': Match.query.filter_by(host_id=host.id, status=MatchStatus.CONFIRMED.value).count()
+            status: match_counts.get((host.id, status), 0)
+            for status in (
+                MatchStatus.PROPOSED.value,
+                MatchStatus.REQUESTED.value,
+                MatchStatus.ACCEPTED.value,
+                MatchStatus.CONFIRMED.value
+            )
         }
         
         result.append(host_data)
@@ -267,7 +306,9 @@ def get_host_detail(host_id):
     host_data['remaining_capacity'] = host.get_remaining_capacity()
     
     # Get all matches for this host
-    matches = Match.query.filter_by(host_id=host_id).order_by(Match.created_at.desc()).all()
+    matches = Match.query.options(joinedload(Match.guest)).filter_by(
+        host_id=host_id
+    ).order_by(Match.created_at.desc()).all()
     host_data['matches'] = [m.to_dict(include_guest_details=True, reveal_contact=True) for m in matches]
     
     return success_response(data=host_data)
@@ -279,7 +320,10 @@ def list_matches():
     """List all matches with optional status filter."""
     status_filter = request.args.get('status')
     
-    query = Match.query.order_by(Match.created_at.desc())
+    query = Match.query.options(
+        joinedload(Match.guest),
+        joinedload(Match.host)
+    ).order_by(Match.created_at.desc())
     
     if status_filter:
         query = query.filter_by(status=status_filter)
@@ -294,28 +338,68 @@ def list_matches():
 @admin_bp.route('/matches/generate', methods=['POST'])
 @admin_required
 def generate_matches():
-    """Run the matching algorithm to generate proposed matches."""
+    """
+    Run the matching algorithm to generate proposed matches.
+    
+    Only one run executes at a time across all workers. While one is running,
+    other requests get a 409, or with ?wait=true (or {"wait": true}) block
+    until it finishes and return its result. On PostgreSQL, a proposed match
+    sent or answered while the run reads its snapshot makes the run answer
+    409 with Retry-After; running it again picks up the change.
+    """
     from app.services.matching_adapter import run_matching
-    
-    # Clear existing proposed matches
-    Match.query.filter_by(status=MatchStatus.PROPOSED.value).delete()
-    db.session.commit()
-    
-    # Run matching
-    result = run_matching()
-    
-    # Log activity
-    ActivityLog.log(
-        ActivityType.MATCHES_GENERATED.value,
-        actor='admin',
-        target_type=None,
-        target_id=None,
-        details={
-            'matches_created': result['matches_created'],
-            'unmatched_guests': len(result['unmatched_guests'])
-        }
-    )
-    db.session.commit()
+    from app.utils.job_lock import JobLock, wait_for_result
+    from app.utils.snapshot import begin_snapshot, is_serialization_failure
+    
+    # Taken and committed on its own connection first, so the snapshot below
+    # already sees everything the previous run committed
+    lock = JobLock('matching', lease_seconds=current_app.config['MATCHING_LOCK_LEASE_SECONDS'])
+    if not lock.acquire():
+        data = request.get_json(silent=True) or {}
+        wait = request.args.get('wait', '').lower() == 'true' or data.get('wait') is True
+        if wait:
+            result = wait_for_result('matching', timeout=current_app.config['MATCHING_LOCK_WAIT_SECONDS'])
+            if result is not None:
+                return success_response(
+                    message=f"Joined the running matching job: {result['matches_created']} matches",
+                    data={**result, 'joined': True}
+                )
+        return error_response("A matching run is already in progress. Try again shortly.", status_code=409)
+    
+    try:
+        # Inputs are read from one snapshot; this must precede the session's first statement
+        if not begin_snapshot():
+            raise RuntimeError("The session was used before the matching snapshot could start")
+        
+        # Reads the inputs, runs the engine with no write lock held, then
+        # replaces the proposed matches
+        result = run_matching()
+        
+        # Log activity
+        ActivityLog.log(
+            ActivityType.MATCHES_GENERATED.value,
+            actor='admin',
+            target_type=None,
+            target_id=None,
+            details={
+                'matches_created': result['matches_created'],
+                'unmatched_guests': len(result['unmatched_guests']),
+                'stats': result['stats']  # Pair counters and phase_ms, to track engine performance
+            }
+        )
+        
+        # Released when the proposals commit (or at teardown if they do not)
+        lock.complete(result)
+    except Exception as exc:
+        lock.abandon()
+        if not is_serialization_failure(exc):
+            raise
+        # A proposed match was sent or answered while the run read its inputs
+        response, status_code = error_response(
+            "Matches changed while matching ran. Please run matching again.", status_code=409
+        )
+        response.headers['Retry-After'] = '1'
+        return response, status_code
     
     return success_response(
         message=f"Generated {result['matches_created']} matches",
@@ -325,6 +409,7 @@ def generate_matches():
 
 @admin_bp.route('/matches/<match_id>', methods=['PUT'])
 @admin_required
+@idempotent
 def edit_match(match_id):
     """Edit a match (reassign host)."""
     match = Match.query.get(match_id)
@@ -350,13 +435,12 @@ def edit_match(match_id):
         return error_response("Host doesn't have enough capacity")
     
     old_host_id = match.host_id
-    match.host_id = new_host_id
     
-    # Regenerate "why it's a fit"
+    # Reassign with a regenerated "why it's a fit", unless the match was sent meanwhile
     from app.services.matching_adapter import generate_why_fit
-    match.why_its_a_fit = generate_why_fit(match.guest, new_host)
-    
-    db.session.commit()
+    if not update_in_status(match, host_id=new_host.id, why_its_a_fit=generate_why_fit(match.guest, new_host)):
+        return error_response(CONFLICT_MESSAGE, status_code=409)
+    db.session.expire(match, ['host'])
     
     ActivityLog.log(
         ActivityType.MATCH_EDITED.value,
@@ -365,7 +449,6 @@ def edit_match(match_id):
         target_id=match.id,
         details={'old_host_id': old_host_id, 'new_host_id': new_host_id}
     )
-    db.session.commit()
     
     return success_response(
         message="Match updated",
@@ -375,6 +458,7 @@ def edit_match(match_id):
 
 @admin_bp.route('/matches/<match_id>', methods=['DELETE'])
 @admin_required
+@idempotent
 def delete_match(match_id):
     """Delete a proposed match."""
     match = Match.query.get(match_id)
@@ -393,15 +477,20 @@ def delete_match(match_id):
     )
     
     db.session.delete(match)
-    db.session.commit()
     
     return success_response(message="Match deleted")
 
 
 @admin_bp.route('/matches/<match_id>/send', methods=['POST'])
 @admin_required
+@idempotent
 def send_match_request(match_id):
-    """Send match request to host."""
+    """
+    Send a proposed match to its host.
+    
+    The host's other proposed matches go out with it, so a host with several
+    proposed guests gets one digest email rather than one email per guest.
+    """
     match = Match.query.get(match_id)
     if not match:
         return error_response("Match not found", status_code=404)
@@ -409,39 +498,127 @@ def send_match_request(match_id):
     if match.status != MatchStatus.PROPOSED.value:
         return error_response("Match must be in proposed status", status_code=400)
     
-    # Generate action tokens for accept/decline
-    frontend_url = current_app.config['FRONTEND_URL']
-    accept_token = generate_action_token('match_accept', match.id, expires_hours=168)  # 7 days
-    decline_token = generate_action_token('match_decline', match.id, expires_hours=168)
-    
-    accept_link = f"{frontend_url}/match/respond?token={accept_token}&action=accept"
-    decline_link = f"{frontend_url}/match/respond?token={decline_token}&action=decline"
-    
-    # Update status
-    match.status = MatchStatus.REQUESTED.value
-    match.requested_at = datetime.utcnow()
-    db.session.commit()
+    host_matches = Match.query.options(joinedload(Match.guest)).filter(
+        Match.host_id == match.host_id,
+        Match.status == MatchStatus.PROPOSED.value
+    ).order_by(Match.created_at).all()
     
-    # Send email to host
-    EmailService.send_match_request_to_host(match, accept_link, decline_link)
+    sent = _send_requests_by_host(host_matches)
+    if match.id not in sent['match_ids']:
+        return error_response(CONFLICT_MESSAGE, status_code=409)
+    db.session.flush()  # Stamps updated_at before serializing
     
-    ActivityLog.log(
-        ActivityType.MATCH_REQUEST_SENT.value,
-        actor='admin',
-        target_type='match',
-        target_id=match.id,
-        details={'host_id': match.host_id, 'guest_id': match.guest_id}
+    return success_response(
+        message=(
+            "Match request sent to host" if sent['requests_sent'] == 1
+            else f"Sent {sent['requests_sent']} match requests to host in one email"
+        ),
+        data={**match.to_dict(), 'requests_sent': sent['requests_sent']}
     )
-    db.session.commit()
+
+
+@admin_bp.route('/matches/send-requests', methods=['POST'])
+@admin_required
+@idempotent
+def send_match_requests():
+    """
+    Send all proposed matches (or the given match_ids) to their hosts.
+    
+    Requests are grouped per host: a host with several proposed guests gets a
+    single digest email with one multi-target token covering every listed match.
+    """
+    data = request.get_json(silent=True) or {}
+    match_ids = data.get('match_ids')
+    
+    query = Match.query.options(
+        joinedload(Match.guest),
+        joinedload(Match.host)
+    ).filter(Match.status == MatchStatus.PROPOSED.value)
+    if match_ids:
+        query = query.filter(Match.id.in_(match_ids))
+    matches = query.order_by(Match.host_id, Match.created_at).all()
+    
+    if not matches:
+        return error_response("No proposed matches to send")
+    
+    sent = _send_requests_by_host(matches)
+    if not sent['requests_sent']:
+        return error_response(CONFLICT_MESSAGE, status_code=409)
     
     return success_response(
-        message="Match request sent to host",
-        data=match.to_dict()
+        message=f"Sent {sent['requests_sent']} match request(s) to {sent['hosts_emailed']} host(s)",
+        data={key: sent[key] for key in ('requests_sent', 'hosts_emailed', 'digests_sent')}
     )
 
 
+def _send_requests_by_host(matches):
+    """
+    Move proposed matches to requested and email each host once.
+    
+    A host with one match gets the single request email; a host with several
+    gets a digest with one multi-target token covering every listed match.
+    Matches another request moved meanwhile are skipped.
+    """
+    # Claim the matches first, so only the ones claimed here are emailed
+    moved = transition_many(matches, MatchStatus.REQUESTED.value, requested_at=datetime.utcnow())
+    matches = [m for m in matches if m.id in moved]
+    
+    by_host = {}
+    for match in matches:
+        by_host.setdefault(match.host_id, []).append(match)
+    
+    frontend_url = current_app.config['FRONTEND_URL']
+    digests_sent = 0
+    
+    for host_matches in by_host.values():
+        host = host_matches[0].host
+        
+        if len(host_matches) == 1:
+            match = host_matches[0]
+            accept_token = generate_action_token('match_accept', match.id, expires_hours=168)  # 7 days
+            decline_token = generate_action_token('match_decline', match.id, expires_hours=168)
+            accept_link = f"{frontend_url}/match/respond?token={accept_token}&action=accept"
+            decline_link = f"{frontend_url}/match/respond?token={decline_token}&action=decline"
+            EmailService.send_match_request_to_host(match, accept_link, decline_link)
+        else:
+            digest_token = generate_multi_target_token(
+                'match_digest', [m.id for m in host_matches], expires_hours=168
+            )
+            requests_for_host = [
+                (
+                    m,
+                    f"{frontend_url}/match/respond?token={digest_token}&match={m.id}&action=accept",
+                    f"{frontend_url}/match/respond?token={digest_token}&match={m.id}&action=decline"
+                )
+                for m in host_matches
+            ]
+            EmailService.send_match_request_digest_to_host(host, requests_for_host)
+            digests_sent += 1
+        
+        for match in host_matches:
+            ActivityLog.log(
+                ActivityType.MATCH_REQUEST_SENT.value,
+                actor='admin',
+                target_type='match',
+                target_id=match.id,
+                details={
+                    'host_id': match.host_id,
+                    'guest_id': match.guest_id,
+                    'digest': len(host_matches) > 1
+                }
+            )
+    
+    return {
+        'match_ids': moved,
+        'requests_sent': len(matches),
+        'hosts_emailed': len(by_host),
+        'digests_sent': digests_sent
+    }
+
+
 @admin_bp.route('/matches/<match_id>/finalize', methods=['POST'])
 @admin_required
+@idempotent
 def finalize_match(match_id):
     """Finalize an accepted match and send confirmations to both parties."""
     match = Match.query.get(match_id)
@@ -452,9 +629,8 @@ def finalize_match(match_id):
         return error_response("Match must be in accepted status", status_code=400)
     
     # Update status
-    match.status = MatchStatus.CONFIRMED.value
-    match.finalized_at = datetime.utcnow()
-    db.session.commit()
+    if not transition(match, MatchStatus.CONFIRMED.value, finalized_at=datetime.utcnow()):
+        return error_response(CONFLICT_MESSAGE, status_code=409)
     
     # Send confirmation emails to BOTH parties (this is when guest learns about match)
     EmailService.send_match_confirmed_to_guest(match)
@@ -467,7 +643,7 @@ def finalize_match(match_id):
         target_id=match.id,
         details={'host_id': match.host_id, 'guest_id': match.guest_id}
     )
-    db.session.commit()
+    db.session.flush()  # Stamps updated_at before serializing
     
     return success_response(
         message="Match finalized and confirmations sent",
@@ -477,6 +653,7 @@ def finalize_match(match_id):
 
 @admin_bp.route('/matches/<match_id>/send-reminder', methods=['POST'])
 @admin_required
+@idempotent
 def send_day_of_reminder(match_id):
     """Send day-of reminder to guest with attendance confirmation link."""
     match = Match.query.get(match_id)
@@ -499,6 +676,7 @@ def send_day_of_reminder(match_id):
 
 @admin_bp.route('/hosts/<host_id>/send-summary', methods=['POST'])
 @admin_required
+@idempotent
 def send_host_summary(host_id):
     """Send day-of summary to host with guest list."""
     host = Host.query.get(host_id)
@@ -506,7 +684,7 @@ def send_host_summary(host_id):
         return error_response("Host not found", status_code=404)
     
     # Get all confirmed matches for this host
-    confirmed_matches = Match.query.filter(
+    confirmed_matches = Match.query.options(joinedload(Match.guest)).filter(
         Match.host_id == host_id,
         Match.status == MatchStatus.CONFIRMED.value
     ).all()
@@ -522,6 +700,7 @@ def send_host_summary(host_id):
 
 @admin_bp.route('/hosts/<host_id>/send-noshow-request', methods=['POST'])
 @admin_required
+@idempotent
 def send_noshow_report_request(host_id):
     """Send post-event email asking host to report no-shows."""
     host = Host.query.get(host_id)
@@ -539,17 +718,134 @@ def send_noshow_report_request(host_id):
     return success_response(message="No-show report request sent")
 
 
+@admin_bp.route('/bulk/send-reminders', methods=['POST'])
+@admin_required
+@idempotent
+def bulk_send_day_of_reminders():
+    """Send day-of reminders to every confirmed guest in one job."""
+    from app.services.bulk_operations import send_all_day_of_reminders
+    
+    job = send_all_day_of_reminders()
+    return success_response(
+        message=f"Queued {job['queued']} of {job['total']} day-of reminders",
+        data=job
+    )
+
+
+@admin_bp.route('/bulk/send-summaries', methods=['POST'])
+@admin_required
+@idempotent
+def bulk_send_host_summaries():
+    """Send day-of guest lists to every host with confirmed guests in one job."""
+    from app.services.bulk_operations import send_all_host_summaries
+    
+    job = send_all_host_summaries()
+    return success_response(
+        message=f"Queued {job['queued']} of {job['total']} host summaries",
+        data=job
+    )
+
+
+@admin_bp.route('/bulk/send-noshow-requests', methods=['POST'])
+@admin_required
+@idempotent
+def bulk_send_noshow_report_requests():
+    """Send no-show report requests to every host with confirmed guests in one job."""
+    from app.services.bulk_operations import send_all_noshow_requests
+    
+    job = send_all_noshow_requests()
+    return success_response(
+        message=f"Queued {job['queued']} of {job['total']} no-show report requests",
+        data=job
+    )
+
+
 @admin_bp.route('/emails', methods=['GET'])
 @admin_required
 def list_emails():
-    """List all emails (for debugging/viewing simulated sends)."""
-    emails = Email.query.order_by(Email.created_at.desc()).limit(100).all()
+    """List recent emails (metadata only - fetch one email to see its body)."""
+    emails = Email.query.options(
+        defer(Email.params), defer(Email.body)
+    ).order_by(Email.created_at.desc()).limit(100).all()
     return success_response(data=[e.to_dict() for e in emails])
 
 
+@admin_bp.route('/emails/<email_id>', methods=['GET'])
+@admin_required
+def get_email(email_id):
+    """Get one email with its rendered body."""
+    email = Email.query.get(email_id)
+    if not email:
+        return error_response("Email not found", status_code=404)
+    
+    return success_response(data=email.to_dict(include_body=True))
+
+
 @admin_bp.route('/activity', methods=['GET'])
 @admin_required
 def list_activity():
     """List recent activity log entries."""
     logs = ActivityLog.query.order_by(ActivityLog.created_at.desc()).limit(100).all()
     return success_response(data=[l.to_dict() for l in logs])
+
+
+@admin_bp.route('/activity/rollups', methods=['GET'])
+@admin_required
+def list_activity_rollups():
+    """Daily activity counts for days whose entries have been archived."""
+    query = ActivityRollup.query
+    try:
+        if request.args.get('start'):
+            query = query.filter(ActivityRollup.day >= date.fromisoformat(request.args['start']))
+        if request.args.get('end'):
+            query = query.filter(ActivityRollup.day <= date.fromisoformat(request.args['end']))
+    except ValueError:
+        return error_response("start and end must be dates (YYYY-MM-DD)", status_code=400)
+    
+    rollups = query.order_by(ActivityRollup.day.desc(), ActivityRollup.action_type).all()
+    return success_response(data=[r.to_dict() for r in rollups])
+
+
+@admin_bp.route('/metrics', methods=['GET'])
+@admin_required
+def metrics():
+    """Request and SQL metrics for this process, in Prometheus text format."""
+    from app.utils.metrics import CONTENT_TYPE
+    
+    return Response(current_app.extensions['metrics'].render(), content_type=CONTENT_TYPE)
+
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+@admin_required
+def list_slow_queries():
+    """Recent statements over SLOW_QUERY_THRESHOLD_MS in this process, newest first."""
+    slow_queries = current_app.extensions.get('slow_queries')
+    if slow_queries is None:
+        return error_response("Slow-query log is disabled", status_code=404)
+    
+    limit = request.args.get('limit', type=int)
+    return success_response(data={
+        'threshold_ms': current_app.config['SLOW_QUERY_THRESHOLD_MS'],
+        'queries': slow_queries.entries(limit)
+    })
+
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@admin_required
+def download_profile(profile_id):
+    """Download a stored request profile (.pstats, open with pstats or snakeviz)."""
+    from app.utils.profiler import profile_path
+    
+    if not current_app.config['PROFILER_ENABLED']:
+        return error_response("Profiler is disabled", status_code=404)
+    
+    path = profile_path(profile_id)
+    if not path or not os.path.isfile(path):
+        return error_response("Profile not found", status_code=404)
+    
+    return send_file(
+        os.path.abspath(path),
+        mimetype='application/octet-stream',
+        as_attachment=True,
+        download_name=f'{profile_id}.pstats'
+    )
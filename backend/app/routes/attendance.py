@@ -1,8 +1,9 @@
 """Attendance confirmation and no-show reporting endpoints."""
 from datetime import datetime
 from flask import Blueprint, request
-from app import db
+from sqlalchemy.orm import joinedload
 from app.models import Match, Guest, Host, ActivityLog
+from app.services.match_state import CONFLICT_MESSAGE, update_in_status
 from app.utils.responses import success_response, error_response
 from app.utils.tokens import verify_action_token
 from app.config import MatchStatus, ActivityType
@@ -48,9 +49,9 @@ def confirm_attendance():
             data={'already_confirmed': True}
         )
     
-    # Mark attendance confirmed
-    match.guest_confirmed_at = datetime.utcnow()
-    db.session.commit()
+    # Mark attendance confirmed (a concurrent second click loses the swap)
+    if not update_in_status(match, guest_confirmed_at=datetime.utcnow()):
+        return error_response(CONFLICT_MESSAGE, status_code=409)
     
     # Log activity
     ActivityLog.log(
@@ -60,7 +61,6 @@ def confirm_attendance():
         target_id=match.id,
         details={'guest_id': match.guest_id, 'host_id': match.host_id}
     )
-    db.session.commit()
     
     # Return host details for the confirmation page
     host = match.host
@@ -102,7 +102,7 @@ def get_noshow_report_form():
         return error_response("Host not found", status_code=404)
     
     # Get all confirmed matches for this host (only those who confirmed attendance)
-    confirmed_matches = Match.query.filter(
+    confirmed_matches = Match.query.options(joinedload(Match.guest)).filter(
         Match.host_id == host_id,
         Match.status == MatchStatus.CONFIRMED.value,
         Match.guest_confirmed_at.isnot(None),
@@ -152,14 +152,15 @@ def submit_noshow_report():
     if not host:
         return error_response("Host not found", status_code=404)
     
+    # Security: only this host's matches are loaded (with their guests, in one query)
+    reported_matches = Match.query.options(joinedload(Match.guest)).filter(
+        Match.id.in_(no_show_match_ids),
+        Match.host_id == host_id
+    ).all() if no_show_match_ids else []
+    
     # Process each reported no-show
     reported_count = 0
-    for match_id in no_show_match_ids:
-        match = Match.query.get(match_id)
-        
-        # Security: Verify this match belongs to this host
-        if not match or match.host_id != host_id:
-            continue
+    for match in reported_matches:
         
         # Only process confirmed matches
         if match.status != MatchStatus.CONFIRMED.value:
@@ -193,8 +194,6 @@ def submit_noshow_report():
         
         reported_count += 1
     
-    db.session.commit()
-    
     if reported_count > 0:
         return success_response(
             message=f"Thank you for reporting. {reported_count} no-show(s) recorded.",
@@ -4,12 +4,14 @@ from app import db
 from app.models import Guest, Host, MagicLink
 from app.services.email_service import EmailService
 from app.utils.responses import success_response, error_response
+from app.utils.rate_limit import rate_limited
 from app.utils.tokens import generate_session_token
 
 auth_bp = Blueprint('auth', __name__)
 
 
 @auth_bp.route('/request-link', methods=['POST'])
+@rate_limited
 def request_magic_link():
     """Request a magic link for profile editing."""
     data = request.get_json()
@@ -38,10 +40,15 @@ def request_magic_link():
         user_id = host.id
         user_name = host.full_name
     
+    # Cap outstanding links per email; the response stays the same either way
+    if MagicLink.count_outstanding(email) >= current_app.config['MAGIC_LINK_MAX_OUTSTANDING']:
+        return success_response(
+            message="If an account exists with this email, a login link will be sent."
+        )
+    
     # Create magic link
     magic_link = MagicLink.create_for_user(email, user_type, user_id)
     db.session.add(magic_link)
-    db.session.commit()
     
     # Build link URL
     frontend_url = current_app.config['FRONTEND_URL']
@@ -65,7 +72,7 @@ def verify_magic_link():
         return error_response("Token is required")
     
     # Find magic link
-    magic_link = MagicLink.query.filter_by(token=token).first()
+    magic_link = MagicLink.find_by_token(token)
     
     if not magic_link:
         return error_response("Invalid or expired link", status_code=401)
@@ -75,7 +82,6 @@ def verify_magic_link():
     
     # Mark as used
     magic_link.mark_used()
-    db.session.commit()
     
     # Generate session token
     session_token = generate_session_token(magic_link.user_type, magic_link.user_id)
@@ -1,9 +1,13 @@
 """Guest API endpoints."""
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import Guest, ActivityLog
 from app.services.email_service import EmailService
+from app.services.registration_intake import DUPLICATE_EMAIL, enqueue_registration
 from app.utils.responses import success_response, error_response
+from app.utils.rate_limit import rate_limited
+from app.utils.idempotency import idempotent
 from app.utils.tokens import verify_session_token
 from app.config import ActivityType
 
@@ -45,6 +49,8 @@ def validate_guest_data(data, is_update=False):
 
 
 @guests_bp.route('', methods=['POST'])
+@rate_limited
+@idempotent
 def create_guest():
     """Create a new guest registration."""
     data = request.get_json()
@@ -54,38 +60,25 @@ def create_guest():
     if errors:
         return error_response("Validation failed", errors=errors)
     
-    # Check for existing email
-    existing = Guest.query.filter_by(email=data['email']).first()
-    if existing:
-        return error_response(
-            "An account with this email already exists. Use the login link to edit your profile.",
-            status_code=409
+    # During signup spikes: queue it for the intake worker and answer right away
+    if current_app.config['INTAKE_MODE'] == 'async':
+        intake = enqueue_registration('guest', data)
+        return success_response(
+            data={'tracking_id': intake.id, 'status': intake.status},
+            message="Registration received! We'll email your confirmation shortly.",
+            status_code=202
         )
     
-    # Create guest
-    guest = Guest(
-        full_name=data['full_name'],
-        email=data['email'],
-        phone=data['phone'],
-        gender=data['gender'],
-        party_size=data['party_size'],
-        neighborhood=data['neighborhood'],
-        max_travel_time=data['max_travel_time'],
-        languages=data['languages'],
-        kosher_requirement=data['kosher_requirement'],
-        contribution_range=data['contribution_range'],
-        vibe_chabad=data['vibe_chabad'],
-        vibe_social=data['vibe_social'],
-        vibe_formality=data['vibe_formality'],
-        attended_jlc_before=data.get('attended_jlc_before', False),
-        facebook_url=data.get('facebook_url'),
-        instagram_handle=data.get('instagram_handle'),
-        notes_to_admin=data.get('notes_to_admin'),
-        no_show_acknowledged=data['no_show_acknowledged']
-    )
+    # Create guest; the unique email constraint rejects an existing account,
+    # including one registered by a concurrent request
+    guest = Guest.from_registration(data)
     
     db.session.add(guest)
-    db.session.commit()
+    try:
+        db.session.flush()  # Assigns guest.id; committed with the rest of the request
+    except IntegrityError:
+        db.session.rollback()
+        return error_response(DUPLICATE_EMAIL, status_code=409)
     
     # Log activity
     ActivityLog.log(
@@ -95,7 +88,6 @@ def create_guest():
         target_id=guest.id,
         details={'email': guest.email, 'name': guest.full_name}
     )
-    db.session.commit()
     
     # Send confirmation email
     EmailService.send_guest_submission_confirmation(guest)
@@ -165,8 +157,6 @@ def update_guest(guest_id):
         if field in data:
             setattr(guest, field, data[field])
     
-    db.session.commit()
-    
     # Log activity
     ActivityLog.log(
         ActivityType.GUEST_UPDATED.value,
@@ -175,7 +165,7 @@ def update_guest(guest_id):
         target_id=guest.id,
         details={'updated_fields': list(data.keys())}
     )
-    db.session.commit()
+    db.session.flush()  # Stamps updated_at before serializing
     
     return success_response(
         data=guest.to_dict(include_private=True),
@@ -1,9 +1,13 @@
 """Host API endpoints."""
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models import Host, ActivityLog
 from app.services.email_service import EmailService
+from app.services.registration_intake import DUPLICATE_EMAIL, enqueue_registration
 from app.utils.responses import success_response, error_response
+from app.utils.rate_limit import rate_limited
+from app.utils.idempotency import idempotent
 from app.utils.tokens import verify_session_token
 from app.config import ActivityType
 
@@ -42,6 +46,8 @@ def validate_host_data(data, is_update=False):
 
 
 @hosts_bp.route('', methods=['POST'])
+@rate_limited
+@idempotent
 def create_host():
     """Create a new host registration."""
     data = request.get_json()
@@ -51,35 +57,25 @@ def create_host():
     if errors:
         return error_response("Validation failed", errors=errors)
     
-    # Check for existing email
-    existing = Host.query.filter_by(email=data['email']).first()
-    if existing:
-        return error_response(
-            "An account with this email already exists. Use the login link to edit your profile.",
-            status_code=409
+    # During signup spikes: queue it for the intake worker and answer right away
+    if current_app.config['INTAKE_MODE'] == 'async':
+        intake = enqueue_registration('host', data)
+        return success_response(
+            data={'tracking_id': intake.id, 'status': intake.status},
+            message="Registration received! We'll email your confirmation shortly.",
+            status_code=202
         )
     
-    # Create host
-    host = Host(
-        full_name=data['full_name'],
-        email=data['email'],
-        phone=data['phone'],
-        neighborhood=data['neighborhood'],
-        address=data['address'],
-        seats_available=data['seats_available'],
-        languages=data['languages'],
-        kosher_level=data['kosher_level'],
-        contribution_preference=data['contribution_preference'],
-        vibe_chabad=data['vibe_chabad'],
-        vibe_social=data['vibe_social'],
-        vibe_formality=data['vibe_formality'],
-        tagline=data.get('tagline'),
-        private_notes=data.get('private_notes'),
-        no_show_acknowledged=data['no_show_acknowledged']
-    )
+    # Create host; the unique email constraint rejects an existing account,
+    # including one registered by a concurrent request
+    host = Host.from_registration(data)
     
     db.session.add(host)
-    db.session.commit()
+    try:
+        db.session.flush()  # Assigns host.id; committed with the rest of the request
+    except IntegrityError:
+        db.session.rollback()
+        return error_response(DUPLICATE_EMAIL, status_code=409)
     
     # Log activity
     ActivityLog.log(
@@ -89,7 +85,6 @@ def create_host():
         target_id=host.id,
         details={'email': host.email, 'name': host.full_name}
     )
-    db.session.commit()
     
     # Send confirmation email
     EmailService.send_host_submission_confirmation(host)
@@ -158,8 +153,6 @@ def update_host(host_id):
         if field in data:
             setattr(host, field, data[field])
     
-    db.session.commit()
-    
     # Log activity
     ActivityLog.log(
         ActivityType.HOST_UPDATED.value,
@@ -168,7 +161,7 @@ def update_host(host_id):
         target_id=host.id,
         details={'updated_fields': list(data.keys())}
     )
-    db.session.commit()
+    db.session.flush()  # Stamps updated_at before serializing
     
     return success_response(
         data=host.to_dict(include_private=True, include_address=True),
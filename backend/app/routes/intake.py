@@ -0,0 +1,20 @@
+"""Registration intake status endpoint (INTAKE_MODE=async)."""
+from flask import Blueprint
+from app import db
+from app.models import RegistrationIntake
+from app.utils.responses import success_response, error_response
+
+intake_bp = Blueprint('intake', __name__)
+
+
+@intake_bp.route('/<tracking_id>', methods=['GET'])
+def get_intake_status(tracking_id):
+    """
+    Status of a queued registration: pending, applied (with the new id),
+    rejected (with the reason) or failed. The tracking id itself is the credential.
+    """
+    intake = db.session.get(RegistrationIntake, tracking_id)
+    if not intake:
+        return error_response("Registration not found", status_code=404)
+    
+    return success_response(data=intake.to_dict())
@@ -1,8 +1,9 @@
 """Match response API endpoints (uses signed action tokens)."""
 from datetime import datetime
 from flask import Blueprint, request
-from app import db
+from sqlalchemy.orm import joinedload
 from app.models import Match, ActivityLog
+from app.services.match_state import CONFLICT_MESSAGE, transition
 from app.utils.responses import success_response, error_response
 from app.utils.tokens import verify_action_token
 from app.config import MatchStatus, ActivityType
@@ -17,6 +18,9 @@ def respond_to_match():
     
     This is used by hosts when they click the accept/decline link in their email.
     No login required - the signed token authenticates the action.
+    
+    Digest tokens (one token for several matches) also need 'match_id' and
+    'action' ('accept' or 'decline') in the request body.
     """
     data = request.get_json()
     token = data.get('token', '').strip()
@@ -32,6 +36,16 @@ def respond_to_match():
     action = token_data['action']
     match_id = token_data['target_id']
     
+    # Digest tokens cover several matches; the link says which one and the decision
+    if action == 'match_digest':
+        match_id = data.get('match_id')
+        decision = data.get('action')
+        if not match_id or match_id not in token_data['target_ids']:
+            return error_response("Invalid token for this match", status_code=401)
+        if decision not in ['accept', 'decline']:
+            return error_response("Invalid action", status_code=400)
+        action = f"match_{decision}"
+    
     # Validate action type
     if action not in ['match_accept', 'match_decline']:
         return error_response("Invalid action", status_code=400)
@@ -62,11 +76,11 @@ def respond_to_match():
             return error_response("This request is no longer available", status_code=400)
     
     # Process the response
+    new_status = MatchStatus.ACCEPTED.value if action == 'match_accept' else MatchStatus.DECLINED.value
+    if not transition(match, new_status, responded_at=datetime.utcnow()):
+        return error_response(CONFLICT_MESSAGE, status_code=409)
+    
     if action == 'match_accept':
-        match.status = MatchStatus.ACCEPTED.value
-        match.responded_at = datetime.utcnow()
-        db.session.commit()
-        
         # Log activity
         ActivityLog.log(
             ActivityType.MATCH_ACCEPTED.value,
@@ -75,7 +89,6 @@ def respond_to_match():
             target_id=match.id,
             details={'host_id': match.host_id, 'guest_id': match.guest_id}
         )
-        db.session.commit()
         
         # Note: We do NOT notify the guest here. Admin must finalize first.
         
@@ -89,10 +102,6 @@ def respond_to_match():
         )
     
     else:  # match_decline
-        match.status = MatchStatus.DECLINED.value
-        match.responded_at = datetime.utcnow()
-        db.session.commit()
-        
         # Log activity
         ActivityLog.log(
             ActivityType.MATCH_DECLINED.value,
@@ -101,7 +110,6 @@ def respond_to_match():
             target_id=match.id,
             details={'host_id': match.host_id, 'guest_id': match.guest_id}
         )
-        db.session.commit()
         
         return success_response(
             message="No problem! We'll find another host for this guest.",
@@ -125,8 +133,8 @@ def get_match_details_for_response(match_id):
     if not token_data:
         return error_response("Invalid or expired link", status_code=401)
     
-    # Verify token is for this match
-    if token_data['target_id'] != match_id:
+    # Verify token is for this match (single or digest token)
+    if match_id not in token_data['target_ids']:
         return error_response("Invalid token for this match", status_code=401)
     
     # Find the match
@@ -139,3 +147,31 @@ def get_match_details_for_response(match_id):
         'match': match.to_dict(include_guest_details=True),
         'status': match.status
     })
+
+
+@matches_bp.route('/digest', methods=['GET'])
+def get_digest_matches():
+    """
+    List every match covered by a host digest token.
+    Uses signed token for authentication.
+    """
+    token = request.args.get('token', '').strip()
+    
+    if not token:
+        return error_response("Token is required", status_code=401)
+    
+    token_data = verify_action_token(token)
+    if not token_data:
+        return error_response("Invalid or expired link", status_code=401)
+    
+    if token_data['action'] != 'match_digest':
+        return error_response("Invalid token type", status_code=400)
+    
+    matches = Match.query.options(joinedload(Match.guest)).filter(
+        Match.id.in_(token_data['target_ids'])
+    ).order_by(Match.created_at).all()
+    
+    # Guest summaries only, no contact info
+    return success_response(data={
+        'matches': [m.to_dict(include_guest_details=True) for m in matches]
+    })
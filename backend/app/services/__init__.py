@@ -1,5 +1,15 @@
 """Services layer."""
-from app.services.email_service import EmailService
-from app.services.matching_adapter import run_matching
 
 __all__ = ['EmailService', 'run_matching']
+
+
+def __getattr__(name):
+    # Imported on first use: importing any app.services module runs this
+    # package, and run_matching would load the matching engine at startup
+    if name == 'EmailService':
+        from app.services.email_service import EmailService
+        return EmailService
+    if name == 'run_matching':
+        from app.services.matching_adapter import run_matching
+        return run_matching
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
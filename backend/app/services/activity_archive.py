@@ -0,0 +1,189 @@
+"""
+Activity log retention.
+
+`activity_logs` is append-only. archive_activity() (run via
+`python manage.py archive-activity`) keeps it bounded by, for each whole day
+older than the retention window:
+1. Streaming that day's rows into a gzip-compressed NDJSON file under
+   <archive_dir>/date=YYYY-MM-DD/ (one part file per run)
+2. Adding the day's per-action, per-actor counts to ActivityRollup
+3. Deleting the archived rows, in the same transaction as the rollup
+
+iter_archived_activity() streams archived rows back, filtered by date range,
+action type or target, without loading whole files into memory.
+"""
+import gzip
+import json
+import os
+import uuid
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, func, select
+
+from app import db
+from app.models import ActivityLog, ActivityRollup
+
+
+PARTITION_PREFIX = 'date='
+
+
+def _partition_dir(archive_dir: str, day: date) -> str:
+    return os.path.join(archive_dir, f"{PARTITION_PREFIX}{day.isoformat()}")
+
+
+def _write_part(archive_dir: str, day: date, rows) -> str:
+    """
+    Write rows to a new part file for the day and return its path.
+
+    The file is written under a temporary name, fsynced and then renamed, so a
+    partition only ever contains complete parts.
+    """
+    directory = _partition_dir(archive_dir, day)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-{uuid.uuid4().hex[:12]}.ndjson.gz")
+    tmp_path = path + '.tmp'
+
+    with open(tmp_path, 'wb') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+            for row in rows:
+                archive.write(json.dumps(row, separators=(',', ':'), default=str).encode('utf-8'))
+                archive.write(b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def _add_to_rollup(day: date, counts: Counter) -> None:
+    existing = {
+        (rollup.action_type, rollup.actor): rollup
+        for rollup in ActivityRollup.query.filter_by(day=day).all()
+    }
+    for (action_type, actor), count in counts.items():
+        rollup = existing.get((action_type, actor))
+        if rollup is None:
+            db.session.add(ActivityRollup(day=day, action_type=action_type, actor=actor, count=count))
+        else:
+            rollup.count += count
+
+
+def _archive_day(archive_dir: str, day: date, batch_size: int) -> int:
+    """Archive, roll up and delete every activity row created on `day`."""
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1)
+
+    ids = []
+    counts = Counter()
+
+    def rows():
+        query = (
+            select(ActivityLog)
+            .where(ActivityLog.created_at >= start, ActivityLog.created_at < end)
+            .order_by(ActivityLog.created_at, ActivityLog.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for log in db.session.scalars(query):
+            ids.append(log.id)
+            counts[(log.action_type, log.actor)] += 1
+            yield log.to_dict()
+            db.session.expunge(log)
+
+    path = _write_part(archive_dir, day, rows())
+    if not ids:
+        os.remove(path)
+        return 0
+
+    try:
+        _add_to_rollup(day, counts)
+        for i in range(0, len(ids), batch_size):
+            db.session.execute(
+                delete(ActivityLog)
+                .where(ActivityLog.id.in_(ids[i:i + batch_size]))
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        os.remove(path)  # Rows stay in the database; the next run archives them again
+        raise
+
+    return len(ids)
+
+
+def archive_activity(archive_dir: str, older_than_days: int = 90, batch_size: int = 1000) -> dict:
+    """
+    Archive every whole day of activity older than `older_than_days`.
+
+    Each day is committed separately, so an interrupted run can simply be
+    re-run. Returns per-day counts.
+    """
+    cutoff = datetime.combine(datetime.utcnow().date() - timedelta(days=older_than_days), time.min)
+
+    archived = {}
+    while True:
+        # Archived days are deleted, so the oldest remaining row names the next day
+        oldest = db.session.scalar(
+            select(func.min(ActivityLog.created_at)).where(ActivityLog.created_at < cutoff)
+        )
+        if oldest is None:
+            break
+        day = oldest.date()
+        archived[day.isoformat()] = _archive_day(archive_dir, day, batch_size)
+
+    return {
+        'cutoff': cutoff.isoformat(),
+        'days_archived': len(archived),
+        'rows_archived': sum(archived.values()),
+        'by_day': archived
+    }
+
+
+def _archived_days(archive_dir: str):
+    if not os.path.isdir(archive_dir):
+        return []
+
+    days = []
+    for name in os.listdir(archive_dir):
+        if name.startswith(PARTITION_PREFIX):
+            try:
+                days.append(date.fromisoformat(name[len(PARTITION_PREFIX):]))
+            except ValueError:
+                continue
+    return sorted(days)
+
+
+def iter_archived_activity(archive_dir: str, start: Optional[date] = None, end: Optional[date] = None,
+                           action_type: Optional[str] = None, target_id: Optional[str] = None,
+                           actor: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream archived activity rows in date order, one decoded row at a time.
+
+    Only partitions within [start, end] (inclusive) are opened. A row is only
+    yielded once per day even if an interrupted run archived it twice.
+    """
+    for day in _archived_days(archive_dir):
+        if (start and day < start) or (end and day > end):
+            continue
+
+        directory = _partition_dir(archive_dir, day)
+        seen = set()
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.ndjson.gz'):
+                continue
+            with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as archive:
+                for line in archive:
+                    row = json.loads(line)
+                    if row['id'] in seen:
+                        continue
+                    seen.add(row['id'])
+
+                    if action_type and row['action_type'] != action_type:
+                        continue
+                    if target_id and row['target_id'] != target_id:
+                        continue
+                    if actor and row['actor'] != actor:
+                        continue
+                    yield row
@@ -0,0 +1,125 @@
+"""
+Event-wide day-of operations.
+
+Each operation selects the current event's confirmed matches (with guest
+and host) in one query, mints the action tokens and stages all emails; the
+request commits them together. Matches from earlier weeks stay confirmed
+forever, so "current" means finalized within the last EVENT_WINDOW_DAYS
+and not yet reported as a no-show. The result is a job summary with counts
+and per-recipient failures.
+"""
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from app.models import Match, ActivityLog
+from app.services.email_service import EmailService
+from app.utils.tokens import generate_action_token
+from app.config import MatchStatus, ActivityType
+
+
+def _confirmed_matches():
+    """The current event's confirmed matches, with guest and host loaded in the same query."""
+    window_start = datetime.utcnow() - timedelta(days=current_app.config['EVENT_WINDOW_DAYS'])
+    return Match.query.options(
+        joinedload(Match.guest),
+        joinedload(Match.host)
+    ).filter(
+        Match.status == MatchStatus.CONFIRMED.value,
+        Match.finalized_at >= window_start,
+        Match.no_show_reported_at.is_(None)
+    ).order_by(Match.host_id, Match.created_at).all()
+
+
+def _matches_by_host(matches):
+    hosts = OrderedDict()
+    for match in matches:
+        hosts.setdefault(match.host_id, (match.host, []))[1].append(match)
+    return hosts
+
+
+def _run_job(job_type, items, stage_email):
+    """
+    Stage one email per item, plus one activity log entry for the job.
+
+    Args:
+        job_type: Name reported in the job summary
+        items: List of (recipient_email, target_type, target_id, payload)
+        stage_email: Callable(payload) that stages the email
+    """
+    job = {
+        'id': str(uuid.uuid4()),
+        'type': job_type,
+        'started_at': datetime.utcnow().isoformat(),
+        'total': len(items),
+        'queued': 0,
+        'failed': 0,
+        'failures': []
+    }
+
+    for recipient, target_type, target_id, payload in items:
+        try:
+            stage_email(payload)
+            job['queued'] += 1
+        except Exception as exc:
+            job['failed'] += 1
+            job['failures'].append({
+                'recipient': recipient,
+                'target_type': target_type,
+                'target_id': target_id,
+                'error': str(exc)
+            })
+
+    job['status'] = 'completed' if not job['failed'] else 'completed_with_failures'
+    job['finished_at'] = datetime.utcnow().isoformat()
+
+    ActivityLog.log(
+        ActivityType.BULK_EMAILS_QUEUED.value,
+        actor='admin',
+        details={key: job[key] for key in ('id', 'type', 'total', 'queued', 'failed', 'failures')}
+    )
+
+    return job
+
+
+def send_all_day_of_reminders():
+    """Queue the day-of reminder (with attendance link) for every confirmed match."""
+    frontend_url = current_app.config['FRONTEND_URL']
+
+    def stage(match):
+        confirm_token = generate_action_token('confirm_attendance', match.id, expires_hours=24)
+        confirm_link = f"{frontend_url}/attendance/confirm?token={confirm_token}"
+        EmailService.send_day_of_reminder_to_guest(match, confirm_link)
+
+    items = [(m.guest.email, 'match', m.id, m) for m in _confirmed_matches()]
+    return _run_job('day_of_reminders', items, stage)
+
+
+def send_all_host_summaries():
+    """Queue the day-of guest list for every host with confirmed guests."""
+    def stage(payload):
+        host, matches = payload
+        EmailService.send_day_of_summary_to_host(host, matches)
+
+    items = [
+        (host.email, 'host', host_id, (host, matches))
+        for host_id, (host, matches) in _matches_by_host(_confirmed_matches()).items()
+    ]
+    return _run_job('host_summaries', items, stage)
+
+
+def send_all_noshow_requests():
+    """Queue the post-event no-show report request for every host with confirmed guests."""
+    frontend_url = current_app.config['FRONTEND_URL']
+
+    def stage(host):
+        report_token = generate_action_token('noshow_report', host.id, expires_hours=168)  # 7 days
+        report_link = f"{frontend_url}/noshow/report?token={report_token}"
+        EmailService.send_noshow_report_request(host, report_link)
+
+    items = [
+        (host.email, 'host', host_id, host)
+        for host_id, (host, _) in _matches_by_host(_confirmed_matches()).items()
+    ]
+    return _run_job('noshow_requests', items, stage)
@@ -0,0 +1,67 @@
+"""
+Copy the whole database into another one, e.g. to switch ID_STORAGE.
+
+Id columns change type between ID_STORAGE=string (CHAR(36)) and 'native'
+(UUID / 16-byte BLOB), so an existing database is migrated by copying it
+(`python manage.py copy-database --to <url>`): the target is migrated with the
+target's storage and rows are streamed over in primary-key batches, parents
+before children. Id values are kept as they are - emailed
+action tokens and links carry them - so rows created before ID_FORMAT=uuid7
+keep their random UUID4 ids; only new rows are time-ordered.
+
+Stop the app (and workers) while copying, then point DATABASE_URL at the
+target and set ID_STORAGE to match.
+"""
+from sqlalchemy import create_engine, func, select, text
+
+from app import db
+from app.migrations import upgrade
+
+
+def create_target_engine(url: str, id_storage: str):
+    """An engine for the target database with the given Id column storage."""
+    engine = create_engine(url)
+    engine.dialect.id_storage = id_storage
+    return engine
+
+
+def copy_database(source_engine, target_engine, batch_size: int = 1000, log=print) -> dict:
+    """Copy every table's rows from source to target. Returns {table: rows}."""
+    tables = db.metadata.sorted_tables  # Parents before children
+    upgrade(target_engine, log=log)
+
+    with target_engine.connect() as target:
+        for table in tables:
+            if target.execute(select(func.count()).select_from(table)).scalar():
+                raise ValueError(f"Target table {table.name} is not empty")
+
+    copied = {}
+    with source_engine.connect() as source:
+        for table in tables:
+            rows = source.execution_options(yield_per=batch_size).execute(
+                select(table).order_by(*table.primary_key.columns)
+            )
+            count = 0
+            for batch in rows.partitions():
+                with target_engine.begin() as target:
+                    target.execute(table.insert(), [dict(row._mapping) for row in batch])
+                count += len(batch)
+            copied[table.name] = count
+            log(f"{table.name}: {count} row(s)")
+
+    if target_engine.dialect.name == 'postgresql':
+        _reset_sequences(target_engine, tables)
+    return copied
+
+
+def _reset_sequences(engine, tables):
+    # Rows were inserted with their ids, so serial sequences never advanced
+    with engine.begin() as connection:
+        for table in tables:
+            column = table.autoincrement_column
+            if column is None:
+                continue
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{column.name}'), "
+                f"COALESCE((SELECT MAX({column.name}) FROM {table.name}), 0) + 1, false)"
+            ))
@@ -0,0 +1,186 @@
+"""
+Email outbox delivery.
+
+Requests only insert QUEUED rows (EmailService.queue_email). This module is
+used by the separate worker process (`python manage.py email-worker`) to:
+1. Claim a batch of due emails safely across several workers (utils/leases.py)
+2. Deliver them over a reused SMTP connection (or to the console)
+3. Mark them sent, or schedule a retry with exponential backoff
+"""
+import os
+import smtplib
+import socket
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import List, Optional
+
+from sqlalchemy import or_
+
+from app import db
+from app.models.email import Email
+from app.config import EmailStatus
+from app.utils.leases import claim_batch
+
+
+class ConsoleTransport:
+    """Prints emails to stdout (the pilot's simulated delivery)."""
+
+    def send(self, email: Email) -> None:
+        print(f"\n{'='*60}")
+        print(f"📧 EMAIL SENT (simulated)")
+        print(f"To: {email.to_name} <{email.to_email}>")
+        print(f"Type: {email.email_type}")
+        print(f"Subject: {email.subject}")
+        print(f"{'='*60}")
+        print(email.render_body())
+        print(f"{'='*60}\n", flush=True)
+
+    def close(self) -> None:
+        pass
+
+
+class SMTPTransport:
+    """
+    Delivers over SMTP, reusing one connection across messages.
+
+    The connection is opened lazily, kept open between batches, health-checked
+    with NOOP after being idle, recycled after max_messages, and re-opened once
+    if the server dropped it mid-send.
+    """
+
+    def __init__(self, host, port=25, username=None, password=None, use_tls=False,
+                 from_address='noreply@shabbatlink.com', timeout=30,
+                 max_messages=100, idle_check_seconds=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.from_address = from_address
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.idle_check_seconds = idle_check_seconds
+
+        self._connection: Optional[smtplib.SMTP] = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        self._sent_on_connection = 0
+        return connection
+
+    def _get_connection(self) -> smtplib.SMTP:
+        if self._connection is not None:
+            recycle = self._sent_on_connection >= self.max_messages
+            if not recycle and time.monotonic() - self._last_used > self.idle_check_seconds:
+                try:
+                    recycle = self._connection.noop()[0] != 250
+                except (smtplib.SMTPException, OSError):
+                    recycle = True
+            if recycle:
+                self.close()
+
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    def _build_message(self, email: Email) -> EmailMessage:
+        message = EmailMessage()
+        message['From'] = self.from_address
+        message['To'] = formataddr((email.to_name or '', email.to_email))
+        message['Subject'] = email.subject
+        message['Message-ID'] = f"<{email.id}@shabbatlink>"
+        message.set_content(email.render_body())
+        return message
+
+    def send(self, email: Email) -> None:
+        message = self._build_message(email)
+        try:
+            self._get_connection().send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Pooled connection went stale between checks - retry once on a fresh one
+            self.close()
+            self._get_connection().send_message(message)
+        self._sent_on_connection += 1
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._connection = None
+
+
+def create_transport(config):
+    """Build the transport named by EMAIL_TRANSPORT ('console' or 'smtp')."""
+    if config.get('EMAIL_TRANSPORT') == 'smtp':
+        return SMTPTransport(
+            host=config['SMTP_HOST'],
+            port=config['SMTP_PORT'],
+            username=config.get('SMTP_USERNAME'),
+            password=config.get('SMTP_PASSWORD'),
+            use_tls=config.get('SMTP_USE_TLS', False),
+            from_address=config['EMAIL_FROM']
+        )
+    return ConsoleTransport()
+
+
+class EmailDeliveryWorker:
+    """Claims due outbox rows and delivers them. Safe to run several at once."""
+
+    def __init__(self, transport, batch_size=50, lease_seconds=300,
+                 max_attempts=5, backoff_seconds=30, worker_id=None):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    def _claimable(self, now):
+        return (
+            Email.status == EmailStatus.QUEUED.value,
+            or_(Email.next_attempt_at.is_(None), Email.next_attempt_at <= now),
+            or_(Email.lease_expires_at.is_(None), Email.lease_expires_at < now)
+        )
+
+    def claim_batch(self) -> List[Email]:
+        """Lease up to batch_size due emails to this worker and return them."""
+        return claim_batch(Email, self._claimable, self.worker_id, self.batch_size, self.lease_seconds)
+
+    def deliver(self, email: Email) -> bool:
+        try:
+            self.transport.send(email)
+        except Exception as exc:  # any transport error is retried with backoff
+            email.mark_failed_attempt(exc, self.max_attempts, self.backoff_seconds)
+            db.session.commit()
+            return False
+
+        email.mark_sent()
+        db.session.commit()
+        return True
+
+    def run_once(self) -> dict:
+        """Claim and deliver one batch. Returns counts."""
+        batch = self.claim_batch()
+        sent = sum(1 for email in batch if self.deliver(email))
+        return {'claimed': len(batch), 'sent': sent, 'failed': len(batch) - sent}
+
+    def run_forever(self, poll_interval=2.0, should_stop=lambda: False) -> None:
+        """Deliver batches until should_stop() is true, sleeping when the outbox is idle."""
+        try:
+            while not should_stop():
+                result = self.run_once()
+                db.session.remove()
+                if result['claimed'] < self.batch_size:
+                    time.sleep(poll_interval)
+        finally:
+            self.transport.close()
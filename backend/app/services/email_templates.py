@@ -0,0 +1,289 @@
+"""
+Email templates.
+
+Emails are stored as template id + parameter JSON rather than rendered text.
+Templates are compiled once per process, when the first email is queued or
+rendered rather than at app startup, and bodies are rendered only when an
+email is delivered or viewed.
+
+Template ids are EmailType values. Parameters are plain JSON values captured
+when the email is queued, so rendering never touches the database.
+"""
+from jinja2 import Environment, StrictUndefined
+from app.config import EmailType
+
+
+SIGNATURE = """Shabbat Shalom!
+The ShabbatLink Team
+Jewish Latin Center
+"""
+
+
+TEMPLATES = {
+    EmailType.GUEST_SUBMISSION_CONFIRMATION.value: {
+        'subject': "Welcome to ShabbatLink - Registration Confirmed!",
+        'body': """
+Dear {{ full_name }},
+
+Thank you for registering with ShabbatLink! We're excited to help you find a wonderful Shabbat dinner experience.
+
+What's next?
+- Our team will review your preferences and work on finding the perfect match.
+- You'll receive an email once we've confirmed a match for you.
+- The host's contact details will be shared only after the match is finalized.
+
+Your registration details:
+- Party size: {{ party_size }}
+- Neighborhood: {{ neighborhood }}
+- Kosher requirement: {{ kosher_requirement }}
+
+If you need to update your information, you can request a login link at any time.
+
+""" + SIGNATURE
+    },
+
+    EmailType.HOST_SUBMISSION_CONFIRMATION.value: {
+        'subject': "Thank You for Hosting - ShabbatLink Registration Confirmed!",
+        'body': """
+Dear {{ full_name }},
+
+Thank you so much for offering to host a Shabbat dinner through ShabbatLink! Your generosity helps build our community.
+
+What's next?
+- We'll send you match requests with guest profiles soon.
+- You can review each request and accept or decline.
+- Guest contact details will only be shared after you accept and we finalize the match.
+
+Your hosting details:
+- Available seats: {{ seats_available }}
+- Neighborhood: {{ neighborhood }}
+- Kosher level: {{ kosher_level }}
+
+If you need to update your information, you can request a login link at any time.
+
+""" + SIGNATURE
+    },
+
+    EmailType.MAGIC_LINK.value: {
+        'subject': "Your ShabbatLink Login Link",
+        'body': """
+Dear {{ name }},
+
+You requested a login link to edit your ShabbatLink profile. Click the link below to access your profile:
+
+{{ link }}
+
+This link will expire in 15 minutes for security reasons.
+
+If you didn't request this link, you can safely ignore this email.
+
+""" + SIGNATURE
+    },
+
+    EmailType.MATCH_REQUEST_TO_HOST.value: {
+        'subject': "New Guest Request for Shabbat Dinner - {{ guest.full_name }}",
+        'body': """
+Dear {{ host_name }},
+
+Great news! We have a potential guest for your Shabbat dinner:
+
+GUEST DETAILS:
+- Name: {{ guest.full_name }}
+- Party size: {{ guest.party_size }} {{ 'person' if guest.party_size == 1 else 'people' }}
+- Neighborhood: {{ guest.neighborhood }}
+- Languages: {{ guest.languages | join(', ') }}
+- Kosher requirement: {{ guest.kosher_requirement }}
+
+WHY IT'S A FIT:
+{{ why_its_a_fit }}
+
+To respond to this request, simply click one of the links below:
+
+✅ ACCEPT THIS GUEST:
+{{ accept_link }}
+
+❌ DECLINE THIS REQUEST:
+{{ decline_link }}
+
+Note: The guest's phone number will only be shared after you accept and we finalize the match.
+
+Thank you for being a wonderful host!
+
+""" + SIGNATURE
+    },
+
+    EmailType.MATCH_REQUEST_DIGEST_TO_HOST.value: {
+        'subject': "{{ requests | length }} New Guest Requests for Shabbat Dinner",
+        'body': """
+Dear {{ host_name }},
+
+Great news! We have {{ requests | length }} potential guests for your Shabbat dinner.
+You can accept or decline each one separately:
+{% for request in requests %}
+
+GUEST {{ loop.index }}: {{ request.guest.full_name }}
+- Party size: {{ request.guest.party_size }} {{ 'person' if request.guest.party_size == 1 else 'people' }}
+- Neighborhood: {{ request.guest.neighborhood }}
+- Languages: {{ request.guest.languages | join(', ') }}
+- Kosher requirement: {{ request.guest.kosher_requirement }}
+- Why it's a fit: {{ request.why_its_a_fit }}
+
+✅ ACCEPT: {{ request.accept_link }}
+❌ DECLINE: {{ request.decline_link }}
+{% endfor %}
+
+Note: Guests' phone numbers will only be shared after you accept and we finalize the match.
+
+Thank you for being a wonderful host!
+
+""" + SIGNATURE
+    },
+
+    EmailType.MATCH_CONFIRMED_GUEST.value: {
+        'subject': "You're Confirmed for Shabbat Dinner!",
+        'body': """
+Dear {{ guest_name }},
+
+Wonderful news! You're confirmed for Shabbat dinner this Friday!
+
+YOUR HOST:
+- Name: {{ host.full_name }}
+- Address: {{ host.address }}
+- Phone: {{ host.phone }}
+- Neighborhood: {{ host.neighborhood }}
+
+{{ 'What to expect: ' ~ host.tagline if host.tagline else '' }}
+
+IMPORTANT REMINDERS:
+- Please arrive on time
+- If your plans change, contact your host immediately
+- Remember: No-shows affect your ability to use ShabbatLink in the future
+
+You'll receive a reminder on Friday to confirm your attendance.
+
+Have a wonderful Shabbat!
+
+""" + SIGNATURE
+    },
+
+    EmailType.MATCH_CONFIRMED_HOST.value: {
+        'subject': "Guest Confirmed - {{ guest.full_name }}",
+        'body': """
+Dear {{ host_name }},
+
+Your guest is confirmed for Shabbat dinner!
+
+CONFIRMED GUEST:
+- Name: {{ guest.full_name }}
+- Party size: {{ guest.party_size }} {{ 'person' if guest.party_size == 1 else 'people' }}
+- Phone: {{ guest.phone }}
+- Languages: {{ guest.languages | join(', ') }}
+
+The guest has been given your address and contact information.
+
+Please reach out to your guest before Friday if you'd like to coordinate anything.
+
+Thank you for hosting!
+
+""" + SIGNATURE
+    },
+
+    EmailType.DAY_OF_REMINDER_GUEST.value: {
+        'subject': "Shabbat Shalom! Please Confirm Your Attendance",
+        'body': """
+Shabbat Shalom, {{ guest_name }}!
+
+This is a reminder about your Shabbat dinner tonight!
+
+YOUR DINNER DETAILS:
+- Host: {{ host.full_name }}
+- Address: {{ host.address }}
+- Phone: {{ host.phone }}
+
+Please click below to confirm you're attending:
+
+✅ YES, I'M ATTENDING:
+{{ confirm_link }}
+
+IMPORTANT: If you can't make it, please contact your host immediately at {{ host.phone }}.
+
+Have a wonderful Shabbat!
+
+The ShabbatLink Team
+Jewish Latin Center
+"""
+    },
+
+    EmailType.DAY_OF_SUMMARY_HOST.value: {
+        'subject': "Your Shabbat Dinner Guest List",
+        'body': """
+Shabbat Shalom, {{ host_name }}!
+
+Here's your confirmed guest list for tonight's dinner:
+
+CONFIRMED GUESTS ({{ guests | sum(attribute='party_size') }} total):
+{% for guest in guests %}
+- {{ guest.full_name }} (party of {{ guest.party_size }}) - Phone: {{ guest.phone }}
+{% endfor %}
+
+
+All guests have been reminded to confirm their attendance.
+
+If a guest doesn't show up, you can report it after the event using the link we'll send you.
+
+Thank you for hosting! Have a wonderful Shabbat!
+
+The ShabbatLink Team
+Jewish Latin Center
+"""
+    },
+
+    EmailType.NOSHOW_REPORT_REQUEST.value: {
+        'subject': "ShabbatLink - Report Any No-Shows",
+        'body': """
+Dear {{ host_name }},
+
+Thank you for hosting a Shabbat dinner! We hope it was wonderful.
+
+We'd like to know if all your guests attended. If anyone didn't show up, please let us know so we can follow up:
+
+📋 REPORT ATTENDANCE:
+{{ report_link }}
+
+This helps us maintain a reliable community where hosts can count on their guests.
+
+Thank you for being part of ShabbatLink!
+
+""" + SIGNATURE
+    }
+}
+
+
+_compiled = None
+
+
+def compile_templates():
+    """Compile every template once; later calls return the cached set."""
+    global _compiled
+    if _compiled is None:
+        env = Environment(
+            autoescape=False,
+            keep_trailing_newline=True,
+            trim_blocks=True,
+            undefined=StrictUndefined
+        )
+        _compiled = {
+            template_id: (env.from_string(parts['subject']), env.from_string(parts['body']))
+            for template_id, parts in TEMPLATES.items()
+        }
+    return _compiled
+
+
+def render_subject(template_id, params):
+    """Render just the subject line (stored on the row for listings)."""
+    return compile_templates()[template_id][0].render(params)
+
+
+def render_body(template_id, params):
+    """Render the full email body."""
+    return compile_templates()[template_id][1].render(params)
@@ -0,0 +1,47 @@
+"""
+Magic link sweeper.
+
+Every login-link request inserts a MagicLink row. sweep_magic_links() (run via
+`python manage.py sweep-magic-links`) deletes the ones that can no longer be
+used - expired or already used - in small batches, committing after each so
+it never holds long locks on the table.
+"""
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, or_, select
+
+from app import db
+from app.models import MagicLink
+
+
+def sweep_magic_links(batch_size: int = 1000) -> int:
+    """Delete all expired or used magic links. Returns the number deleted."""
+    now = datetime.utcnow()
+    stale = or_(MagicLink.expires_at < now, MagicLink.used_at.isnot(None))
+
+    deleted = 0
+    while True:
+        ids = db.session.scalars(select(MagicLink.id).where(stale).limit(batch_size)).all()
+        if not ids:
+            break
+
+        db.session.execute(
+            delete(MagicLink)
+            .where(MagicLink.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += len(ids)
+
+    return deleted
+
+
+def run_sweeper(interval_seconds: float, batch_size: int = 1000, should_stop=lambda: False) -> None:
+    """Sweep every interval_seconds until should_stop() is true."""
+    while not should_stop():
+        deleted = sweep_magic_links(batch_size)
+        if deleted:
+            print(f"Swept {deleted} magic link(s)", flush=True)
+        db.session.remove()
+        time.sleep(interval_seconds)
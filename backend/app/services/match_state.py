@@ -0,0 +1,127 @@
+"""
+Match state machine.
+
+    proposed -> requested -> accepted -> confirmed
+                          -> declined
+
+Every status change goes through transition(), which applies it as a single
+compare-and-swap:
+
+    UPDATE matches SET status=:new, version=version+1, ...
+    WHERE id=:id AND status=:old AND version=:version
+
+A rowcount of 0 means another request changed the match after it was loaded
+(a double click, or an admin and a host acting at once). The caller gets
+False and reports the conflict; no row is locked and nothing is re-read.
+update_in_status() is the same guard for writes that keep the status (e.g.
+day-of attendance confirmation).
+"""
+from datetime import datetime
+from typing import Iterable, Set
+
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import db
+from app.models import Match
+from app.config import MatchStatus
+
+
+TRANSITIONS = {
+    MatchStatus.PROPOSED.value: {MatchStatus.REQUESTED.value},
+    MatchStatus.REQUESTED.value: {MatchStatus.ACCEPTED.value, MatchStatus.DECLINED.value},
+    MatchStatus.ACCEPTED.value: {MatchStatus.CONFIRMED.value},
+    MatchStatus.DECLINED.value: set(),
+    MatchStatus.CONFIRMED.value: set()
+}
+
+CONFLICT_MESSAGE = "This match was just updated by someone else. Please refresh and try again."
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in TRANSITIONS.get(from_status, ())
+
+
+def _compare_and_swap(match: Match, values: dict) -> bool:
+    values = {**values, 'version': Match.version + 1, 'updated_at': datetime.utcnow()}
+    result = db.session.execute(
+        update(Match)
+        .where(
+            Match.id == match.id,
+            Match.status == match.status,
+            Match.version == match.version
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    # Mirror the row on the loaded instance without marking it dirty
+    values['version'] = match.version + 1
+    for key, value in values.items():
+        set_committed_value(match, key, value)
+    return True
+
+
+def transition(match: Match, to_status: str, **values) -> bool:
+    """
+    Move a loaded match to to_status, setting any extra column values.
+
+    Returns False if the match changed since it was loaded. Raises
+    ValueError for a transition the state machine does not allow.
+    """
+    if not can_transition(match.status, to_status):
+        raise ValueError(f"Invalid match transition {match.status} -> {to_status}")
+    return _compare_and_swap(match, {'status': to_status, **values})
+
+
+def update_in_status(match: Match, **values) -> bool:
+    """Set column values on a loaded match only if it is unchanged since loading."""
+    return _compare_and_swap(match, values)
+
+
+def transition_many(matches: Iterable[Match], to_status: str, **values) -> Set[str]:
+    """
+    transition() for several loaded matches, usually in a single UPDATE.
+
+    Returns the ids that moved; the rest were changed by someone else. Uses
+    UPDATE ... RETURNING where the database supports it, otherwise one
+    compare-and-swap per match.
+    """
+    matches = list(matches)
+    if not matches:
+        return set()
+
+    if not db.session.get_bind().dialect.update_returning:
+        return {m.id for m in matches if transition(m, to_status, **values)}
+
+    for match in matches:
+        if not can_transition(match.status, to_status):
+            raise ValueError(f"Invalid match transition {match.status} -> {to_status}")
+
+    # One UPDATE per (status, version) seen at load time - usually just one
+    now = datetime.utcnow()
+    groups = {}
+    for match in matches:
+        groups.setdefault((match.status, match.version), []).append(match)
+
+    moved = set()
+    for (status, version), group in groups.items():
+        moved.update(db.session.scalars(
+            update(Match)
+            .where(
+                Match.id.in_([m.id for m in group]),
+                Match.status == status,
+                Match.version == version
+            )
+            .values(status=to_status, version=Match.version + 1, updated_at=now, **values)
+            .returning(Match.id)
+            .execution_options(synchronize_session=False)
+        ).all())
+
+    for match in matches:
+        if match.id in moved:
+            for key, value in {'status': to_status, 'version': match.version + 1, 'updated_at': now, **values}.items():
+                set_committed_value(match, key, value)
+    return moved
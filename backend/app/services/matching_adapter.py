@@ -4,6 +4,7 @@ Matching Adapter - Bridges ORM models and the matching engine.
 This is the ONLY place where SQLAlchemy models and matching engine meet.
 To swap matching algorithms, change which engine is instantiated here.
 """
+import time
 from typing import List
 from app import db
 from app.models import Guest, Host, Match
@@ -12,6 +13,9 @@ from app.matching import (
     DefaultMatchingEngine
 )
 from app.matching.explainer import generate_explanation
+from app.matching.timing import PhaseTimer
+from app.utils.snapshot import begin_snapshot, end_snapshot
+from app.models.match import COMMITTED_STATUSES
 from app.config import MatchStatus
 
 
@@ -50,101 +54,135 @@ def host_to_data(host: Host) -> HostData:
     )
 
 
+def _replace_proposals(proposals, snapshot_hwm) -> int:
+    """Swap the proposed matches for this run's (flushed here so the writes are timed)."""
+    Match.query.filter_by(status=MatchStatus.PROPOSED.value).delete()
+    for proposed in proposals:
+        db.session.add(Match(
+            guest_id=proposed.guest_id,
+            host_id=proposed.host_id,
+            status=MatchStatus.PROPOSED.value,
+            match_score=proposed.score,
+            why_its_a_fit=proposed.why_fit,
+            snapshot_hwm=snapshot_hwm
+        ))
+    db.session.flush()
+    return len(proposals)
+
+
 def run_matching() -> dict:
     """
-    Run the matching algorithm and create Match records.
+    Run the matching algorithm and replace the proposed matches with its results.
     
     This function:
-    1. Loads all unmatched guests and available hosts
-    2. Converts them to plain data structures
+    1. Loads all guests without a committed match and all hosts, in one
+       snapshot (see utils/snapshot.py; callers that run at REPEATABLE READ
+       must call begin_snapshot() before their first statement), and
+       converts them to plain data structures
+    2. Ends the snapshot, so on SQLite no lock is held while the engine runs
     3. Calls the matching engine
-    4. Creates Match ORM records from the results
+    4. Deletes the old proposals and creates Match records from the results,
+       the request's only writes (committed right after by the unit of work)
     
     Returns:
-        dict with matching statistics
+        dict with matching statistics. stats['phase_ms'] holds milliseconds
+        per phase (load, convert, capacity, the engine's own phases, insert)
+        plus the run's total.
     """
-    # Get guests who don't have an active match
-    active_match_guest_ids = db.session.query(Match.guest_id).filter(
-        Match.status.in_([
-            MatchStatus.PROPOSED.value,
-            MatchStatus.REQUESTED.value,
-            MatchStatus.ACCEPTED.value,
-            MatchStatus.CONFIRMED.value
-        ])
-    ).distinct()
-    
-    guests = Guest.query.filter(
-        ~Guest.id.in_(active_match_guest_ids)
-    ).all()
+    timer = PhaseTimer()
+    run_started = time.perf_counter()
     
-    # Get all hosts (we'll track capacity during matching)
-    hosts = Host.query.all()
+    def finish(result: dict, stats: dict) -> dict:
+        timer.add('total', time.perf_counter() - run_started)
+        result['stats'] = {**stats, 'phase_ms': timer.as_ms()}
+        return result
     
-    if not guests or not hosts:
-        return {
-            'matches_created': 0,
-            'unmatched_guests': [g.id for g in guests] if guests else [],
-            'error': 'No guests or hosts available for matching'
-        }
+    with timer.phase('load'):
+        begin_snapshot()
+        
+        # Get guests who don't have a committed match (proposals are replaced by this run)
+        committed_guest_ids = db.session.query(Match.guest_id).filter(
+            Match.status.in_(COMMITTED_STATUSES)
+        ).distinct()
+        
+        guests = Guest.query.filter(
+            ~Guest.id.in_(committed_guest_ids)
+        ).all()
+        
+        # Get all hosts (we'll track capacity during matching)
+        hosts = Host.query.all()
+        
+        # High-water mark of what this run read, stored on each proposal
+        snapshot_hwm = max((row.updated_at for row in [*guests, *hosts]), default=None)
     
     # Convert to plain data structures
-    guest_data_list = [guest_to_data(g) for g in guests]
-    host_data_list = [host_to_data(h) for h in hosts]
+    with timer.phase('convert'):
+        guest_data_list = [guest_to_data(g) for g in guests]
+        host_data_list = [host_to_data(h) for h in hosts]
     
-    # Adjust host capacity for existing matches
-    for host_data in host_data_list:
-        existing_matches = Match.query.filter(
-            Match.host_id == host_data.id,
-            Match.status.in_([
-                MatchStatus.REQUESTED.value,
-                MatchStatus.ACCEPTED.value,
-                MatchStatus.CONFIRMED.value
-            ])
-        ).all()
+    with timer.phase('capacity'):
+        # Adjust host capacity for existing matches (seats per host in one query;
+        # proposed matches are replaced by this run, so only later states count)
+        seats_taken = dict(
+            db.session.query(Match.host_id, db.func.sum(Guest.party_size))
+            .join(Guest, Guest.id == Match.guest_id)
+            .filter(Match.status.in_(COMMITTED_STATUSES))
+            .group_by(Match.host_id)
+            .all()
+        )
+        for host_data in host_data_list:
+            host_data.seats_available -= seats_taken.get(host_data.id, 0) or 0
         
-        # Get guest lookup for party size
-        for match in existing_matches:
-            guest = Guest.query.get(match.guest_id)
-            if guest:
-                host_data.seats_available -= guest.party_size
+        # Filter out hosts with no remaining capacity
+        available_hosts = [h for h in host_data_list if h.seats_available > 0]
     
-    # Filter out hosts with no remaining capacity
-    host_data_list = [h for h in host_data_list if h.seats_available > 0]
+    # Everything is read: the engine runs without holding the database
+    end_snapshot()
+    
+    if not guest_data_list or not host_data_list:
+        with timer.phase('insert'):
+            _replace_proposals([], snapshot_hwm)
+        return finish({
+            'matches_created': 0,
+            'unmatched_guests': [g.id for g in guest_data_list],
+            'error': 'No guests or hosts available for matching'
+        }, {'total_guests': len(guest_data_list), 'total_hosts': len(host_data_list)})
     
-    if not host_data_list:
-        return {
+    if not available_hosts:
+        with timer.phase('insert'):
+            _replace_proposals([], snapshot_hwm)
+        return finish({
             'matches_created': 0,
             'unmatched_guests': [g.id for g in guest_data_list],
             'error': 'No hosts with available capacity'
-        }
+        }, {'total_guests': len(guest_data_list), 'total_hosts': 0})
     
     # Create matching engine and run
     # *** TO SWAP ALGORITHMS: Change this line ***
     engine = DefaultMatchingEngine()
     config = MatchingConfig()
     
-    result = engine.generate_matches(guest_data_list, host_data_list, config)
+    engine_started = time.perf_counter()
+    result = engine.generate_matches(guest_data_list, available_hosts, config)
+    engine_seconds = time.perf_counter() - engine_started
     
-    # Create Match records from results
-    matches_created = 0
-    for proposed in result.matches:
-        match = Match(
-            guest_id=proposed.guest_id,
-            host_id=proposed.host_id,
-            status=MatchStatus.PROPOSED.value,
-            match_score=proposed.score,
-            why_its_a_fit=proposed.why_fit
-        )
-        db.session.add(match)
-        matches_created += 1
+    # Engines that report their own phases get them merged in; others are one 'engine' phase
+    stats = dict(result.stats)
+    engine_phase_ms = stats.pop('phase_ms', None)
+    if engine_phase_ms:
+        timer.update(engine_phase_ms)
+    else:
+        timer.add('engine', engine_seconds)
     
-    db.session.commit()
+    # The write transaction starts here: old proposals out, this run's in
+    with timer.phase('insert'):
+        matches_created = _replace_proposals(result.matches, snapshot_hwm)
     
-    return {
+    return finish({
         'matches_created': matches_created,
         'unmatched_guests': result.unmatched_guests,
-        'stats': result.stats
-    }
+        'snapshot_hwm': snapshot_hwm.isoformat() if snapshot_hwm else None
+    }, stats)
 
 
 def generate_why_fit(guest: Guest, host: Host) -> str:
@@ -0,0 +1,210 @@
+"""
+Asynchronous registration intake (INTAKE_MODE=async).
+
+During signup spikes POST /api/guests and /api/hosts only validate the body,
+append it to registration_intake and answer 202 with a tracking id
+(enqueue_registration). The intake worker (`python manage.py intake-worker`)
+then applies queued registrations in batches:
+
+1. Claim a batch, as the email worker does (utils/leases.py)
+2. Look up every email in the batch with one SELECT per table, rejecting
+   duplicates (including repeats within the batch)
+3. Insert the new guests/hosts, their activity log entries and confirmation
+   emails with one multi-row INSERT per table, and commit once
+
+If the batch fails (a constraint hit by a registration that arrived through
+the synchronous path meanwhile, or a row the database refuses), the batch is
+retried one row at a time. A row that fails on its own is marked `failed`
+with the error and the worker moves on, so one bad row cannot block the
+queue behind it.
+
+Clients poll GET /api/intake/<tracking_id> for the outcome. The registration
+payload (name, email, phone, address) is cleared once a row is applied or
+rejected; `manage.py sweep-intake` deletes finished rows after a retention
+period, and with them the payloads kept on failed rows.
+"""
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Guest, Host, ActivityLog, RegistrationIntake
+from app.services.email_service import EmailService
+from app.utils.ids import new_id
+from app.utils.leases import claim_batch
+from app.config import ActivityType, IntakeStatus
+
+
+DUPLICATE_EMAIL = "An account with this email already exists. Use the login link to edit your profile."
+
+# kind -> (model, activity type, confirmation email)
+KINDS = {
+    'guest': (Guest, ActivityType.GUEST_REGISTERED, EmailService.send_guest_submission_confirmation),
+    'host': (Host, ActivityType.HOST_REGISTERED, EmailService.send_host_submission_confirmation)
+}
+
+
+def enqueue_registration(kind: str, data: dict) -> RegistrationIntake:
+    """Queue a validated registration; committed with the request."""
+    intake = RegistrationIntake(id=new_id(), kind=kind, payload=data, status=IntakeStatus.PENDING.value)
+    db.session.add(intake)
+    return intake
+
+
+class IntakeWorker:
+    """Applies queued registrations in batches."""
+
+    def __init__(self, batch_size: int = 200, lease_seconds: int = 120):
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    def _claimable(self, now):
+        return (
+            RegistrationIntake.status == IntakeStatus.PENDING.value,
+            or_(RegistrationIntake.lease_expires_at.is_(None), RegistrationIntake.lease_expires_at < now)
+        )
+
+    def claim_batch(self) -> List[RegistrationIntake]:
+        """Lease up to batch_size pending registrations to this worker, oldest first."""
+        return claim_batch(
+            RegistrationIntake, self._claimable, self.worker_id, self.batch_size, self.lease_seconds
+        )
+
+    def apply(self, intakes: List[RegistrationIntake]) -> None:
+        """Stage the registrations (or rejections) for a batch; the caller commits."""
+        now = datetime.utcnow()
+
+        for kind, (model, activity_type, send_confirmation) in KINDS.items():
+            batch = [intake for intake in intakes if intake.kind == kind]
+            if not batch:
+                continue
+
+            emails = {intake.payload['email'] for intake in batch}
+            taken = set(db.session.scalars(select(model.email).where(model.email.in_(emails))))
+
+            created = []
+            for intake in batch:
+                email = intake.payload['email']
+                if email in taken:
+                    self._finish(intake, now, error=DUPLICATE_EMAIL)
+                    continue
+                taken.add(email)
+                record = model.from_registration(intake.payload)
+                db.session.add(record)
+                created.append((intake, record))
+
+            db.session.flush()  # Assigns ids; one multi-row INSERT for the batch
+
+            for intake, record in created:
+                ActivityLog.log(
+                    activity_type.value,
+                    actor=kind,
+                    target_type=kind,
+                    target_id=record.id,
+                    details={'email': record.email, 'name': record.full_name, 'intake_id': intake.id}
+                )
+                send_confirmation(record)
+                self._finish(intake, now, result_id=record.id)
+
+    @staticmethod
+    def _finish(intake, now, result_id=None, error=None):
+        intake.status = IntakeStatus.REJECTED.value if error else IntakeStatus.APPLIED.value
+        intake.result_id = result_id
+        intake.error = error
+        intake.payload = {}  # Done with the personal details; the guest/host row has them
+        intake.processed_at = now
+        intake.lease_expires_at = None
+
+    @staticmethod
+    def _email_taken(intake):
+        model = KINDS[intake.kind][0]
+        email = intake.payload.get('email')
+        return db.session.scalar(select(model.id).where(model.email == email).limit(1)) is not None
+
+    @staticmethod
+    def _fail(intake, now, exc):
+        """Park a row the worker cannot apply; its payload stays for inspection."""
+        intake.status = IntakeStatus.FAILED.value
+        intake.error = f"{type(exc).__name__}: {exc}"[:1000]
+        intake.processed_at = now
+        intake.lease_expires_at = None
+
+    def run_once(self) -> dict:
+        """Claim and apply one batch; returns counts."""
+        intakes = self.claim_batch()
+        if not intakes:
+            return {'claimed': 0, 'applied': 0, 'rejected': 0, 'failed': 0}
+
+        try:
+            self.apply(intakes)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for intake in intakes:
+                try:
+                    self.apply([intake])
+                    db.session.commit()
+                except IntegrityError as exc:
+                    db.session.rollback()
+                    if self._email_taken(intake):  # Registered synchronously since the lookup
+                        self._finish(intake, datetime.utcnow(), error=DUPLICATE_EMAIL)
+                    else:  # Another constraint, e.g. a missing required value
+                        self._fail(intake, datetime.utcnow(), exc)
+                    db.session.commit()
+                except Exception as exc:  # Bad payload or a value the database refuses
+                    db.session.rollback()
+                    self._fail(intake, datetime.utcnow(), exc)
+                    db.session.commit()
+
+        counts = {status: 0 for status in (IntakeStatus.APPLIED, IntakeStatus.REJECTED, IntakeStatus.FAILED)}
+        for intake in intakes:
+            counts[IntakeStatus(intake.status)] += 1
+        return {
+            'claimed': len(intakes),
+            'applied': counts[IntakeStatus.APPLIED],
+            'rejected': counts[IntakeStatus.REJECTED],
+            'failed': counts[IntakeStatus.FAILED]
+        }
+
+    def run_forever(self, poll_interval: float = 1.0, should_stop=lambda: False) -> None:
+        """Apply batches until should_stop() is true; sleep only when idle."""
+        while not should_stop():
+            result = self.run_once()
+            if result['claimed']:
+                print(f"Intake: {result}", flush=True)
+            else:
+                db.session.remove()
+                time.sleep(poll_interval)
+
+
+def sweep_intake(older_than_days: int = 7, batch_size: int = 1000) -> int:
+    """Delete applied, rejected and failed intake rows processed over older_than_days ago."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = 0
+    while True:
+        ids = db.session.scalars(
+            select(RegistrationIntake.id)
+            .where(
+                RegistrationIntake.status != IntakeStatus.PENDING.value,
+                RegistrationIntake.processed_at < cutoff
+            )
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        db.session.execute(
+            delete(RegistrationIntake)
+            .where(RegistrationIntake.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += len(ids)
+
+    return deleted
@@ -2,6 +2,7 @@
 from app.utils.tokens import (
     generate_action_token,
     verify_action_token,
+    generate_multi_target_token,
     generate_session_token,
     verify_session_token
 )
@@ -10,6 +11,7 @@ from app.utils.responses import success_response, error_response
 __all__ = [
     'generate_action_token',
     'verify_action_token',
+    'generate_multi_target_token',
     'generate_session_token',
     'verify_session_token',
     'success_response',
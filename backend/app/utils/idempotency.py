@@ -0,0 +1,141 @@
+"""
+Idempotency-Key support for retried mutations.
+
+A client that may retry a request (a registration on a flaky mobile
+connection, an admin double-submit) sends an `Idempotency-Key` header with a
+unique value. For routes decorated with @idempotent:
+
+- The first request with a key claims it by inserting an idempotency_keys
+  row in the request's own transaction. The view then runs as usual, and its
+  response is stored on that row, so the key, the response and the view's
+  writes commit together. Error responses roll all of it back, so the key
+  can be retried.
+- A later request with the same key gets the stored response, with an
+  `Idempotent-Replayed: true` header. The view does not run again, so no
+  validation, inserts or emails are repeated.
+- A retry that arrives while the first request is still running blocks on
+  the claim's primary key until the first one commits, then replays it.
+- Reusing a key with a different body answers 422.
+- An expired key is deleted and claimed again as a new row, so of two
+  requests reusing it at once, one wins the insert and the other replays.
+
+Keys are scoped to the method and path and kept for IDEMPOTENCY_TTL_SECONDS
+(default 24 hours). `python manage.py sweep-idempotency-keys` deletes expired
+ones. Requests without the header are not affected.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import IdempotencyKey
+from app.utils.responses import error_response
+
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def _scoped_key(key):
+    return hashlib.sha256(f'{request.method} {request.path} {key}'.encode()).hexdigest()
+
+
+def _request_hash():
+    return hashlib.sha256(request.get_data()).hexdigest()[:32]
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return error_response(
+            f"{HEADER} was already used for a different request", status_code=422
+        )
+    if stored.status_code is None:
+        return error_response(
+            f"A request with this {HEADER} is still being processed", status_code=409
+        )
+
+    response = make_response(jsonify(stored.response), stored.status_code)
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotent(f):
+    """Decorator: replay the stored response for a repeated Idempotency-Key."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return f(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return error_response(f"{HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+        scoped_key = _scoped_key(key)
+        request_hash = _request_hash()
+        now = time.time()
+
+        claim = db.session.get(IdempotencyKey, scoped_key)
+        if claim is not None and claim.expires_at >= now:
+            return _replay(claim, request_hash)
+
+        # An expired row is deleted and the key inserted afresh rather than
+        # updated in place, so concurrent reuses of it race on the primary key
+        if claim is not None:
+            db.session.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.key == scoped_key, IdempotencyKey.expires_at < now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.expunge(claim)
+
+        # Claim the key; a concurrent request with the same key blocks on this
+        # row until we commit, then replays our response
+        claim = IdempotencyKey(
+            key=scoped_key, request_hash=request_hash,
+            expires_at=now + current_app.config['IDEMPOTENCY_TTL_SECONDS']
+        )
+        db.session.add(claim)
+        try:
+            db.session.flush()
+        except IntegrityError:  # Committed by a concurrent request meanwhile
+            db.session.rollback()
+            stored = db.session.get(IdempotencyKey, scoped_key)
+            if stored is None:
+                return error_response(
+                    f"A request with this {HEADER} is still being processed", status_code=409
+                )
+            return _replay(stored, request_hash)
+
+        response = make_response(f(*args, **kwargs))
+
+        # Error responses are rolled back with the claim by the unit of work
+        if response.status_code < 400:
+            claim.status_code = response.status_code
+            claim.response = response.get_json(silent=True)
+        return response
+    return decorated_function
+
+
+def sweep_idempotency_keys(batch_size: int = 1000) -> int:
+    """Delete expired idempotency keys in batches. Returns the number deleted."""
+    deleted = 0
+    while True:
+        keys = db.session.scalars(
+            select(IdempotencyKey.key).where(IdempotencyKey.expires_at < time.time()).limit(batch_size)
+        ).all()
+        if not keys:
+            break
+
+        db.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key.in_(keys))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += len(keys)
+
+    return deleted
@@ -0,0 +1,92 @@
+"""
+Primary key ids.
+
+Ids are UUID strings everywhere in Python (routes, tokens, JSON). Two
+settings control how they are generated and stored:
+
+- ID_FORMAT (default 'uuid7'): new_id() makes time-ordered UUIDv7 ids
+  (RFC 9562: 48-bit millisecond timestamp, then random bits). Consecutive
+  inserts land next to each other at the right-hand edge of the primary key
+  B-tree, instead of at random pages as with 'uuid4'. Both kinds are valid
+  UUIDs and can share a table.
+- ID_STORAGE (default 'string'): how Id columns are stored. 'string' is
+  CHAR(36) text, as existing databases have. 'native' uses PostgreSQL's
+  16-byte UUID type, or a 16-byte BLOB elsewhere. This makes every primary
+  key, foreign key and index entry less than half the size. Switching an
+  existing database to 'native' means copying it (`python manage.py
+  copy-database`); the column types differ.
+"""
+import os
+import time
+import uuid
+
+from flask import current_app, has_app_context
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.types import TypeDecorator
+
+from app import db
+
+
+ID_FORMATS = ('uuid7', 'uuid4')
+ID_STORAGES = ('string', 'native')
+
+
+def uuid7() -> uuid.UUID:
+    """A UUIDv7: unix time in milliseconds, then 74 random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # Version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """A new id in the configured ID_FORMAT (column default for every model)."""
+    if has_app_context() and current_app.config['ID_FORMAT'] == 'uuid4':
+        return str(uuid.uuid4())
+    return str(uuid7())
+
+
+def _storage(dialect):
+    return getattr(dialect, 'id_storage', 'string')
+
+
+class Id(TypeDecorator):
+    """A UUID id column: a str in Python, stored as text or natively per ID_STORAGE."""
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if _storage(dialect) != 'native':
+            return dialect.type_descriptor(String(36))
+        if dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import UUID  # Not imported on SQLite
+            return dialect.type_descriptor(UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or _storage(dialect) != 'native':
+            return value
+        try:
+            parsed = uuid.UUID(str(value))
+        except ValueError:
+            return None  # A malformed id (e.g. from a URL) matches nothing
+        return str(parsed) if dialect.name == 'postgresql' else parsed.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def init_ids(app):
+    """Tell the app's engine how its Id columns are stored (before first use)."""
+    storage = app.config['ID_STORAGE']
+    if storage not in ID_STORAGES:
+        raise ValueError(f"ID_STORAGE must be one of {', '.join(ID_STORAGES)}")
+    if app.config['ID_FORMAT'] not in ID_FORMATS:
+        raise ValueError(f"ID_FORMAT must be one of {', '.join(ID_FORMATS)}")
+
+    with app.app_context():
+        db.engine.dialect.id_storage = storage
@@ -0,0 +1,124 @@
+"""
+Cluster-wide job locks.
+
+A JobLock makes sure only one request across all workers and instances runs a
+job (e.g. 'matching') at a time. A row in job_leases names the holder and a
+lease expiry. It is taken with a conditional UPDATE (or INSERT for a new job)
+in a transaction of its own, which commits before acquire() returns: other
+workers see it immediately, and the request's session is left untouched, so
+the job can open its own snapshot afterwards (see utils/snapshot.py). A
+holder that crashes stops blocking others once its lease lapses.
+
+complete() frees the lease and stores the job's result in the request's own
+transaction, so the lock is released exactly when the job's writes commit.
+If that transaction rolls back instead (an error response, or a failed
+commit), the lease is freed on its own connection at request teardown rather
+than blocking other runs until it lapses.
+A request that lost the race can wait_for_result() to join the running job.
+"""
+import time
+import uuid
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import JobLease
+from app.utils.unit_of_work import on_rollback
+
+
+class JobLock:
+    """Lease on one named job for the current request."""
+
+    def __init__(self, name, lease_seconds):
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.holder = str(uuid.uuid4())
+        self.acquired_at = None
+
+    def acquire(self):
+        """Take the lock, in its own transaction. Returns False if another holder has it."""
+        postgres = db.engine.dialect.name == 'postgresql'
+        now = time.time()
+        lease = {'holder': self.holder, 'acquired_at': now, 'expires_at': now + self.lease_seconds}
+        # Only a free or lapsed lease can be taken; racing UPDATEs re-check this
+        # against the winner's row, so exactly one succeeds
+        conditions = [JobLease.name == self.name, or_(JobLease.holder.is_(None), JobLease.expires_at < now)]
+
+        with db.engine.begin() as connection:
+            if not postgres:
+                # Check before writing: on SQLite a running job's transaction holds
+                # the write lock, and the UPDATE would queue behind it instead of
+                # reporting that the job is busy
+                current = connection.execute(
+                    select(JobLease.holder, JobLease.expires_at).where(JobLease.name == self.name)
+                ).first()
+                if current is not None and current.holder is not None and current.expires_at >= now:
+                    return False
+
+            taken = connection.execute(
+                update(JobLease).where(*conditions).values(**lease)
+            ).rowcount
+            if not taken:
+                insert = postgresql.insert if postgres else sqlite.insert
+                taken = connection.execute(
+                    insert(JobLease)
+                    .values(name=self.name, **lease)
+                    .on_conflict_do_nothing(index_elements=['name'])
+                ).rowcount
+
+        if taken:
+            self.acquired_at = now
+        return bool(taken)
+
+    def complete(self, result):
+        """Free the lock and record the result, as part of the request's transaction."""
+        db.session.execute(
+            update(JobLease)
+            .where(JobLease.name == self.name, JobLease.holder == self.holder)
+            .values(holder=None, expires_at=None, result=result, completed_at=time.time())
+            .execution_options(synchronize_session=False)
+        )
+        on_rollback(self.abandon)
+
+    def abandon(self):
+        """Free the lock right away (on its own connection) after a failed run."""
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(JobLease)
+                .where(JobLease.name == self.name, JobLease.holder == self.holder)
+                .values(holder=None, expires_at=None)
+            )
+
+
+def wait_for_result(name, timeout, poll_interval=0.5):
+    """
+    Wait for the job currently holding `name` to finish.
+
+    Returns its stored result, or None if it did not finish within timeout
+    seconds, or ended without completing (failed or lease lapsed).
+    """
+    deadline = time.time() + timeout
+    waiting_on = None
+
+    while True:
+        with db.engine.connect() as connection:
+            lease = connection.execute(
+                select(JobLease.holder, JobLease.acquired_at, JobLease.expires_at,
+                       JobLease.result, JobLease.completed_at)
+                .where(JobLease.name == name)
+            ).first()
+
+        if lease is None:
+            return None
+        if waiting_on is None:
+            waiting_on = lease.acquired_at or 0.0
+
+        now = time.time()
+        finished = lease.holder is None or lease.acquired_at != waiting_on or lease.expires_at < now
+        if finished:
+            completed = lease.completed_at is not None and lease.completed_at >= waiting_on
+            return lease.result if completed else None
+        if now >= deadline:
+            return None
+        time.sleep(poll_interval)
@@ -0,0 +1,74 @@
+"""
+Batch claims for queue tables worked by several processes at once.
+
+A queue row is taken by stamping its lease_owner/lease_expires_at columns;
+a worker that dies leaves a lease that simply expires, and the row can be
+claimed again. claim_batch() leases up to `limit` claimable rows, oldest
+first, and commits:
+
+- Postgres: SELECT ... FOR UPDATE SKIP LOCKED, then stamp the lease, so
+  concurrent workers skip each other's rows instead of waiting on them
+- SQLite: a single conditional UPDATE stamping the lease columns
+
+Used by the email outbox worker (services/email_delivery.py) and the
+registration intake worker (services/registration_intake.py).
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import select, update
+
+from app import db
+
+
+def _lease_owner(model, worker_id: str) -> str:
+    """A claim id unique to one batch, clipped to the model's lease_owner column."""
+    suffix = f":{uuid.uuid4().hex[:12]}"
+    # However long the hostname in worker_id is
+    return worker_id[:model.lease_owner.type.length - len(suffix)] + suffix
+
+
+def claim_batch(model, claimable: Callable, worker_id: str, limit: int, lease_seconds: int) -> List:
+    """
+    Lease up to limit rows of model to this worker and return them, oldest first.
+
+    claimable(now) returns the WHERE conditions for rows that may be claimed
+    now; they must exclude rows whose lease has not expired.
+    """
+    now = datetime.utcnow()
+    lease_owner = _lease_owner(model, worker_id)
+    lease_expires_at = now + timedelta(seconds=lease_seconds)
+
+    if db.engine.dialect.name == 'postgresql':
+        ids = db.session.execute(
+            select(model.id)
+            .where(*claimable(now))
+            .order_by(model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if ids:
+            db.session.execute(
+                update(model)
+                .where(model.id.in_(ids))
+                .values(lease_owner=lease_owner, lease_expires_at=lease_expires_at)
+            )
+    else:
+        # SQLite serializes writers, so one UPDATE ... WHERE id IN (subquery)
+        # is an atomic claim; the lease columns re-check claimability
+        due = (
+            select(model.id)
+            .where(*claimable(now))
+            .order_by(model.created_at)
+            .limit(limit)
+        )
+        db.session.execute(
+            update(model)
+            .where(model.id.in_(due.scalar_subquery()), *claimable(now))
+            .values(lease_owner=lease_owner, lease_expires_at=lease_expires_at)
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+
+    return model.query.filter_by(lease_owner=lease_owner).order_by(model.created_at).all()
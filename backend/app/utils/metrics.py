@@ -0,0 +1,154 @@
+"""
+Per-request instrumentation.
+
+init_metrics(app) records, for every request, the endpoint, method, status,
+latency, and the number and total time of SQL statements it issued (via
+SQLAlchemy cursor events). Observations are aggregated in-process into
+histograms served by GET /api/admin/metrics in the Prometheus text format,
+along with how long each startup phase took (see utils/startup.py).
+With several worker processes, each exposes its own counts.
+
+In debug mode responses also carry X-Query-Count and X-Query-Time-Ms.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket histogram (one per label set)."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Thread-safe store of request metrics, keyed by (method, endpoint)."""
+
+    HISTOGRAMS = (
+        ('http_request_duration_seconds', 'Request latency in seconds', LATENCY_BUCKETS),
+        ('http_request_sql_statements', 'SQL statements issued per request', QUERY_COUNT_BUCKETS),
+        ('http_request_sql_duration_seconds', 'Time spent in SQL per request', LATENCY_BUCKETS)
+    )
+
+    def __init__(self, prefix='shabbatlink'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._requests = {}  # (method, endpoint, status) -> count
+        self._histograms = {}  # (method, endpoint) -> [Histogram per HISTOGRAMS entry]
+        self.startup_ms = {}  # phase -> ms, set once create_app finishes
+
+    def observe(self, method, endpoint, status, latency, sql_count, sql_time):
+        with self._lock:
+            key = (method, endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            histograms = self._histograms.get((method, endpoint))
+            if histograms is None:
+                histograms = self._histograms[(method, endpoint)] = [
+                    Histogram(buckets) for _, _, buckets in self.HISTOGRAMS
+                ]
+            for histogram, value in zip(histograms, (latency, sql_count, sql_time)):
+                histogram.observe(value)
+
+    def render(self):
+        """Prometheus text exposition of everything recorded so far."""
+        with self._lock:
+            name = f'{self.prefix}_http_requests_total'
+            lines = [f'# HELP {name} Requests handled', f'# TYPE {name} counter']
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f'{name}{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+
+            for index, (suffix, help_text, _) in enumerate(self.HISTOGRAMS):
+                name = f'{self.prefix}_{suffix}'
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for (method, endpoint), histograms in sorted(self._histograms.items()):
+                    labels = f'method="{method}",endpoint="{endpoint}"'
+                    lines += histograms[index].render(name, labels)
+
+            name = f'{self.prefix}_startup_phase_seconds'
+            lines += [f'# HELP {name} Time spent in each startup phase', f'# TYPE {name} gauge']
+            for phase, ms in self.startup_ms.items():
+                lines.append(f'{name}{{phase="{phase}"}} {round(ms / 1000, 6)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# The start time lives on the statement's execution context, so a statement
+# that raises takes it with it instead of leaving it on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'metrics_started', None)
+    if has_request_context() and started is not None:
+        elapsed = time.perf_counter() - started
+        g.sql_count = g.get('sql_count', 0) + 1
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+
+
+def init_metrics(app):
+    """Register the request hooks and SQL listeners, and the app's MetricsRegistry."""
+    registry = app.extensions['metrics'] = MetricsRegistry()
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+
+        sql_count = g.get('sql_count', 0)
+        registry.observe(
+            request.method,
+            request.endpoint or 'unmatched',
+            response.status_code,
+            time.perf_counter() - started,
+            sql_count,
+            g.get('sql_time', 0.0)
+        )
+        if app.debug:
+            response.headers['X-Query-Count'] = str(sql_count)
+            response.headers['X-Query-Time-Ms'] = f"{g.get('sql_time', 0.0) * 1000:.1f}"
+        return response
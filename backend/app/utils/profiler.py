@@ -0,0 +1,129 @@
+"""
+On-demand cProfile for admin requests.
+
+With PROFILER_ENABLED, an authenticated admin request carrying an
+`X-Profile` header or `_profile` query parameter runs its view under cProfile:
+- '1' / 'inline': the JSON body gains a `profile` key with the top functions
+  by cumulative time and every SQL statement the view issued.
+- 'store': the body is left alone.
+Either way the raw stats are written to PROFILER_DIR as `<id>.pstats`
+(returned in X-Profile-Id) for GET /api/admin/profiles/<id>.
+
+Only the view is profiled; the unit-of-work commit runs after it. When the
+profiler is disabled nothing is registered and admin_required skips it after
+one config lookup.
+"""
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+
+from flask import current_app, g, has_request_context, make_response, request
+from sqlalchemy import event
+
+from app import db
+
+
+HEADER = 'X-Profile'
+QUERY_PARAM = '_profile'
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[a-z0-9_.]+-[0-9a-f]{8}$')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and g.get('profile_sql') is not None:
+        conn.info.setdefault('profile_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and g.get('profile_sql') is not None and conn.info.get('profile_started'):
+        elapsed = time.perf_counter() - conn.info['profile_started'].pop()
+        g.profile_sql.append({'statement': statement, 'duration_ms': round(elapsed * 1000, 3)})
+
+
+def init_profiler(app):
+    """Register the SQL capture listeners (no-op unless PROFILER_ENABLED)."""
+    if not app.config['PROFILER_ENABLED']:
+        return
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def requested_mode():
+    """'inline', 'store', or None when the request did not ask to be profiled."""
+    value = request.headers.get(HEADER) or request.args.get(QUERY_PARAM)
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value == 'store':
+        return 'store'
+    return 'inline' if value in ('1', 'true', 'inline') else None
+
+
+def profile_path(profile_id):
+    """Path of a stored profile, or None for an id that is not one of ours."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return os.path.join(current_app.config['PROFILER_DIR'], f'{profile_id}.pstats')
+
+
+def summarize(stats, top):
+    """Top `top` functions by cumulative time from a pstats.Stats."""
+    stats.sort_stats('cumulative')
+    functions = []
+    for key in stats.fcn_list[:top]:
+        filename, line, name = key
+        primitive_calls, calls, own_time, cumulative_time, _ = stats.stats[key]
+        functions.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'tottime_ms': round(own_time * 1000, 3),
+            'cumtime_ms': round(cumulative_time * 1000, 3)
+        })
+    return functions
+
+
+def profile_view(view, args, kwargs, mode):
+    """Run view(*args, **kwargs) under cProfile and return its (annotated) response."""
+    import cProfile
+    import pstats  # Only loaded once a request is profiled
+
+    profile_id = '-'.join((
+        datetime.utcnow().strftime('%Y%m%dT%H%M%S'),
+        (request.endpoint or 'unknown').lower(),
+        uuid.uuid4().hex[:8]
+    ))
+    g.profile_sql = []
+    profiler = cProfile.Profile()
+
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        response = make_response(view(*args, **kwargs))
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        sql = g.pop('profile_sql')
+
+    directory = current_app.config['PROFILER_DIR']
+    os.makedirs(directory, exist_ok=True)
+    profiler.dump_stats(os.path.join(directory, f'{profile_id}.pstats'))
+    response.headers['X-Profile-Id'] = profile_id
+
+    body = response.get_json(silent=True) if response.is_json else None
+    if mode == 'inline' and isinstance(body, dict):
+        body['profile'] = {
+            'id': profile_id,
+            'endpoint': request.endpoint,
+            'total_ms': round(elapsed * 1000, 3),
+            'top_functions': summarize(pstats.Stats(profiler), current_app.config['PROFILER_TOP']),
+            'sql_count': len(sql),
+            'sql_ms': round(sum(s['duration_ms'] for s in sql), 3),
+            'sql': sql
+        }
+        response.set_data(current_app.json.dumps(body))
+
+    return response
@@ -0,0 +1,224 @@
+"""
+Token-bucket rate limiting for public endpoints.
+
+Each limited route gets a bucket per client IP and, when the JSON body has an
+`email`, a bucket per email. A bucket holds up to `burst` tokens, refills at
+`rate` tokens per second, and every request takes one. When a bucket is empty
+the route answers 429 with a Retry-After header.
+
+Stores (RATE_LIMIT_STORE):
+- 'memory' (default): per-process dict split into lock-striped shards, O(1)
+  per request. Each worker process enforces the limits on its own.
+- 'database': the rate_limit_buckets table, shared by every worker. Each take
+  is a single conditional UPDATE (plus an INSERT for a new key) on its own
+  connection, so it is unaffected by the request's unit of work.
+
+Limits are 'N/second', 'N/minute' or 'N/hour' (RATE_LIMIT_PER_IP,
+RATE_LIMIT_PER_EMAIL); the burst equals N.
+
+The database store writes a row per key it sees; `manage.py
+sweep-rate-limit-buckets` deletes the ones that have refilled completely.
+
+Behind a reverse proxy every request arrives from the proxy's address, so
+without RATE_LIMIT_TRUST_PROXY all clients share one per-IP bucket. With it,
+the client IP is the X-Forwarded-For entry added by the outermost of the
+RATE_LIMIT_PROXY_HOPS trusted proxies; entries left of it are ignored, since
+clients can send any X-Forwarded-For they like.
+"""
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import case, delete, select, update
+
+from app import db
+from app.models import RateLimitBucket
+from app.utils.responses import error_response
+
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+
+def parse_limit(limit):
+    """'30/minute' -> (rate per second, burst)."""
+    count, period = limit.split('/')
+    count = int(count)
+    return count / PERIODS[period.strip()], count
+
+
+class MemoryBucketStore:
+    """
+    In-process buckets, sharded across `stripes` locks to keep contention low.
+
+    Each stripe is kept in least-recently-used order. Past max_keys_per_stripe,
+    buckets that have refilled completely are dropped from the front, which
+    is O(1) per request amortized: every bucket is dropped at most once.
+    """
+
+    def __init__(self, stripes=64, max_keys_per_stripe=10000):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._buckets = [OrderedDict() for _ in range(stripes)]
+        self._max_keys = max_keys_per_stripe
+
+    def take(self, key, rate, burst, now=None):
+        """Take one token. Returns seconds to wait (0.0 if allowed)."""
+        now = time.time() if now is None else now
+        stripe = zlib.crc32(key.encode()) % len(self._locks)
+        buckets = self._buckets[stripe]
+
+        with self._locks[stripe]:
+            tokens, updated_at, _ = buckets.pop(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            wait = (1 - tokens) / rate if tokens < 1 else 0.0
+            if not wait:
+                tokens -= 1
+            # Re-inserted at the end, with the time it will be full again
+            buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(buckets) > self._max_keys:
+                self._prune(buckets, now)
+            return wait
+
+    def _prune(self, buckets, now):
+        # A bucket that has refilled completely is the same as no bucket. The
+        # front is the least recently used, so stop at the first one still refilling
+        while len(buckets) > self._max_keys:
+            key, (_, _, full_at) = next(iter(buckets.items()))
+            if full_at > now:
+                break
+            del buckets[key]
+
+
+class DatabaseBucketStore:
+    """Buckets in the rate_limit_buckets table, shared across worker processes."""
+
+    def take(self, key, rate, burst, now=None):
+        """Take one token. Returns seconds to wait (0.0 if allowed)."""
+        now = time.time() if now is None else now
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * rate
+        available = case((refilled > burst, burst), else_=refilled)
+
+        with db.engine.begin() as connection:
+            taken = connection.execute(
+                update(RateLimitBucket)
+                .where(RateLimitBucket.key == key, available >= 1)
+                .values(tokens=available - 1, updated_at=now)
+            ).rowcount
+            if taken:
+                return 0.0
+
+            # Only the dialect in use is imported (the other would slow startup)
+            if connection.dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            created = connection.execute(
+                insert(RateLimitBucket)
+                .values(key=key, tokens=burst - 1, updated_at=now)
+                .on_conflict_do_nothing(index_elements=['key'])
+            ).rowcount
+            if created:
+                return 0.0
+
+            row = connection.execute(
+                select(RateLimitBucket.tokens, RateLimitBucket.updated_at).where(RateLimitBucket.key == key)
+            ).first()
+
+        if row is None:
+            return 1 / rate
+        tokens = min(burst, row.tokens + (now - row.updated_at) * rate)
+        return max(0.0, (1 - tokens) / rate)
+
+
+class RateLimiter:
+    """Applies the per-IP and per-email limits configured on the app."""
+
+    def __init__(self, store, per_ip, per_email, trust_proxy=False, proxy_hops=1):
+        self.store = store
+        self.per_ip = parse_limit(per_ip)
+        self.per_email = parse_limit(per_email)
+        self.trust_proxy = trust_proxy
+        self.proxy_hops = max(1, proxy_hops)
+
+    def client_ip(self):
+        # Each trusted proxy appends the address it saw; anything further left is client-supplied
+        if self.trust_proxy and request.access_route:
+            route = request.access_route
+            return route[-min(self.proxy_hops, len(route))]
+        return request.remote_addr or 'unknown'
+
+    def check(self, scope):
+        """Seconds the current request must wait, or 0.0 if it may proceed."""
+        wait = self.store.take(f"{scope}:ip:{self.client_ip()}", *self.per_ip)
+        if wait:
+            return wait
+
+        data = request.get_json(silent=True)
+        email = data.get('email') if isinstance(data, dict) else None
+        if isinstance(email, str) and email.strip():
+            return self.store.take(f"{scope}:email:{email.strip().lower()[:255]}", *self.per_email)
+        return 0.0
+
+
+def sweep_rate_limit_buckets(batch_size=1000):
+    """
+    Delete database buckets idle long enough to have refilled completely.
+    
+    A full bucket behaves exactly like a missing one, so nothing is lost.
+    Returns the number deleted.
+    """
+    limits = [parse_limit(current_app.config[name]) for name in ('RATE_LIMIT_PER_IP', 'RATE_LIMIT_PER_EMAIL')]
+    idle_before = time.time() - max(burst / rate for rate, burst in limits)
+    deleted = 0
+    while True:
+        keys = db.session.scalars(
+            select(RateLimitBucket.key).where(RateLimitBucket.updated_at < idle_before).limit(batch_size)
+        ).all()
+        if not keys:
+            break
+
+        db.session.execute(
+            delete(RateLimitBucket)
+            .where(RateLimitBucket.key.in_(keys), RateLimitBucket.updated_at < idle_before)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += len(keys)
+
+    return deleted
+
+
+def init_rate_limiting(app):
+    """Create the app's RateLimiter from config (no-op when RATE_LIMIT_ENABLED is false)."""
+    if not app.config['RATE_LIMIT_ENABLED']:
+        return
+
+    store = DatabaseBucketStore() if app.config['RATE_LIMIT_STORE'] == 'database' else MemoryBucketStore()
+    app.extensions['rate_limiter'] = RateLimiter(
+        store,
+        per_ip=app.config['RATE_LIMIT_PER_IP'],
+        per_email=app.config['RATE_LIMIT_PER_EMAIL'],
+        trust_proxy=app.config['RATE_LIMIT_TRUST_PROXY'],
+        proxy_hops=app.config['RATE_LIMIT_PROXY_HOPS']
+    )
+
+
+def rate_limited(f):
+    """Decorator: apply per-IP and per-email token buckets to a public route."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        limiter = current_app.extensions.get('rate_limiter')
+        if limiter:
+            wait = limiter.check(request.endpoint)
+            if wait:
+                response, status_code = error_response(
+                    "Too many requests. Please wait a moment and try again.",
+                    status_code=429
+                )
+                response.headers['Retry-After'] = str(math.ceil(wait))
+                return response, status_code
+        return f(*args, **kwargs)
+    return decorated_function
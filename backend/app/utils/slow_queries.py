@@ -0,0 +1,179 @@
+"""
+Slow-query log.
+
+init_slow_query_log(app) times every SQL statement (SQLAlchemy cursor events)
+and records the ones slower than SLOW_QUERY_THRESHOLD_MS: statement, bound
+parameters, duration and the originating endpoint. Each is logged on the
+'app.slow_queries' logger and kept in an in-process ring buffer of the last
+SLOW_QUERY_LOG_SIZE entries, served by GET /api/admin/slow-queries.
+
+Parameters carry personal data (emails, phone numbers, tokens), so only their
+count and types are logged or kept, e.g. {'count': 2, 'types': ['str', 'int']}.
+SLOW_QUERY_LOG_PARAMETERS=true keeps the (truncated) values in the ring buffer
+for debugging; the log line stays redacted either way.
+
+The query plan (EXPLAIN, or EXPLAIN QUERY PLAN on SQLite) of slow SELECTs is
+captured by a background thread on its own connection, so the request that
+ran the statement never waits for it. The worker holds the raw parameters
+only until it has run EXPLAIN. Plans are cached per statement text.
+A threshold of 0 disables the log.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+
+logger = logging.getLogger('app.slow_queries')
+
+MAX_PARAMETER_LENGTH = 200
+PLAN_CACHE_SIZE = 256
+
+
+def _format_parameters(parameters, executemany):
+    if executemany and parameters:
+        parameters = parameters[0]
+    if isinstance(parameters, dict):
+        return {key: repr(value)[:MAX_PARAMETER_LENGTH] for key, value in parameters.items()}
+    return [repr(value)[:MAX_PARAMETER_LENGTH] for value in parameters or ()]
+
+
+def _describe_parameters(parameters, executemany):
+    """Count and types of the bound parameters, without their values."""
+    if executemany and parameters:
+        parameters = parameters[0]
+    values = list(parameters.values()) if isinstance(parameters, dict) else list(parameters or ())
+    return {'count': len(values), 'types': [type(value).__name__ for value in values]}
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements plus the background EXPLAIN worker."""
+
+    def __init__(self, engine, threshold_ms, size=200, keep_parameters=False):
+        self.engine = engine
+        self.threshold = threshold_ms / 1000
+        self.keep_parameters = keep_parameters
+        self._entries = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._plans = OrderedDict()  # statement -> plan lines
+        self._plans_lock = threading.Lock()
+        self._pending = queue.Queue(maxsize=100)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def record(self, statement, parameters, executemany, elapsed):
+        described = _describe_parameters(parameters, executemany)
+        entry = {
+            'id': next(self._ids),
+            'recorded_at': datetime.utcnow().isoformat(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'statement': statement,
+            'parameters': _format_parameters(parameters, executemany) if self.keep_parameters else described,
+            'endpoint': request.endpoint if has_request_context() else None,
+            'path': f'{request.method} {request.path}' if has_request_context() else None,
+            'plan': None,
+            'plan_status': 'pending'
+        }
+        self._entries.append(entry)
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s params=%s",
+            entry['duration_ms'], entry['endpoint'] or 'no request', statement, described
+        )
+
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+        if verb not in ('SELECT', 'WITH') or executemany:
+            entry['plan_status'] = 'skipped'
+            return
+
+        with self._plans_lock:
+            plan = self._plans.get(statement)
+        if plan is not None:
+            entry['plan'], entry['plan_status'] = plan, 'cached'
+            return
+
+        try:
+            self._pending.put_nowait((entry, statement, parameters))
+        except queue.Full:
+            entry['plan_status'] = 'dropped'
+            return
+        self._ensure_worker()
+
+    def entries(self, limit=None):
+        """Newest first."""
+        entries = list(self._entries)[::-1]
+        return entries[:limit] if limit else entries
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._explain_loop, name='slow-query-explain', daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self):
+        while True:
+            entry, statement, parameters = self._pending.get()
+            try:
+                entry['plan'] = self._explain(statement, parameters)
+                entry['plan_status'] = 'captured'
+            except Exception as exc:  # The plan is best-effort; never let the worker die
+                entry['plan_status'] = f'failed: {exc.__class__.__name__}: {exc}'[:300]
+            finally:
+                self._pending.task_done()
+
+    def _explain(self, statement, parameters):
+        with self._plans_lock:
+            if statement in self._plans:
+                return self._plans[statement]
+
+        sqlite = self.engine.dialect.name == 'sqlite'
+        prefix = 'EXPLAIN QUERY PLAN ' if sqlite else 'EXPLAIN '
+        with self.engine.connect() as connection:
+            connection.info['slow_query_explain'] = True
+            try:
+                rows = connection.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+            finally:
+                connection.info.pop('slow_query_explain', None)
+        plan = [row[-1] if sqlite else row[0] for row in rows]
+
+        with self._plans_lock:
+            self._plans[statement] = plan
+            while len(self._plans) > PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+
+def init_slow_query_log(app):
+    """Register the timing listeners and the app's SlowQueryLog (no-op when the threshold is 0)."""
+    threshold_ms = app.config['SLOW_QUERY_THRESHOLD_MS']
+    if threshold_ms <= 0:
+        return
+
+    with app.app_context():
+        engine = db.engine
+    slow_queries = app.extensions['slow_queries'] = SlowQueryLog(
+        engine, threshold_ms, size=app.config['SLOW_QUERY_LOG_SIZE'],
+        keep_parameters=app.config['SLOW_QUERY_LOG_PARAMETERS']
+    )
+
+    # Timed on the execution context, which a failed statement discards
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def check_duration(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'slow_query_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= slow_queries.threshold and not conn.info.get('slow_query_explain'):
+            slow_queries.record(statement, parameters, executemany, elapsed)
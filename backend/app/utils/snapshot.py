@@ -0,0 +1,70 @@
+"""
+Consistent-read transactions.
+
+begin_snapshot() makes every following statement in the request's session see
+the database as of one point in time, until the unit of work commits:
+
+- PostgreSQL (and other servers): the transaction runs at REPEATABLE READ.
+  The isolation level can only be chosen before the transaction's first
+  statement, so call it before touching the session.
+- SQLite: the driver normally issues BEGIN only before the first write, so
+  earlier SELECTs each see whatever was committed at that moment. An explicit
+  BEGIN makes them one read transaction.
+
+SQLite has a single writer, and a transaction that starts writing holds the
+write lock until it commits. A job that reads, computes for a long time and
+then writes (a matching run) therefore calls end_snapshot() once it has read
+everything: on SQLite the read transaction ends there, so the computation
+runs with no lock held and the writes get a short transaction of their own.
+With WAL (SQLITE_PROFILE=production) the read transaction does not block
+writers either. On PostgreSQL reads never block writers and the snapshot
+carries on into the writes.
+
+At REPEATABLE READ, a write to a row that another transaction changed after
+the snapshot was taken fails with a serialization error (SQLSTATE 40001)
+instead of overwriting it; is_serialization_failure() recognises it, so the
+caller can ask for a retry.
+"""
+from sqlalchemy.exc import DBAPIError
+
+from app import db
+
+
+SNAPSHOT_ISOLATION_LEVEL = 'REPEATABLE READ'
+SERIALIZATION_FAILURE = '40001'
+
+
+def begin_snapshot():
+    """Start the session's transaction as a snapshot. False if it was too late to."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        dbapi_connection = db.session.connection().connection.dbapi_connection
+        if not dbapi_connection.in_transaction:
+            dbapi_connection.execute('BEGIN')
+        return True
+
+    if db.session.in_transaction():
+        return False
+    db.session.connection(execution_options={'isolation_level': SNAPSHOT_ISOLATION_LEVEL})
+    return True
+
+
+def end_snapshot():
+    """
+    Finish reading: on SQLite, end the read transaction before a long computation.
+
+    Rolls back the session (nothing may have been written yet), which expires
+    loaded ORM objects, so copy out what is needed first. Returns True if the
+    transaction was ended, False on servers where it carries on.
+    """
+    if db.session.get_bind().dialect.name != 'sqlite':
+        return False
+    db.session.rollback()
+    return True
+
+
+def is_serialization_failure(exc):
+    """True if exc is a snapshot write conflict (psycopg2 `pgcode`, psycopg 3 `sqlstate`)."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    return SERIALIZATION_FAILURE in (getattr(orig, 'pgcode', None), getattr(orig, 'sqlstate', None))
@@ -0,0 +1,112 @@
+"""
+SQLite production profile (SQLITE_PROFILE=production).
+
+Small deployments run on a SQLite file shared by several gunicorn workers.
+With SQLite's defaults (rollback journal, no busy timeout) a writer blocks
+every reader and concurrent writers fail at once with "database is locked".
+The profile configures each new connection with:
+
+- journal_mode=WAL: readers never block the writer, or the writer them
+- synchronous=NORMAL: commits append to the WAL without an fsync (which
+  happens at checkpoints); a power loss can drop the last commits but never
+  corrupts the database
+- busy_timeout: a writer waits up to SQLITE_BUSY_TIMEOUT_MS for the lock
+  instead of failing
+- cache_size / temp_store: SQLITE_CACHE_SIZE_KB of page cache, temp tables
+  in memory
+- BEGIN IMMEDIATE for write transactions, so a transaction takes the write
+  lock (waiting via busy_timeout) when it starts writing, rather than
+  failing on a lock upgrade
+
+and, with SQLITE_SINGLE_WRITER, funnels writes from all threads of a process
+through one lock: a thread takes it before its transaction's first write
+and hands it over at commit/rollback, so threads queue in process instead
+of polling SQLite's busy handler. Across processes busy_timeout arbitrates.
+"""
+import threading
+
+from sqlalchemy import event
+
+from app import db
+
+
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class SingleWriter:
+    """
+    One in-process write transaction at a time, tracked per connection.
+
+    A plain Lock owned by the thread that took it: that thread's other
+    connections join its hold (a request may write on a second connection),
+    and the lock is freed when the last of them commits, rolls back or goes
+    back to the pool, whichever thread that happens on (e.g. connection GC).
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._state = threading.Lock()  # Guards _owner/_holders
+        self._owner = None  # Ident of the thread holding _lock
+        self._holders = 0  # Its connections inside a write transaction
+
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get('holds_writer') or not statement.lstrip()[:7].upper().startswith(WRITE_VERBS):
+            return
+        thread = threading.get_ident()
+        with self._state:
+            if self._owner == thread:
+                self._holders += 1
+                conn.info['holds_writer'] = True
+                return
+        # On timeout carry on and let busy_timeout decide, rather than failing here
+        if self._lock.acquire(timeout=self.timeout):
+            with self._state:
+                self._owner = thread
+                self._holders = 1
+            conn.info['holds_writer'] = True
+
+    def release(self, info):
+        if not info.pop('holds_writer', False):
+            return
+        with self._state:
+            self._holders -= 1
+            if self._holders == 0:
+                self._owner = None
+                self._lock.release()
+
+
+def init_sqlite_profile(app):
+    """Apply the production pragmas and writer queue (no-op unless SQLite with SQLITE_PROFILE=production)."""
+    if app.config['SQLITE_PROFILE'] != 'production':
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+
+    busy_timeout_ms = app.config['SQLITE_BUSY_TIMEOUT_MS']
+    cache_size_kb = app.config['SQLITE_CACHE_SIZE_KB']
+
+    @event.listens_for(engine, 'connect')
+    def configure_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = 'IMMEDIATE'  # Driver's implicit BEGIN before writes
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout_ms)}')
+        cursor.execute(f'PRAGMA cache_size=-{int(cache_size_kb)}')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+    if not app.config['SQLITE_SINGLE_WRITER']:
+        return
+
+    writer = app.extensions['sqlite_writer'] = SingleWriter(timeout=busy_timeout_ms / 1000)
+    event.listen(engine, 'before_cursor_execute', writer.before_execute)
+    event.listen(engine, 'commit', lambda conn: writer.release(conn.info))
+    event.listen(engine, 'rollback', lambda conn: writer.release(conn.info))
+    # Connections returned to the pool without an explicit commit/rollback
+    event.listen(engine.pool, 'reset', lambda dbapi_connection, record, reset_state: writer.release(record.info))
+    event.listen(engine.pool, 'checkin', lambda dbapi_connection, record: writer.release(record.info))
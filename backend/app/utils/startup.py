@@ -0,0 +1,44 @@
+"""
+Startup phase timing.
+
+create_app() marks the end of each phase (config, extensions, blueprints,
+migrations) on a StartupTimer. The timings are logged once the app is built,
+kept in app.extensions['startup'] and served with the request metrics as
+shabbatlink_startup_phase_seconds, so a slow cold start can be traced to a
+phase. benchmarks/startup_time.py measures whole processes and fails when
+boot exceeds its budget.
+"""
+import time
+from typing import Dict
+
+
+class StartupTimer:
+    """Wall-clock time between successive marks, in the order they were made."""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self._seconds: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """End `phase` now; the next phase starts here."""
+        now = time.perf_counter()
+        self._seconds[phase] = self._seconds.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def as_ms(self) -> Dict[str, float]:
+        return {phase: round(seconds * 1000, 3) for phase, seconds in self._seconds.items()}
+
+    def total_ms(self) -> float:
+        return round(sum(self._seconds.values()) * 1000, 3)
+
+
+def finish_startup(app, timer: StartupTimer) -> None:
+    """Record the phases on the app (and its metrics) and log them."""
+    app.extensions['startup'] = timer.as_ms()
+    if 'metrics' in app.extensions:
+        app.extensions['metrics'].startup_ms = app.extensions['startup']
+    app.logger.info(
+        "Started in %.1f ms (%s)",
+        timer.total_ms(),
+        ', '.join(f'{phase} {ms:.1f}' for phase, ms in app.extensions['startup'].items())
+    )
@@ -3,17 +3,120 @@
 THREE TOKEN TYPES:
 1. Admin Session Token - for admin panel access
 2. Magic Link Token - for profile editing (stored in DB)
-3. Signed Action Token - for one-click actions (stateless, HMAC-signed)
+3. Signed Action Token - for one-click actions (stateless, HMAC-signed);
+   multi-target variant for host digest emails
 """
 import hmac
 import hashlib
 import base64
+import binascii
 import json
 import secrets
+import struct
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from flask import current_app
 
 
+# Compact action token (v2) layout, base64url-encoded without padding:
+#   version (1 byte) | action code (1) | expiry epoch seconds (uint32) |
+#   target count (1, 0 = single-target token) | 16 bytes per target UUID |
+#   first 16 bytes of HMAC-SHA256
+# Legacy (v1) tokens are "<base64 JSON payload>.<hex HMAC>" and still verify.
+TOKEN_VERSION = 2
+ACTION_CODES = {
+    'match_accept': 1,
+    'match_decline': 2,
+    'confirm_attendance': 3,
+    'noshow_report': 4,
+    'match_digest': 5
+}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+MAC_BYTES = 16
+_HEADER = struct.Struct('>BBIB')
+MAX_TARGETS = 255
+
+
+# Verified decodes kept per (token, secret key); oldest evicted first
+VERIFY_CACHE_SIZE = 4096
+_verified = OrderedDict()
+
+_B64URL_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+_B64URL_VALUES = {char: value for value, char in enumerate(_B64URL_ALPHABET)}
+# To the standard alphabet; '+', '/' and '=' map to '!', which strict decoding rejects
+_B64URL_TO_STANDARD = bytes.maketrans(b'-_+/=', b'+/!!!')
+# By unpadded length % 4: the padding to append, and the bits of the last
+# character that fall past the data (zero in the canonical encoding)
+_PADDING = {0: b'', 2: b'==', 3: b'='}
+_PAD_BITS = {0: 0, 2: 0x0F, 3: 0x03}
+_keyed_hmacs = {}
+
+
+def _mac(secret_key, data):
+    """HMAC-SHA256 of data; the keyed state is built once per key and copied per call."""
+    keyed = _keyed_hmacs.get(secret_key)
+    if keyed is None:
+        keyed = _keyed_hmacs[secret_key] = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+    mac = keyed.copy()
+    mac.update(data)
+    return mac
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    """Strict unpadded base64url: anything but the canonical encoding raises ValueError."""
+    remainder = len(text) % 4
+    if remainder == 1:
+        raise ValueError("Invalid base64url length")
+    # binascii.Error (a ValueError) on any character outside the alphabet
+    raw = binascii.a2b_base64(text.encode().translate(_B64URL_TO_STANDARD) + _PADDING[remainder], strict_mode=True)
+    if remainder and _B64URL_VALUES[text[-1]] & _PAD_BITS[remainder]:
+        raise ValueError("Non-canonical base64url")
+    return raw
+
+
+def _uuid_bytes(target_id):
+    """16-byte form of a canonical UUID string, or None if it is not one."""
+    try:
+        parsed = uuid.UUID(target_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return parsed.bytes if str(parsed) == target_id else None
+
+
+def _format_uuid(hex_id):
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
+
+
+def _pack_token(action_type, target_ids, expires_hours, multi=False):
+    """Encode a v2 token, or return None if the action/targets cannot be packed."""
+    code = ACTION_CODES.get(action_type)
+    if code is None or not target_ids or len(target_ids) > MAX_TARGETS:
+        return None
+    
+    packed_ids = [_uuid_bytes(target_id) for target_id in target_ids]
+    if None in packed_ids:
+        return None
+    
+    expires_at = int(time.time() + expires_hours * 3600)
+    count = len(packed_ids) if multi else 0
+    body = _HEADER.pack(TOKEN_VERSION, code, expires_at, count) + b''.join(packed_ids)
+    mac = _mac(current_app.config['SECRET_KEY'], body).digest()[:MAC_BYTES]
+    return _b64encode(body + mac)
+
+
+def _generate_legacy_token(payload):
+    payload_json = json.dumps(payload, sort_keys=True)
+    payload_b64 = base64.urlsafe_b64encode(payload_json.encode()).decode()
+    signature = _mac(current_app.config['SECRET_KEY'], payload_b64.encode()).hexdigest()
+    return f"{payload_b64}.{signature}"
+
+
 def generate_action_token(action_type, target_id, expires_hours=72):
     """
     Generate a signed action token for one-click actions.
@@ -27,75 +130,150 @@ def generate_action_token(action_type, target_id, expires_hours=72):
         expires_hours: Hours until expiration (default 72 hours)
     
     Returns:
-        Base64-encoded signed token string
+        Compact base64url token (legacy JSON format if the action or id
+        cannot be packed)
     """
-    expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
+    token = _pack_token(action_type, [target_id], expires_hours)
+    if token:
+        return token
     
-    payload = {
+    expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
+    return _generate_legacy_token({
         'action': action_type,
         'target_id': target_id,
         'exp': expires_at.isoformat()
-    }
+    })
+
+
+def generate_multi_target_token(action_type, target_ids, expires_hours=72):
+    """
+    Generate a signed action token covering several targets.
     
-    payload_json = json.dumps(payload, sort_keys=True)
-    payload_b64 = base64.urlsafe_b64encode(payload_json.encode()).decode()
+    Used for: host digest emails, where one token covers every listed match
+    and the recipient picks the match and decision when clicking.
     
-    # Create signature using HMAC-SHA256
-    secret_key = current_app.config['SECRET_KEY']
-    signature = hmac.new(
-        secret_key.encode(),
-        payload_b64.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    Args:
+        action_type: Type of action (e.g., 'match_digest')
+        target_ids: List of target entity IDs the token may act on
+        expires_hours: Hours until expiration (default 72 hours)
     
-    # Combine payload and signature
-    token = f"{payload_b64}.{signature}"
-    return token
+    Returns:
+        Compact base64url token (legacy JSON format if it cannot be packed)
+    """
+    token = _pack_token(action_type, list(target_ids), expires_hours, multi=True)
+    if token:
+        return token
+    
+    expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
+    return _generate_legacy_token({
+        'action': action_type,
+        'target_ids': list(target_ids),
+        'exp': expires_at.isoformat()
+    })
+
+
+def _decode_compact(token, secret_key):
+    raw = _b64decode(token)
+    if len(raw) < _HEADER.size + MAC_BYTES:
+        return None
+    
+    body, provided_mac = raw[:-MAC_BYTES], raw[-MAC_BYTES:]
+    expected_mac = _mac(secret_key, body).digest()[:MAC_BYTES]
+    if not hmac.compare_digest(provided_mac, expected_mac):
+        return None
+    
+    version, code, expires_at, count = _HEADER.unpack_from(body)
+    multi = count > 0
+    action = ACTION_NAMES.get(code)
+    if version != TOKEN_VERSION or action is None or len(body) != _HEADER.size + 16 * max(count, 1):
+        return None
+    
+    if multi:
+        target_ids = tuple(
+            _format_uuid(body[offset:offset + 16].hex())
+            for offset in range(_HEADER.size, len(body), 16)
+        )
+    else:
+        target_ids = (_format_uuid(body[_HEADER.size:].hex()),)
+    return action, target_ids, multi, float(expires_at)
+
+
+def _decode_legacy(token, secret_key):
+    parts = token.split('.')
+    if len(parts) != 2:
+        return None
+    
+    payload_b64, provided_signature = parts
+    expected_signature = _mac(secret_key, payload_b64.encode()).hexdigest()
+    if not hmac.compare_digest(provided_signature, expected_signature):
+        return None
+    
+    payload = json.loads(base64.urlsafe_b64decode(payload_b64.encode()).decode())
+    # Legacy expiries are naive UTC ISO timestamps
+    expires_at = (datetime.fromisoformat(payload['exp']) - datetime(1970, 1, 1)).total_seconds()
+    
+    if 'target_ids' in payload:
+        return payload['action'], tuple(payload['target_ids']), True, expires_at
+    return payload['action'], (payload['target_id'],), False, expires_at
+
+
+def _decode_action_token(token, secret_key):
+    """
+    Signature-checked (action, target_ids, multi, expires_at) or None.
+    
+    Only successful decodes are cached, so a stream of garbage tokens cannot
+    push valid ones out of the cache.
+    """
+    key = (token, secret_key)
+    decoded = _verified.get(key)
+    if decoded is not None:
+        return decoded
+    
+    try:
+        decoded = _decode_legacy(token, secret_key) if '.' in token else _decode_compact(token, secret_key)
+    except Exception:
+        return None
+    
+    if decoded is not None:
+        # Each OrderedDict call is atomic under the GIL; racing threads can only
+        # overshoot the bound by a few entries
+        if len(_verified) >= VERIFY_CACHE_SIZE:
+            _verified.popitem(last=False)
+        _verified[key] = decoded
+    return decoded
 
 
 def verify_action_token(token):
     """
-    Verify a signed action token.
+    Verify a signed action token (compact or legacy format).
+    
+    Recently verified tokens are served from a bounded cache keyed by token
+    and secret key; expiry is re-checked on every call.
     
     Args:
         token: The token string to verify
     
     Returns:
-        dict with 'action' and 'target_id' if valid, None if invalid
+        dict with 'action', 'target_id' and 'target_ids' if valid, None if invalid.
+        Multi-target tokens have target_id None; single-target tokens have
+        target_ids == [target_id].
     """
-    try:
-        parts = token.split('.')
-        if len(parts) != 2:
-            return None
-        
-        payload_b64, provided_signature = parts
-        
-        # Verify signature
-        secret_key = current_app.config['SECRET_KEY']
-        expected_signature = hmac.new(
-            secret_key.encode(),
-            payload_b64.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        if not hmac.compare_digest(provided_signature, expected_signature):
-            return None
-        
-        # Decode payload
-        payload_json = base64.urlsafe_b64decode(payload_b64.encode()).decode()
-        payload = json.loads(payload_json)
-        
-        # Check expiration
-        expires_at = datetime.fromisoformat(payload['exp'])
-        if datetime.utcnow() > expires_at:
-            return None
-        
-        return {
-            'action': payload['action'],
-            'target_id': payload['target_id']
-        }
-    except Exception:
+    if not isinstance(token, str) or not token:
         return None
+    
+    decoded = _decode_action_token(token, current_app.config['SECRET_KEY'])
+    if decoded is None:
+        return None
+    
+    action, target_ids, multi, expires_at = decoded
+    if time.time() > expires_at:
+        return None
+    
+    return {
+        'action': action,
+        'target_id': None if multi else target_ids[0],
+        'target_ids': list(target_ids)
+    }
 
 
 def generate_session_token(user_type, user_id, expires_hours=24):
@@ -124,12 +302,7 @@ def generate_session_token(user_type, user_id, expires_hours=24):
     payload_json = json.dumps(payload, sort_keys=True)
     payload_b64 = base64.urlsafe_b64encode(payload_json.encode()).decode()
     
-    secret_key = current_app.config['SECRET_KEY']
-    signature = hmac.new(
-        secret_key.encode(),
-        payload_b64.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    signature = _mac(current_app.config['SECRET_KEY'], payload_b64.encode()).hexdigest()
     
     token = f"{payload_b64}.{signature}"
     return token
@@ -153,12 +326,7 @@ def verify_session_token(token, expected_type=None):
         
         payload_b64, provided_signature = parts
         
-        secret_key = current_app.config['SECRET_KEY']
-        expected_signature = hmac.new(
-            secret_key.encode(),
-            payload_b64.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        expected_signature = _mac(current_app.config['SECRET_KEY'], payload_b64.encode()).hexdigest()
         
         if not hmac.compare_digest(provided_signature, expected_signature):
             return None
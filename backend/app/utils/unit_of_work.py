@@ -0,0 +1,48 @@
+"""
+Request-scoped unit of work.
+
+Routes, ActivityLog.log and EmailService only stage changes on the session;
+the request's state change, its audit entries and its outbox emails are then
+committed together, once, when the response is ready. Error responses (4xx/5xx)
+roll back everything the request staged.
+
+Routes that need database-generated values before responding (ids,
+onupdate timestamps) call db.session.flush(), never commit().
+
+State kept outside the session (e.g. a job lease taken on its own connection)
+registers an on_rollback() callback to undo it if the request does not commit,
+including when the commit itself fails.
+"""
+from flask import g
+
+from app import db
+
+
+def on_rollback(callback):
+    """Call `callback` when the current request ends without its unit of work committing."""
+    g.setdefault('rollback_callbacks', []).append(callback)
+
+
+def init_unit_of_work(app):
+    """Commit (or roll back) the request's session once, after the view returns."""
+
+    @app.after_request
+    def finish_unit_of_work(response):
+        if response.status_code < 400:
+            # A failed commit raises here and turns the response into a 500
+            db.session.commit()
+            g.unit_of_work_committed = True
+        else:
+            db.session.rollback()
+        return response
+
+    @app.teardown_request
+    def run_rollback_callbacks(exc):
+        committed = g.pop('unit_of_work_committed', False)
+        for callback in g.pop('rollback_callbacks', []):
+            if committed:
+                continue
+            try:
+                callback()
+            except Exception:
+                app.logger.exception("Rollback callback %r failed", callback)
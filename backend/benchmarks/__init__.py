@@ -0,0 +1,6 @@
+"""
+Performance tooling: synthetic data generation and benchmark harnesses.
+
+Run modules from the backend directory, e.g.:
+    python -m benchmarks.synthetic_data --database-url sqlite:///loadtest.db
+"""
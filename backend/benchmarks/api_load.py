@@ -0,0 +1,268 @@
+"""
+API latency and throughput benchmark harness.
+
+Builds the app with create_app against a seeded database and replays mixed
+workloads through the Flask test client from several threads. Reports
+per-endpoint latency percentiles, SQL statement counts and throughput as JSON.
+
+Run from backend directory:
+    python -m benchmarks.api_load --workload match_day --threads 8 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from sqlalchemy import event
+
+from benchmarks.synthetic_data import SyntheticConfig, populate
+from tests.conftest import guest_payload, host_payload
+
+
+class SQLCounter:
+    """Counts SQL statements per thread via before_cursor_execute."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self) -> int:
+        return getattr(self._local, 'count', 0)
+
+
+class Recorder:
+    """Thread-safe collection of (endpoint, latency, statements, status) samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[tuple]] = defaultdict(list)
+
+    def add(self, endpoint: str, latency: float, statements: int, status: int):
+        with self._lock:
+            self.samples[endpoint].append((latency, statements, status))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder: Recorder, wall_seconds: float) -> dict:
+    endpoints = {}
+    total = 0
+    for endpoint, samples in sorted(recorder.samples.items()):
+        latencies = sorted(s[0] * 1000 for s in samples)
+        statements = [s[1] for s in samples]
+        errors = sum(1 for s in samples if s[2] >= 500)
+        total += len(samples)
+        endpoints[endpoint] = {
+            'requests': len(samples),
+            'errors': errors,
+            'status_counts': {str(code): sum(1 for s in samples if s[2] == code) for code in sorted({s[2] for s in samples})},
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 3),
+                'p90': round(percentile(latencies, 90), 3),
+                'p99': round(percentile(latencies, 99), 3),
+                'max': round(latencies[-1], 3),
+                'mean': round(sum(latencies) / len(latencies), 3)
+            },
+            'sql_statements': {
+                'mean': round(sum(statements) / len(statements), 2),
+                'max': max(statements)
+            },
+            'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else None
+        }
+    return {
+        'wall_seconds': round(wall_seconds, 3),
+        'total_requests': total,
+        'throughput_rps': round(total / wall_seconds, 2) if wall_seconds else None,
+        'endpoints': endpoints
+    }
+
+
+class Harness:
+    """Owns the app, SQL counter and recorder; workloads issue calls through it."""
+
+    def __init__(self, app):
+        from app import db
+
+        self.app = app
+        with app.app_context():
+            self.sql = SQLCounter(db.engine)
+        self.recorder = Recorder()
+        self._clients = threading.local()
+
+    @property
+    def client(self):
+        client = getattr(self._clients, 'client', None)
+        if client is None:
+            client = self._clients.client = self.app.test_client()
+        return client
+
+    def call(self, endpoint: str, method: str, path: str, **kwargs):
+        self.sql.reset()
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.recorder.add(endpoint, elapsed, self.sql.count, response.status_code)
+        return response
+
+
+def registration_burst(harness: Harness, worker: int, operations: int, fixtures: dict):
+    """Sign-up opening: mostly guest registrations, some hosts and login-link requests."""
+    rng = random.Random(worker)
+    emails = fixtures['guest_emails']
+    for i in range(operations):
+        n = worker * operations + i
+        roll = rng.random()
+        if roll < 0.7:
+            harness.call('POST /api/guests', 'POST', '/api/guests', json=guest_payload(rng, n))
+        elif roll < 0.85:
+            harness.call('POST /api/hosts', 'POST', '/api/hosts', json=host_payload(rng, n))
+        else:
+            harness.call('POST /api/auth/request-link', 'POST', '/api/auth/request-link',
+                         json={'email': rng.choice(emails)})
+
+
+def match_day(harness: Harness, worker: int, operations: int, fixtures: dict):
+    """Friday: admins poll the listings while hosts click accept links and users log in."""
+    rng = random.Random(worker)
+    headers = {'Authorization': f"Bearer {fixtures['admin_token']}"}
+    accept_tokens = fixtures['accept_tokens'][worker::fixtures['threads']]
+    magic_tokens = fixtures['magic_tokens'][worker::fixtures['threads']]
+    for i in range(operations):
+        roll = rng.random()
+        if roll < 0.1:
+            harness.call('GET /api/admin/dashboard', 'GET', '/api/admin/dashboard', headers=headers)
+        elif roll < 0.2:
+            harness.call('GET /api/admin/matches', 'GET', '/api/admin/matches?status=accepted', headers=headers)
+        elif roll < 0.25:
+            harness.call('GET /api/admin/guests', 'GET', '/api/admin/guests?status=unmatched', headers=headers)
+        elif roll < 0.3:
+            harness.call('GET /api/admin/hosts', 'GET', '/api/admin/hosts', headers=headers)
+        elif roll < 0.8 and accept_tokens:
+            harness.call('POST /api/matches/respond', 'POST', '/api/matches/respond',
+                         json={'token': accept_tokens.pop()})
+        elif magic_tokens:
+            harness.call('POST /api/auth/verify', 'POST', '/api/auth/verify',
+                         json={'token': magic_tokens.pop()})
+
+
+WORKLOADS: Dict[str, Callable] = {
+    'registration_burst': registration_burst,
+    'match_day': match_day
+}
+
+
+def build_fixtures(app, threads: int, operations: int) -> dict:
+    """Mint the tokens the workloads replay (admin session, accept links, magic links)."""
+    from app import db
+    from app.models import Guest, Match, MagicLink
+    from app.config import MatchStatus
+    from app.utils.tokens import generate_action_token, generate_session_token
+
+    budget = threads * operations
+    with app.test_request_context():
+        guests = Guest.query.with_entities(Guest.email, Guest.id).limit(budget).all()
+        requested = Match.query.with_entities(Match.id).filter(
+            Match.status == MatchStatus.REQUESTED.value
+        ).limit(budget).all()
+
+        magic_tokens = []
+        for email, guest_id in guests:
+            link = MagicLink.create_for_user(email, 'guest', guest_id)
+            db.session.add(link)
+            magic_tokens.append(link.token)
+        db.session.commit()
+
+        return {
+            'threads': threads,
+            'admin_token': generate_session_token('admin', 'admin'),
+            'guest_emails': [email for email, _ in guests] or ['nobody@example.com'],
+            'accept_tokens': [generate_action_token('match_accept', m.id) for m in requested],
+            'magic_tokens': magic_tokens
+        }
+
+
+def run(app, workload: str, threads: int, operations: int) -> dict:
+    harness = Harness(app)
+    fixtures = build_fixtures(app, threads, operations)
+    workload_fn = WORKLOADS[workload]
+
+    # Emails are "sent" to stdout; keep the benchmark output machine-readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [
+                pool.submit(workload_fn, harness, worker, operations, fixtures)
+                for worker in range(threads)
+            ]
+            for future in futures:
+                future.result()
+        wall = time.perf_counter() - started
+
+    report = summarize(harness.recorder, wall)
+    report['workload'] = workload
+    report['threads'] = threads
+    report['operations_per_thread'] = operations
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API latency and throughput.")
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='match_day')
+    parser.add_argument('--database-url', help="Existing database to use (default: fresh temporary SQLite)")
+    parser.add_argument('--guests', type=int, default=5000, help="Guests to seed into a fresh database")
+    parser.add_argument('--hosts', type=int, default=1000, help="Hosts to seed into a fresh database")
+    parser.add_argument('--seed', type=int, default=SyntheticConfig.seed)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--operations', type=int, default=200, help="Requests per thread")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    tmpdir = None
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.mkdtemp(prefix='shabbatlink-bench-')
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    # Every simulated client shares one address, so per-IP limits would turn
+    # the workload into a stream of 429s
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'RATE_LIMIT_ENABLED': False})
+    if not args.database_url:
+        with app.app_context():
+            populate(SyntheticConfig(guests=args.guests, hosts=args.hosts, seed=args.seed))
+
+    report = run(app, args.workload, args.threads, args.operations)
+    report['database'] = app.config['SQLALCHEMY_DATABASE_URI'].split('://')[0]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Primary key id benchmark: UUID4 vs UUIDv7, text vs native storage.
+
+For each variant, inserts activity log entries (the fastest-growing table)
+in request-sized batches into a fresh database, then looks rows up by
+primary key. Reports insert rate (overall, and over the last tenth, when
+the index is largest), lookup rate and the on-disk size of the table and
+each of its indexes as JSON.
+
+Run from backend directory:
+    python -m benchmarks.id_bench --rows 100000
+    python -m benchmarks.id_bench --database-url postgresql://localhost/id_bench  # dropped and recreated
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from app import create_app, db
+from app.models import ActivityLog
+from app.utils.ids import new_id
+
+
+VARIANTS = (
+    ('uuid4', 'string'),
+    ('uuid7', 'string'),
+    ('uuid7', 'native')
+)
+
+
+def _sizes(table):
+    """Bytes used by the table and by each of its indexes."""
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.execute(text(
+            "SELECT name, SUM(pgsize) FROM dbstat "
+            "WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = :table) GROUP BY name"
+        ), {'table': table}).all()
+    elif db.engine.dialect.name == 'postgresql':
+        rows = db.session.execute(text(
+            "SELECT :table, pg_relation_size(:table) UNION ALL "
+            "SELECT indexrelid::regclass::text, pg_relation_size(indexrelid) "
+            "FROM pg_index WHERE indrelid = CAST(:table AS regclass)"
+        ), {'table': table}).all()
+    else:
+        return {}
+    return {name: size for name, size in rows}
+
+
+def run_variant(config, rows, batch_size, lookups, seed):
+    app = create_app(config)
+    rng = random.Random(seed)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        batch_seconds = []
+        for start in range(0, rows, batch_size):
+            started = time.perf_counter()
+            for _ in range(min(batch_size, rows - start)):
+                ActivityLog.log('benchmark', target_type='guest', target_id=new_id(), details={'n': start})
+            db.session.commit()
+            batch_seconds.append(time.perf_counter() - started)
+
+        ids = db.session.scalars(db.select(ActivityLog.id)).all()
+        sample = [rng.choice(ids) for _ in range(lookups)]
+        db.session.expunge_all()
+        started = time.perf_counter()
+        for row_id in sample:
+            db.session.get(ActivityLog, row_id)
+            db.session.expunge_all()
+        lookup_seconds = time.perf_counter() - started
+
+        tail = batch_seconds[-max(1, len(batch_seconds) // 10):]
+        result = {
+            'insert_rows_per_second': round(rows / sum(batch_seconds)),
+            'insert_rows_per_second_last_10pct': round(min(rows, len(tail) * batch_size) / sum(tail)),
+            'lookups_per_second': round(lookups / lookup_seconds),
+            'bytes': _sizes(ActivityLog.__tablename__)
+        }
+        db.session.remove()
+        db.engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare primary key id formats and storage.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=500, help="Rows per commit")
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--database-url', help="Empty database to use (default: a temporary SQLite file per variant)")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='shabbatlink-ids-')
+    report = {'rows': args.rows, 'batch_size': args.batch_size, 'lookups': args.lookups, 'variants': {}}
+    for id_format, id_storage in VARIANTS:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir, f'{id_format}-{id_storage}.db')}"
+        config = {
+            'SQLALCHEMY_DATABASE_URI': database_url,
+            'ID_FORMAT': id_format,
+            'ID_STORAGE': id_storage,
+            'SLOW_QUERY_THRESHOLD_MS': 0
+        }
+        report['variants'][f'{id_format}/{id_storage}'] = run_variant(
+            config, args.rows, args.batch_size, args.lookups, args.seed
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+"""
+SQL query-budget check for every API endpoint.
+
+Seeds a fresh SQLite database at N and at 10N rows, calls each endpoint in
+app/routes once per database, and counts the SQL statements it issues
+(including the unit-of-work commit; the pages SQLAlchemy splits one
+executemany() INSERT into count once, while separate INSERTs into the same
+table each count). An endpoint fails when:
+- it returns an unexpected status (the budget would not be measuring the real path)
+- it issues more statements than its declared budget
+- it issues more statements at 10N than at N (an N+1 pattern)
+
+Failures print the offending statements. Exits non-zero on any failure, so it
+can run in CI.
+
+Run from backend directory:
+    python -m benchmarks.query_budget            # N = 200 guests
+    python -m benchmarks.query_budget --guests 500 --verbose
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from benchmarks.synthetic_data import SyntheticConfig, populate
+from tests.conftest import guest_payload, host_payload
+
+
+@dataclass
+class EndpointCase:
+    """One request to replay, its expected status and its statement budget."""
+    name: str
+    method: str
+    path: Callable[[dict], str]
+    budget: int
+    status: int = 200
+    json: Optional[Callable[[dict], dict]] = None
+    headers: Callable[[dict], dict] = lambda f: f['admin_headers']
+
+
+# Read-only cases first, then writes ordered so earlier ones do not consume
+# the fixtures of later ones (e.g. generate clears proposed matches)
+CASES: List[EndpointCase] = [
+    EndpointCase('admin.get_dashboard', 'GET', lambda f: '/api/admin/dashboard', budget=9),
+    EndpointCase('admin.list_guests', 'GET', lambda f: '/api/admin/guests', budget=2),
+    EndpointCase('admin.get_guest_detail', 'GET', lambda f: f"/api/admin/guests/{f['guest_id']}", budget=2),
+    EndpointCase('admin.list_hosts', 'GET', lambda f: '/api/admin/hosts', budget=3),
+    EndpointCase('admin.get_host_detail', 'GET', lambda f: f"/api/admin/hosts/{f['host_id']}", budget=3),
+    EndpointCase('admin.list_matches', 'GET', lambda f: '/api/admin/matches', budget=1),
+    EndpointCase('admin.list_emails', 'GET', lambda f: '/api/admin/emails', budget=1),
+    EndpointCase('admin.list_activity', 'GET', lambda f: '/api/admin/activity', budget=1),
+    EndpointCase('admin.list_activity_rollups', 'GET', lambda f: '/api/admin/activity/rollups', budget=1),
+    EndpointCase('admin.metrics', 'GET', lambda f: '/api/admin/metrics', budget=0),
+    EndpointCase('guests.get_guest', 'GET', lambda f: f"/api/guests/{f['guest_id']}", budget=1,
+                 headers=lambda f: f['guest_headers']),
+    EndpointCase('hosts.get_host', 'GET', lambda f: f"/api/hosts/{f['host_id']}", budget=1,
+                 headers=lambda f: f['host_headers']),
+    EndpointCase('matches.get_match_details_for_response', 'GET',
+                 lambda f: f"/api/matches/details/{f['requested_ids'][0]}?token={f['accept_token']}", budget=3,
+                 headers=lambda f: {}),
+    EndpointCase('matches.get_digest_matches', 'GET', lambda f: f"/api/matches/digest?token={f['digest_token']}",
+                 budget=1, headers=lambda f: {}),
+    EndpointCase('attendance.get_noshow_report_form', 'GET',
+                 lambda f: f"/api/attendance/noshow/report?token={f['noshow_token']}", budget=2,
+                 headers=lambda f: {}),
+    EndpointCase('intake.get_intake_status', 'GET', lambda f: f"/api/intake/{f['intake_id']}", budget=1,
+                 headers=lambda f: {}),
+
+    EndpointCase('admin.admin_login', 'POST', lambda f: '/api/admin/auth', budget=0,
+                 json=lambda f: {'password': f['admin_password']}, headers=lambda f: {}),
+    EndpointCase('guests.create_guest', 'POST', lambda f: '/api/guests', budget=4, status=201,
+                 json=lambda f: f['new_guest'], headers=lambda f: {}),
+    EndpointCase('hosts.create_host', 'POST', lambda f: '/api/hosts', budget=4, status=201,
+                 json=lambda f: f['new_host'], headers=lambda f: {}),
+    EndpointCase('guests.update_guest', 'PUT', lambda f: f"/api/guests/{f['guest_id']}", budget=4,
+                 json=lambda f: {'party_size': 2}, headers=lambda f: f['guest_headers']),
+    EndpointCase('hosts.update_host', 'PUT', lambda f: f"/api/hosts/{f['host_id']}", budget=4,
+                 json=lambda f: {'tagline': 'Updated'}, headers=lambda f: f['host_headers']),
+    EndpointCase('auth.request_magic_link', 'POST', lambda f: '/api/auth/request-link', budget=5,
+                 json=lambda f: {'email': f['guest_email']}, headers=lambda f: {}),
+    EndpointCase('auth.verify_magic_link', 'POST', lambda f: '/api/auth/verify', budget=4,
+                 json=lambda f: {'token': f['magic_token']}, headers=lambda f: {}),
+    EndpointCase('admin.flag_guest', 'POST', lambda f: f"/api/admin/guests/{f['guest_id']}/flag", budget=5,
+                 json=lambda f: {'reason': 'query budget'}),
+    EndpointCase('admin.edit_match', 'PUT', lambda f: f"/api/admin/matches/{f['proposed_ids'][0]}", budget=8,
+                 json=lambda f: {'host_id': f['spare_host_id']}),
+    EndpointCase('admin.delete_match', 'DELETE', lambda f: f"/api/admin/matches/{f['proposed_ids'][1]}", budget=4),
+    EndpointCase('admin.send_match_request', 'POST', lambda f: f"/api/admin/matches/{f['proposed_ids'][2]}/send",
+                 budget=7),
+    EndpointCase('matches.respond_to_match', 'POST', lambda f: '/api/matches/respond', budget=5,
+                 json=lambda f: {'token': f['accept_token']}, headers=lambda f: {}),
+    EndpointCase('admin.finalize_match', 'POST', lambda f: f"/api/admin/matches/{f['accepted_id']}/finalize",
+                 budget=8),
+    EndpointCase('admin.send_day_of_reminder', 'POST',
+                 lambda f: f"/api/admin/matches/{f['confirmed_id']}/send-reminder", budget=5),
+    EndpointCase('attendance.confirm_attendance', 'POST', lambda f: '/api/attendance/confirm', budget=5,
+                 json=lambda f: {'token': f['confirm_token']}, headers=lambda f: {}),
+    EndpointCase('admin.send_host_summary', 'POST', lambda f: f"/api/admin/hosts/{f['summary_host_id']}/send-summary",
+                 budget=4),
+    EndpointCase('admin.send_noshow_report_request', 'POST',
+                 lambda f: f"/api/admin/hosts/{f['summary_host_id']}/send-noshow-request", budget=4),
+    EndpointCase('attendance.submit_noshow_report', 'POST', lambda f: '/api/attendance/noshow/report', budget=6,
+                 json=lambda f: {'token': f['noshow_token'], 'no_show_match_ids': f['noshow_match_ids']},
+                 headers=lambda f: {}),
+    EndpointCase('admin.send_match_requests', 'POST', lambda f: '/api/admin/matches/send-requests', budget=5),
+    EndpointCase('admin.generate_matches', 'POST', lambda f: '/api/admin/matches/generate', budget=10),
+    EndpointCase('admin.bulk_send_day_of_reminders', 'POST', lambda f: '/api/admin/bulk/send-reminders', budget=4),
+    EndpointCase('admin.bulk_send_host_summaries', 'POST', lambda f: '/api/admin/bulk/send-summaries', budget=4),
+    EndpointCase('admin.bulk_send_noshow_report_requests', 'POST',
+                 lambda f: '/api/admin/bulk/send-noshow-requests', budget=4),
+    EndpointCase('admin.get_email', 'GET', lambda f: f"/api/admin/emails/{f['email_id']()}", budget=1),
+]
+
+
+class StatementRecorder:
+    """Collects the SQL text of every statement executed on an engine, numbered by DBAPI call."""
+
+    def __init__(self, engine):
+        self.statements: List[Tuple[int, str]] = []
+        self._calls = 0
+        self._last_context = None
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # insertmanyvalues sends one executemany() as several INSERT pages, all on the same execution context
+        if not (executemany and context is self._last_context):
+            self._calls += 1
+        self._last_context = context
+        self.statements.append((self._calls, ' '.join(statement.split())))
+
+
+def count_statements(statements: List[Tuple[int, str]]) -> int:
+    """Statements issued, counting the pages of one executemany() call once."""
+    return len({call for call, _ in statements})
+
+
+def build_fixtures(app) -> dict:
+    """Pick the rows and mint the tokens the cases need."""
+    from app import db
+    from app.models import Guest, Host, Match, MagicLink, Email
+    from app.services.registration_intake import enqueue_registration
+    from app.config import MatchStatus
+    from app.utils.tokens import generate_action_token, generate_multi_target_token, generate_session_token
+
+    def match_ids(status, limit):
+        return [m.id for m in Match.query.filter_by(status=status).order_by(Match.created_at).limit(limit)]
+
+    with app.test_request_context():
+        guest = Guest.query.order_by(Guest.created_at).first()
+        host = Host.query.order_by(Host.created_at).first()
+        requested_ids = match_ids(MatchStatus.REQUESTED.value, 3)
+        confirmed = Match.query.filter_by(
+            status=MatchStatus.CONFIRMED.value, guest_no_show=False, guest_confirmed_at=None
+        ).order_by(Match.created_at).first()
+
+        seats_taken = Host.seats_taken_by_host()
+        spare_host_id = max(
+            db.session.query(Host.id, Host.seats_available),
+            key=lambda row: row.seats_available - seats_taken.get(row.id, 0)
+        ).id
+
+        link = MagicLink.create_for_user(guest.email, 'guest', guest.id)
+        db.session.add(link)
+        rng = random.Random(7)
+        intake = enqueue_registration('guest', guest_payload(rng, 900000))
+        db.session.commit()
+
+        return {
+            'admin_password': app.config['ADMIN_PASSWORD'],
+            'admin_headers': {'Authorization': f"Bearer {generate_session_token('admin', 'admin')}"},
+            'guest_id': guest.id,
+            'guest_email': guest.email,
+            'guest_headers': {'Authorization': f"Bearer {generate_session_token('guest', guest.id)}"},
+            'host_id': host.id,
+            'host_headers': {'Authorization': f"Bearer {generate_session_token('host', host.id)}"},
+            'spare_host_id': spare_host_id,
+            'proposed_ids': match_ids(MatchStatus.PROPOSED.value, 3),
+            'requested_ids': requested_ids,
+            'accept_token': generate_action_token('match_accept', requested_ids[0]),
+            'digest_token': generate_multi_target_token('match_digest', requested_ids[1:]),
+            'accepted_id': match_ids(MatchStatus.ACCEPTED.value, 1)[0],
+            'confirmed_id': confirmed.id,
+            'confirm_token': generate_action_token('confirm_attendance', confirmed.id),
+            'summary_host_id': confirmed.host_id,
+            'noshow_token': generate_action_token('noshow_report', confirmed.host_id),
+            'noshow_match_ids': [confirmed.id],
+            'magic_token': link.token,
+            'intake_id': intake.id,
+            'new_guest': guest_payload(rng, 900001),
+            'new_host': host_payload(rng, 900002),
+            'email_id': lambda: Email.query.with_entities(Email.id).order_by(Email.created_at.desc()).first()[0]
+        }
+
+
+def measure(guests: int, hosts: int, seed: int) -> Dict[str, dict]:
+    """Seed a fresh database of the given size and run every case once."""
+    from app import create_app, db
+
+    tmpdir = tempfile.mkdtemp(prefix='shabbatlink-budget-')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmpdir, 'budget.db')}",
+        'RATE_LIMIT_ENABLED': False
+    })
+    with app.app_context():
+        populate(SyntheticConfig(guests=guests, hosts=hosts, seed=seed))
+        recorder = StatementRecorder(db.engine)
+
+    fixtures = build_fixtures(app)
+    client = app.test_client()
+    results = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for case in CASES:
+            with app.app_context():
+                path = case.path(fixtures)
+            recorder.statements = []
+            response = client.open(
+                path,
+                method=case.method,
+                json=case.json(fixtures) if case.json else None,
+                headers=case.headers(fixtures)
+            )
+            results[case.name] = {
+                'status': response.status_code,
+                'statements': recorder.statements
+            }
+
+    return results
+
+
+def check(small: Dict[str, dict], large: Dict[str, dict], verbose=False) -> List[str]:
+    """Compare both runs against the budgets; return failure descriptions."""
+    failures = []
+    for case in CASES:
+        n, ten_n = small[case.name], large[case.name]
+        n_count, ten_n_count = count_statements(n['statements']), count_statements(ten_n['statements'])
+        problems = []
+        for label, result in (('N', n), ('10N', ten_n)):
+            if result['status'] != case.status:
+                problems.append(f"status {result['status']} at {label}, expected {case.status}")
+        if ten_n_count > case.budget:
+            problems.append(f"{ten_n_count} statements at 10N, budget {case.budget}")
+        if ten_n_count > n_count:
+            problems.append(f"grows with N: {n_count} -> {ten_n_count}")
+
+        marker = 'FAIL' if problems else 'ok'
+        print(f"{marker:4} {case.method:6} {case.name:45} N={n_count:3}  10N={ten_n_count:3}  budget={case.budget}")
+        if problems or verbose:
+            for problem in problems:
+                print(f"       - {problem}")
+            for _, statement in ten_n['statements']:
+                print(f"         {statement[:200]}")
+        if problems:
+            failures.append(case.name)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-endpoint SQL statement budgets at N and 10N rows.")
+    parser.add_argument('--guests', type=int, default=200, help="N (guests); hosts are N/5")
+    parser.add_argument('--seed', type=int, default=SyntheticConfig.seed)
+    parser.add_argument('--verbose', action='store_true', help="Print statements for passing endpoints too")
+    args = parser.parse_args()
+
+    small = measure(args.guests, max(args.guests // 5, 10), args.seed)
+    large = measure(args.guests * 10, max(args.guests * 2, 100), args.seed)
+    failures = check(small, large, verbose=args.verbose)
+
+    print(f"\n{len(CASES) - len(failures)}/{len(CASES)} endpoints within budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
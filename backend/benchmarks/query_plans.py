@@ -0,0 +1,173 @@
+"""
+Query plans for the app's hot queries, without and with the query indexes.
+
+Seeds a SQLite database and replays the admin pages, a matching run and an
+email worker claim, capturing every statement they send to `matches`,
+`emails` or `activity_logs` (with its parameters). Each statement is then
+EXPLAINed twice: with the indexes of migrations/v0003_query_indexes.py
+dropped ("before") and recreated ("after").
+
+The plans are checked in at benchmarks/plans/sqlite.json. --check compares
+the current "after" plans with that file and exits 1 if one changed, so an
+index that stops being used shows up in review; --write refreshes it.
+
+Run from backend directory:
+    python -m benchmarks.query_plans            # print before/after
+    python -m benchmarks.query_plans --check
+    python -m benchmarks.query_plans --write
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+
+from sqlalchemy import event
+
+from benchmarks.query_budget import build_fixtures
+from benchmarks.synthetic_data import SyntheticConfig, populate
+
+
+PLANS_FILE = os.path.join(os.path.dirname(__file__), 'plans', 'sqlite.json')
+TABLES = re.compile(r'\b(FROM|JOIN|UPDATE)\s+(matches|emails|activity_logs)\b')
+
+# (name, method, path); read-only pages first, then the jobs that write
+REQUESTS = [
+    ('admin.get_dashboard', 'GET', lambda f: '/api/admin/dashboard'),
+    ('admin.list_guests', 'GET', lambda f: '/api/admin/guests'),
+    ('admin.get_guest_detail', 'GET', lambda f: f"/api/admin/guests/{f['guest_id']}"),
+    ('admin.list_hosts', 'GET', lambda f: '/api/admin/hosts'),
+    ('admin.get_host_detail', 'GET', lambda f: f"/api/admin/hosts/{f['host_id']}"),
+    ('admin.list_matches', 'GET', lambda f: '/api/admin/matches'),
+    ('admin.list_matches?status', 'GET', lambda f: '/api/admin/matches?status=requested'),
+    ('admin.list_emails', 'GET', lambda f: '/api/admin/emails'),
+    ('admin.list_activity', 'GET', lambda f: '/api/admin/activity'),
+    ('admin.send_match_requests', 'POST', lambda f: '/api/admin/matches/send-requests'),
+    ('admin.generate_matches', 'POST', lambda f: '/api/admin/matches/generate'),
+]
+
+
+def capture(app):
+    """Run the requests and the email worker's claim; return [(name, statement, parameters)]."""
+    from app import db
+    from app.services.email_delivery import EmailDeliveryWorker, create_transport
+
+    captured = []
+    current = {'name': None}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if current['name'] and not executemany and TABLES.search(statement) and not statement.startswith('INSERT'):
+            captured.append((current['name'], ' '.join(statement.split()), parameters))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', on_execute)
+
+    fixtures = build_fixtures(app)
+    client = app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, method, path in REQUESTS:
+            current['name'] = name
+            client.open(path(fixtures), method=method, headers=fixtures['admin_headers'])
+
+        with app.app_context():
+            current['name'] = 'email_worker.claim_batch'
+            EmailDeliveryWorker(create_transport(app.config)).claim_batch()
+            current['name'] = None
+
+    # One entry per distinct statement and caller
+    seen, unique = set(), []
+    for name, statement, parameters in captured:
+        if (name, statement) not in seen:
+            seen.add((name, statement))
+            unique.append((name, statement, parameters))
+    return unique
+
+
+def explain(connection, statement, parameters):
+    """SQLite's EXPLAIN QUERY PLAN as indented lines."""
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def plans(guests, hosts, seed):
+    from app import create_app, db
+    from app.migrations import v0003_query_indexes
+
+    tmpdir = tempfile.mkdtemp(prefix='shabbatlink-plans-')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmpdir, 'plans.db')}",
+        'RATE_LIMIT_ENABLED': False,
+        'SLOW_QUERY_THRESHOLD_MS': 0
+    })
+    with app.app_context():
+        populate(SyntheticConfig(guests=guests, hosts=hosts, seed=seed))
+
+    statements = capture(app)
+    results = [{'caller': name, 'statement': statement} for name, statement, _ in statements]
+
+    with app.app_context(), db.engine.connect() as connection:
+        index_names = [ddl.split()[5] for ddl in v0003_query_indexes.INDEXES]
+        for name in index_names:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+        for result, (_, statement, parameters) in zip(results, statements):
+            result['before'] = explain(connection, statement, parameters)
+
+        v0003_query_indexes.upgrade(connection)
+        for result, (_, statement, parameters) in zip(results, statements):
+            result['after'] = explain(connection, statement, parameters)
+        connection.commit()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plans before/after the query indexes.")
+    parser.add_argument('--guests', type=int, default=2000)
+    parser.add_argument('--hosts', type=int, default=400)
+    parser.add_argument('--seed', type=int, default=SyntheticConfig.seed)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--check', action='store_true', help="Fail if a plan differs from the checked-in one")
+    mode.add_argument('--write', action='store_true', help="Update the checked-in plans")
+    args = parser.parse_args()
+
+    results = plans(args.guests, args.hosts, args.seed)
+
+    if args.write:
+        os.makedirs(os.path.dirname(PLANS_FILE), exist_ok=True)
+        with open(PLANS_FILE, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Wrote {len(results)} plans to {PLANS_FILE}")
+        return
+
+    if args.check:
+        with open(PLANS_FILE) as f:
+            expected = {(r['caller'], r['statement']): r['after'] for r in json.load(f)}
+        changed = [
+            r for r in results
+            if expected.get((r['caller'], r['statement'])) != r['after']
+        ]
+        for r in changed:
+            print(f"CHANGED {r['caller']}: {r['statement'][:160]}")
+            print('  expected: ' + ' | '.join(expected.get((r['caller'], r['statement'])) or ['(new statement)']))
+            print('  now:      ' + ' | '.join(r['after']))
+        print(f"\n{len(results) - len(changed)}/{len(results)} plans unchanged")
+        sys.exit(1 if changed else 0)
+
+    for r in results:
+        marker = 'same' if r['before'] == r['after'] else 'NEW '
+        print(f"{marker} {r['caller']}: {r['statement'][:160]}")
+        if marker != 'same':
+            print('       before: ' + ' | '.join(line.strip() for line in r['before']))
+            print('       after:  ' + ' | '.join(line.strip() for line in r['after']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+SQLite write-contention benchmark: default vs production profile.
+
+Simulates a registration burst against one SQLite file from several worker
+processes (like gunicorn workers), each with several threads. Most operations
+register a guest or host; the rest read the admin dashboard. Runs the same
+workload with SQLITE_PROFILE=default and =production on identical copies of
+a seeded database and reports throughput, latency percentiles and errors
+("database is locked" surfaces as 500s).
+
+Run from backend directory:
+    python -m benchmarks.sqlite_contention --processes 4 --threads 4 --operations 50
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.api_load import percentile
+from benchmarks.synthetic_data import SyntheticConfig, populate
+from tests.conftest import guest_payload, host_payload
+
+
+PROFILES = ('default', 'production')
+
+
+def _app_config(database_path, profile):
+    return {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+        'RATE_LIMIT_ENABLED': False,
+        'SLOW_QUERY_THRESHOLD_MS': 0,
+        'SQLITE_PROFILE': profile
+    }
+
+
+def _worker(database_path, profile, process_index, threads, operations, read_ratio, start_at, results):
+    """One 'gunicorn worker': its own app and engine, `threads` client threads."""
+    import threading
+    from app import create_app
+
+    logging.disable(logging.CRITICAL)  # Failed requests would print tracebacks
+    app = create_app(_app_config(database_path, profile))
+    token = app.test_client().post(
+        '/api/admin/auth', json={'password': app.config['ADMIN_PASSWORD']}
+    ).get_json()['data']['token']
+    admin_headers = {'Authorization': f'Bearer {token}'}
+    samples = []
+    samples_lock = threading.Lock()
+
+    def client_thread(thread_index):
+        rng = random.Random(process_index * 1000 + thread_index)
+        client = app.test_client()
+        local = []
+        for n in range(operations):
+            serial = (process_index * 1000 + thread_index) * 100000 + n
+            roll = rng.random()
+            started = time.perf_counter()
+            if roll < read_ratio:
+                kind, response = 'read', client.get('/api/admin/dashboard', headers=admin_headers)
+            elif roll < read_ratio + (1 - read_ratio) / 5:
+                kind, response = 'write', client.post('/api/hosts', json=host_payload(rng, serial))
+            else:
+                kind, response = 'write', client.post('/api/guests', json=guest_payload(rng, serial))
+            local.append((kind, time.perf_counter() - started, response.status_code))
+        with samples_lock:
+            samples.extend(local)
+
+    # Start every process's threads together so the burst really overlaps
+    time.sleep(max(0.0, start_at - time.time()))
+    workers = [threading.Thread(target=client_thread, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    results.put(samples)
+
+
+def run_profile(database_path, profile, processes, threads, operations, read_ratio):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start_at = time.time() + 3.0  # Leave time for every process to import and build its app
+    workers = [
+        context.Process(target=_worker, args=(
+            database_path, profile, i, threads, operations, read_ratio, start_at, results
+        ))
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    samples = [sample for _ in workers for sample in results.get()]
+    for worker in workers:
+        worker.join()
+    wall_seconds = max(time.time() - start_at, 1e-9)
+
+    report = {'wall_seconds': round(wall_seconds, 3)}
+    for kind in ('write', 'read'):
+        kind_samples = [s for s in samples if s[0] == kind]
+        latencies = sorted(s[1] * 1000 for s in kind_samples)
+        ok = sum(1 for s in kind_samples if s[2] < 400)
+        report[kind] = {
+            'requests': len(kind_samples),
+            'ok': ok,
+            'errors': len(kind_samples) - ok,
+            'ok_per_second': round(ok / wall_seconds, 2),
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 3),
+                'p99': round(percentile(latencies, 99), 3),
+                'max': round(latencies[-1], 3) if latencies else 0.0
+            }
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite write throughput under contention per profile.")
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4, help="Client threads per process")
+    parser.add_argument('--operations', type=int, default=50, help="Requests per thread")
+    parser.add_argument('--read-ratio', type=float, default=0.2, help="Share of dashboard reads")
+    parser.add_argument('--guests', type=int, default=2000, help="Guests to seed before the burst")
+    parser.add_argument('--hosts', type=int, default=400)
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    tmpdir = tempfile.mkdtemp(prefix='shabbatlink-sqlite-')
+    seeded = os.path.join(tmpdir, 'seeded.db')
+    app = create_app(_app_config(seeded, 'default'))
+    with app.app_context():
+        populate(SyntheticConfig(guests=args.guests, hosts=args.hosts))
+        from app import db
+        db.engine.dispose()
+
+    report = {
+        'processes': args.processes,
+        'threads_per_process': args.threads,
+        'operations_per_thread': args.operations,
+        'profiles': {}
+    }
+    for profile in PROFILES:
+        database_path = os.path.join(tmpdir, f'{profile}.db')
+        shutil.copyfile(seeded, database_path)
+        report['profiles'][profile] = run_profile(
+            database_path, profile, args.processes, args.threads, args.operations, args.read_ratio
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
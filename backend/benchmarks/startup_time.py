@@ -0,0 +1,132 @@
+"""
+Cold-start time: how long a fresh process takes to boot and serve a request.
+
+Each run starts a new Python process (nothing imported or cached yet, as on
+a host that wakes a sleeping instance) against a migrated SQLite database
+and measures:
+- import: `from app import create_app` (Flask, SQLAlchemy and the app package)
+- create_app, split into the phases it records (see app/utils/startup.py)
+- first_request: an admin dashboard request, the first to touch the database
+
+It reports the median of each over --runs as JSON, and fails (exit 1) when
+the median boot time (import + create_app) exceeds --budget-ms, or when a
+module that should load on first use (LAZY_MODULES) was imported by boot.
+
+Run from backend directory:
+    python -m benchmarks.startup_time
+    python -m benchmarks.startup_time --runs 10 --budget-ms 800
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+# Loaded on first use, never by create_app
+LAZY_MODULES = (
+    'app.matching.engine',
+    'app.services.matching_adapter',
+    'app.migrations',
+    'sqlalchemy.dialects.postgresql',
+    'cProfile'
+)
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({'RATE_LIMIT_ENABLED': False})
+created = time.perf_counter()
+loaded = [name for name in %r if name in sys.modules]
+
+client = app.test_client()
+token = client.post('/api/admin/auth', json={'password': app.config['ADMIN_PASSWORD']}).get_json()['data']['token']
+request_started = time.perf_counter()
+status = client.get('/api/admin/dashboard', headers={'Authorization': 'Bearer ' + token}).status_code
+finished = time.perf_counter()
+
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'phases': app.extensions['startup'],
+    'first_request_ms': (finished - request_started) * 1000,
+    'first_request_status': status,
+    'lazy_modules_loaded': loaded
+}))
+''' % (LAZY_MODULES,)
+
+
+def migrated_database(directory):
+    """A SQLite database with the current schema, created in its own process."""
+    url = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+    subprocess.run(
+        [sys.executable, '-c', 'from app import create_app; create_app({"AUTO_MIGRATE": True})'],
+        env={**os.environ, 'DATABASE_URL': url}, check=True
+    )
+    return url
+
+
+def run_once(database_url):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD],
+        env={**os.environ, 'DATABASE_URL': database_url},
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _median(values):
+    return round(statistics.median(values), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time and fail past a budget.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', '1000')),
+                        help="Median import + create_app budget (default 1000, or STARTUP_BUDGET_MS)")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='shabbatlink-startup-')
+    try:
+        database_url = migrated_database(tmpdir)
+        run_once(database_url)  # Warm the bytecode and OS file caches, like a deployed image
+        runs = [run_once(database_url) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    boot = [run['import_ms'] + run['create_app_ms'] for run in runs]
+    report = {
+        'runs': args.runs,
+        'boot_ms': _median(boot),
+        'import_ms': _median([run['import_ms'] for run in runs]),
+        'create_app_ms': _median([run['create_app_ms'] for run in runs]),
+        'phases_ms': {
+            phase: _median([run['phases'].get(phase, 0.0) for run in runs])
+            for phase in runs[0]['phases']
+        },
+        'first_request_ms': _median([run['first_request_ms'] for run in runs]),
+        'budget_ms': args.budget_ms
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if report['boot_ms'] > args.budget_ms:
+        failures.append(f"boot took {report['boot_ms']} ms, budget {args.budget_ms} ms")
+    if any(run['first_request_status'] != 200 for run in runs):
+        failures.append("first request failed")
+    loaded = sorted({name for run in runs for name in run['lazy_modules_loaded']})
+    if loaded:
+        failures.append(f"loaded during startup: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""
+In-process synthetic data generator for load testing.
+
+Unlike seed_data.py (which goes through the HTTP API), this writes directly
+through the models in bulk, so it can fill a database with 100k guests,
+20k hosts and their match histories in well under a minute.
+
+Run from backend directory:
+    python -m benchmarks.synthetic_data --database-url sqlite:///loadtest.db --reset
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from seed_pools import (
+    FIRST_NAMES_MALE, FIRST_NAMES_FEMALE, LAST_NAMES, NEIGHBORHOODS,
+    GUEST_KOSHER_OPTIONS, HOST_KOSHER_OPTIONS, HOST_CONTRIBUTION_PREFERENCES,
+    GUEST_CONTRIBUTION_RANGES, TRAVEL_TIMES, EMAIL_DOMAINS
+)
+
+
+@dataclass
+class SyntheticConfig:
+    """Sizes, distributions and seed for a synthetic dataset."""
+    guests: int = 100_000
+    hosts: int = 20_000
+    seed: int = 42
+
+    # Zipf-like exponent over NEIGHBORHOODS (0 = uniform, higher = more skewed
+    # towards the first neighborhoods in the list)
+    neighborhood_skew: float = 1.0
+
+    party_size_weights: Dict[int, float] = field(default_factory=lambda: {
+        1: 0.60, 2: 0.28, 3: 0.07, 4: 0.05
+    })
+    seats_weights: Dict[int, float] = field(default_factory=lambda: {
+        2: 0.15, 4: 0.35, 6: 0.25, 8: 0.15, 12: 0.10
+    })
+    language_mix_weights: Dict[Tuple[str, ...], float] = field(default_factory=lambda: {
+        ("English",): 0.45,
+        ("English", "Spanish"): 0.30,
+        ("Spanish",): 0.08,
+        ("English", "Portuguese"): 0.07,
+        ("English", "Spanish", "Portuguese"): 0.07,
+        ("Portuguese",): 0.03
+    })
+
+    # Match history: past weeks of declined/confirmed matches per guest, plus
+    # an active match (proposed/requested/accepted/confirmed) for some guests
+    history_weeks: int = 8
+    history_ratio: float = 0.5
+    active_ratio: float = 0.3
+    active_status_weights: Dict[str, float] = field(default_factory=lambda: {
+        'proposed': 0.35, 'requested': 0.25, 'accepted': 0.15, 'confirmed': 0.25
+    })
+    no_show_rate: float = 0.05
+
+    batch_size: int = 10_000
+
+
+def _weighted_picker(rng: random.Random, weights: Dict) -> Callable:
+    """Return a zero-arg function drawing keys according to weights."""
+    population = list(weights.keys())
+    cum_weights = []
+    total = 0.0
+    for key in population:
+        total += weights[key]
+        cum_weights.append(total)
+
+    def pick():
+        return rng.choices(population, cum_weights=cum_weights)[0]
+    return pick
+
+
+def _neighborhood_weights(skew: float) -> Dict[str, float]:
+    return {n: 1.0 / ((rank + 1) ** skew) for rank, n in enumerate(NEIGHBORHOODS)}
+
+
+class SyntheticDataGenerator:
+    """Builds row dicts for guests, hosts and matches from the shared seed pools."""
+
+    def __init__(self, config: SyntheticConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.now = datetime(2024, 1, 5, 12, 0, 0)  # fixed so runs are reproducible
+
+        self._neighborhood = _weighted_picker(self.rng, _neighborhood_weights(config.neighborhood_skew))
+        self._party_size = _weighted_picker(self.rng, config.party_size_weights)
+        self._seats = _weighted_picker(self.rng, config.seats_weights)
+        self._languages = _weighted_picker(self.rng, config.language_mix_weights)
+        self._active_status = _weighted_picker(self.rng, config.active_status_weights)
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _timestamp(self, max_days_ago: int) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, max_days_ago * 86400))
+
+    def _phone(self) -> str:
+        return f"555-{self.rng.randint(100, 999)}-{self.rng.randint(1000, 9999)}"
+
+    def _vibe(self) -> int:
+        return self.rng.randint(1, 5)
+
+    def guest_rows(self) -> List[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(self.config.guests):
+            gender = "Male" if rng.random() < 0.5 else "Female"
+            first = rng.choice(FIRST_NAMES_MALE if gender == "Male" else FIRST_NAMES_FEMALE)
+            last = rng.choice(LAST_NAMES)
+            created_at = self._timestamp(self.config.history_weeks * 7)
+            rows.append({
+                'id': self._uuid(),
+                'full_name': f"{first} {last}",
+                'email': f"{first.lower()}.{last.lower()}.g{i}@{rng.choice(EMAIL_DOMAINS)}",
+                'phone': self._phone(),
+                'gender': gender,
+                'neighborhood': self._neighborhood(),
+                'max_travel_time': rng.choice(TRAVEL_TIMES),
+                'languages': list(self._languages()),
+                'kosher_requirement': rng.choice(GUEST_KOSHER_OPTIONS),
+                'contribution_range': rng.choice(GUEST_CONTRIBUTION_RANGES),
+                'attended_jlc_before': rng.random() < 0.4,
+                'facebook_url': None,
+                'instagram_handle': f"@{first.lower()}_{last.lower()}{i}" if rng.random() < 0.5 else None,
+                'vibe_chabad': self._vibe(),
+                'vibe_social': self._vibe(),
+                'vibe_formality': self._vibe(),
+                'party_size': self._party_size(),
+                'notes_to_admin': None,
+                'no_show_acknowledged': True,
+                'no_show_count': 0,
+                'is_flagged': False,
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+        return rows
+
+    def host_rows(self) -> List[dict]:
+        rng = self.rng
+        rows = []
+        for i in range(self.config.hosts):
+            first = rng.choice(FIRST_NAMES_MALE + FIRST_NAMES_FEMALE)
+            last = rng.choice(LAST_NAMES)
+            created_at = self._timestamp(self.config.history_weeks * 7)
+            rows.append({
+                'id': self._uuid(),
+                'full_name': f"{first} & Family {last}",
+                'email': f"{first.lower()}.{last.lower()}.h{i}@{rng.choice(EMAIL_DOMAINS)}",
+                'phone': self._phone(),
+                'neighborhood': self._neighborhood(),
+                'address': f"{rng.randint(1, 500)} West {rng.randint(1, 200)}th Street, Apt {rng.randint(1, 30)}{rng.choice('ABCD')}",
+                'languages': list(self._languages()),
+                'kosher_level': rng.choice(HOST_KOSHER_OPTIONS),
+                'contribution_preference': rng.choice(HOST_CONTRIBUTION_PREFERENCES),
+                'vibe_chabad': self._vibe(),
+                'vibe_social': self._vibe(),
+                'vibe_formality': self._vibe(),
+                'seats_available': self._seats(),
+                'tagline': None,
+                'private_notes': None,
+                'no_show_acknowledged': True,
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+        return rows
+
+    def match_rows(self, guests: List[dict], hosts: List[dict]) -> List[dict]:
+        """
+        Build past and active matches.
+
+        Past matches are spread over previous Fridays and end declined or
+        confirmed (sometimes with a no-show, which is also reflected on the
+        guest row). Active matches never overbook a host.
+        """
+        rng = self.rng
+        config = self.config
+        rows = []
+        if not hosts:
+            return rows
+
+        remaining = [h['seats_available'] for h in hosts]
+        host_count = len(hosts)
+
+        for guest in guests:
+            if rng.random() < config.history_ratio:
+                for week in rng.sample(range(1, config.history_weeks + 1), k=rng.randint(1, 3)):
+                    host = hosts[rng.randrange(host_count)]
+                    created_at = self.now - timedelta(weeks=week, days=2)
+                    declined = rng.random() < 0.2
+                    no_show = not declined and rng.random() < config.no_show_rate
+                    if no_show:
+                        guest['no_show_count'] += 1
+                        guest['is_flagged'] = guest['no_show_count'] >= 2
+                    rows.append(self._match_row(
+                        guest, host, 'declined' if declined else 'confirmed',
+                        created_at, no_show=no_show
+                    ))
+
+            if rng.random() < config.active_ratio:
+                # A few random probes are enough; full hosts are simply skipped
+                for _ in range(4):
+                    index = rng.randrange(host_count)
+                    if remaining[index] >= guest['party_size']:
+                        remaining[index] -= guest['party_size']
+                        rows.append(self._match_row(
+                            guest, hosts[index], self._active_status(),
+                            self.now - timedelta(hours=rng.randint(1, 72))
+                        ))
+                        break
+        return rows
+
+    def _match_row(self, guest: dict, host: dict, status: str, created_at: datetime, no_show: bool = False) -> dict:
+        requested_at = created_at + timedelta(hours=1) if status != 'proposed' else None
+        responded_at = requested_at + timedelta(hours=6) if status in ('accepted', 'declined', 'confirmed') else None
+        finalized_at = responded_at + timedelta(hours=2) if status == 'confirmed' else None
+        guest_confirmed_at = finalized_at + timedelta(days=1) if finalized_at and created_at < self.now - timedelta(days=3) else None
+        return {
+            'id': self._uuid(),
+            'guest_id': guest['id'],
+            'host_id': host['id'],
+            'status': status,
+            'match_score': round(self.rng.uniform(0.3, 1.0), 4),
+            'why_its_a_fit': None,
+            'admin_notes': None,
+            'requested_at': requested_at,
+            'responded_at': responded_at,
+            'finalized_at': finalized_at,
+            'guest_confirmed_at': guest_confirmed_at,
+            'guest_no_show': no_show,
+            'no_show_reported_at': finalized_at + timedelta(days=2) if no_show else None,
+            'created_at': created_at,
+            'updated_at': finalized_at or responded_at or requested_at or created_at
+        }
+
+
+def _bulk_insert(model, rows: List[dict], batch_size: int) -> None:
+    from app import db
+
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(insert(model), rows[start:start + batch_size])
+
+
+def populate(config: Optional[SyntheticConfig] = None, reset: bool = False) -> dict:
+    """
+    Generate and insert a synthetic dataset into the current app's database.
+
+    Must be called inside an app context. Migrates the database first (the
+    app no longer does on startup). Returns row counts and timings.
+    """
+    from app import db
+    from app.migrations import upgrade
+    from app.migrations.runner import schema_migrations
+    from app.models import Guest, Host, Match
+
+    config = config or SyntheticConfig()
+    timings = {}
+
+    started = time.perf_counter()
+    if reset:
+        db.drop_all()
+        schema_migrations.drop(db.engine, checkfirst=True)
+    upgrade(db.engine, log=lambda message: None)
+    timings['migrate'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    generator = SyntheticDataGenerator(config)
+    guests = generator.guest_rows()
+    hosts = generator.host_rows()
+    matches = generator.match_rows(guests, hosts)
+    timings['generate'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    _bulk_insert(Guest, guests, config.batch_size)
+    _bulk_insert(Host, hosts, config.batch_size)
+    _bulk_insert(Match, matches, config.batch_size)
+    db.session.commit()
+    timings['insert'] = time.perf_counter() - started
+
+    return {
+        'guests': len(guests),
+        'hosts': len(hosts),
+        'matches': len(matches),
+        'timings': {phase: round(seconds, 3) for phase, seconds in timings.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic ShabbatLink data.")
+    parser.add_argument('--database-url', default='sqlite:///loadtest.db')
+    parser.add_argument('--guests', type=int, default=SyntheticConfig.guests)
+    parser.add_argument('--hosts', type=int, default=SyntheticConfig.hosts)
+    parser.add_argument('--seed', type=int, default=SyntheticConfig.seed)
+    parser.add_argument('--neighborhood-skew', type=float, default=SyntheticConfig.neighborhood_skew)
+    parser.add_argument('--history-ratio', type=float, default=SyntheticConfig.history_ratio)
+    parser.add_argument('--active-ratio', type=float, default=SyntheticConfig.active_ratio)
+    parser.add_argument('--reset', action='store_true', help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    config = SyntheticConfig(
+        guests=args.guests,
+        hosts=args.hosts,
+        seed=args.seed,
+        neighborhood_skew=args.neighborhood_skew,
+        history_ratio=args.history_ratio,
+        active_ratio=args.active_ratio
+    )
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_url})
+    with app.app_context():
+        result = populate(config, reset=args.reset)
+
+    result['config'] = {k: v for k, v in asdict(config).items() if k != 'language_mix_weights'}
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+Management commands for background and maintenance work.
+
+Run from backend directory:
+    python manage.py migrate               # apply pending schema migrations
+    python manage.py email-worker          # deliver queued emails (long-running)
+    python manage.py email-worker --once   # deliver one batch and exit
+    python manage.py archive-activity      # archive activity older than the retention window
+    python manage.py search-activity --action-type match_accepted --start 2024-01-01
+    python manage.py sweep-magic-links     # delete expired/used login links once
+    python manage.py intake-worker         # apply queued registrations (INTAKE_MODE=async)
+    python manage.py sweep-intake          # delete finished intake rows (and their payloads)
+    python manage.py sweep-idempotency-keys  # delete expired Idempotency-Key responses
+    python manage.py sweep-rate-limit-buckets  # delete idle RATE_LIMIT_STORE=database buckets
+    python manage.py copy-database --to postgresql://...  # copy into a new database (e.g. native ids)
+"""
+import argparse
+import json
+import signal
+from datetime import date
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app, db
+
+
+def migrate(app, args):
+    """Apply pending schema migrations."""
+    from app.migrations import MIGRATIONS, pending, upgrade
+
+    if args.status:
+        waiting = {migration.VERSION for migration in pending(db.engine)}
+        for migration in MIGRATIONS:
+            state = 'pending' if migration.VERSION in waiting else 'applied'
+            print(f"{migration.VERSION:04d} {migration.NAME:30} {state}")
+        return
+
+    applied = upgrade(db.engine)
+    print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+
+
+def email_worker(app, args):
+    """Deliver queued outbox emails."""
+    from app.services.email_delivery import EmailDeliveryWorker, create_transport
+
+    worker = EmailDeliveryWorker(
+        create_transport(app.config),
+        batch_size=args.batch_size,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        backoff_seconds=args.backoff_seconds
+    )
+
+    if args.once:
+        try:
+            print(worker.run_once())
+        finally:
+            worker.transport.close()
+        return
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    print(f"Email worker {worker.worker_id} started ({app.config['EMAIL_TRANSPORT']} transport)")
+    try:
+        worker.run_forever(poll_interval=args.poll_interval, should_stop=lambda: bool(stopping))
+    except KeyboardInterrupt:
+        pass
+
+
+def archive_activity(app, args):
+    """Roll up and archive old activity log entries."""
+    from app.services.activity_archive import archive_activity as run_archive
+
+    result = run_archive(
+        args.archive_dir or app.config['ACTIVITY_ARCHIVE_DIR'],
+        older_than_days=args.older_than_days if args.older_than_days is not None
+        else app.config['ACTIVITY_RETENTION_DAYS'],
+        batch_size=args.batch_size
+    )
+    print(json.dumps(result, indent=2))
+
+
+def search_activity(app, args):
+    """Stream matching archived activity entries as NDJSON."""
+    from app.services.activity_archive import iter_archived_activity
+
+    rows = iter_archived_activity(
+        args.archive_dir or app.config['ACTIVITY_ARCHIVE_DIR'],
+        start=args.start,
+        end=args.end,
+        action_type=args.action_type,
+        target_id=args.target_id,
+        actor=args.actor
+    )
+    for row in rows:
+        print(json.dumps(row))
+
+
+def sweep_magic_links(app, args):
+    """Delete expired and used magic links."""
+    from app.services.magic_link_sweeper import sweep_magic_links as sweep, run_sweeper
+
+    if not args.every:
+        print(f"Swept {sweep(args.batch_size)} magic link(s)")
+        return
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    try:
+        run_sweeper(args.every, batch_size=args.batch_size, should_stop=lambda: bool(stopping))
+    except KeyboardInterrupt:
+        pass
+
+
+def sweep_idempotency_keys(app, args):
+    """Delete expired Idempotency-Key responses."""
+    from app.utils.idempotency import sweep_idempotency_keys as sweep
+
+    print(f"Swept {sweep(args.batch_size)} idempotency key(s)")
+
+
+def sweep_rate_limit_buckets(app, args):
+    """Delete rate limit buckets that have refilled completely (RATE_LIMIT_STORE=database)."""
+    from app.utils.rate_limit import sweep_rate_limit_buckets as sweep
+
+    print(f"Swept {sweep(args.batch_size)} rate limit bucket(s)")
+
+
+def copy_database(app, args):
+    """Copy every table into another (empty) database, e.g. to switch ID_STORAGE."""
+    from app.services.database_copy import copy_database as copy, create_target_engine
+
+    target = create_target_engine(args.to, args.id_storage)
+    copied = copy(db.engine, target, batch_size=args.batch_size)
+    print(f"Copied {sum(copied.values())} row(s); set DATABASE_URL and ID_STORAGE={args.id_storage}")
+
+
+def intake_worker(app, args):
+    """Apply queued registrations in batches."""
+    from app.services.registration_intake import IntakeWorker
+
+    worker = IntakeWorker(batch_size=args.batch_size, lease_seconds=args.lease_seconds)
+
+    if args.once:
+        print(worker.run_once())
+        return
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    print(f"Intake worker {worker.worker_id} started")
+    try:
+        worker.run_forever(poll_interval=args.poll_interval, should_stop=lambda: bool(stopping))
+    except KeyboardInterrupt:
+        pass
+
+
+def sweep_intake(app, args):
+    """Delete finished registration intake rows."""
+    from app.services.registration_intake import sweep_intake as sweep
+
+    print(f"Swept {sweep(args.older_than_days, args.batch_size)} intake row(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ShabbatLink management commands")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = subparsers.add_parser('migrate', help=migrate.__doc__)
+    migrate_parser.add_argument('--status', action='store_true', help="List migrations and whether they are applied")
+    migrate_parser.set_defaults(handler=migrate)
+
+    worker_parser = subparsers.add_parser('email-worker', help=email_worker.__doc__)
+    worker_parser.add_argument('--once', action='store_true', help="Deliver a single batch and exit")
+    worker_parser.add_argument('--batch-size', type=int, default=50)
+    worker_parser.add_argument('--poll-interval', type=float, default=2.0)
+    worker_parser.add_argument('--lease-seconds', type=int, default=300)
+    worker_parser.add_argument('--max-attempts', type=int, default=5)
+    worker_parser.add_argument('--backoff-seconds', type=int, default=30)
+    worker_parser.set_defaults(handler=email_worker)
+
+    archive_parser = subparsers.add_parser('archive-activity', help=archive_activity.__doc__)
+    archive_parser.add_argument('--older-than-days', type=int, help="Defaults to ACTIVITY_RETENTION_DAYS")
+    archive_parser.add_argument('--archive-dir', help="Defaults to ACTIVITY_ARCHIVE_DIR")
+    archive_parser.add_argument('--batch-size', type=int, default=1000)
+    archive_parser.set_defaults(handler=archive_activity)
+
+    search_parser = subparsers.add_parser('search-activity', help=search_activity.__doc__)
+    search_parser.add_argument('--archive-dir', help="Defaults to ACTIVITY_ARCHIVE_DIR")
+    search_parser.add_argument('--start', type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    search_parser.add_argument('--end', type=date.fromisoformat, help="Last day (YYYY-MM-DD)")
+    search_parser.add_argument('--action-type')
+    search_parser.add_argument('--target-id')
+    search_parser.add_argument('--actor')
+    search_parser.set_defaults(handler=search_activity)
+
+    sweep_parser = subparsers.add_parser('sweep-magic-links', help=sweep_magic_links.__doc__)
+    sweep_parser.add_argument('--batch-size', type=int, default=1000)
+    sweep_parser.add_argument('--every', type=float, help="Keep running, sweeping every N seconds")
+    sweep_parser.set_defaults(handler=sweep_magic_links)
+
+    idempotency_parser = subparsers.add_parser('sweep-idempotency-keys', help=sweep_idempotency_keys.__doc__)
+    idempotency_parser.add_argument('--batch-size', type=int, default=1000)
+    idempotency_parser.set_defaults(handler=sweep_idempotency_keys)
+
+    buckets_parser = subparsers.add_parser('sweep-rate-limit-buckets', help=sweep_rate_limit_buckets.__doc__)
+    buckets_parser.add_argument('--batch-size', type=int, default=1000)
+    buckets_parser.set_defaults(handler=sweep_rate_limit_buckets)
+
+    copy_parser = subparsers.add_parser('copy-database', help=copy_database.__doc__)
+    copy_parser.add_argument('--to', required=True, help="Target database URL")
+    copy_parser.add_argument('--id-storage', choices=['string', 'native'], default='native')
+    copy_parser.add_argument('--batch-size', type=int, default=1000)
+    copy_parser.set_defaults(handler=copy_database)
+
+    intake_parser = subparsers.add_parser('intake-worker', help=intake_worker.__doc__)
+    intake_parser.add_argument('--once', action='store_true', help="Apply a single batch and exit")
+    intake_parser.add_argument('--batch-size', type=int, default=200)
+    intake_parser.add_argument('--poll-interval', type=float, default=1.0)
+    intake_parser.add_argument('--lease-seconds', type=int, default=120)
+    intake_parser.set_defaults(handler=intake_worker)
+
+    sweep_intake_parser = subparsers.add_parser('sweep-intake', help=sweep_intake.__doc__)
+    sweep_intake_parser.add_argument('--older-than-days', type=int, default=7)
+    sweep_intake_parser.add_argument('--batch-size', type=int, default=1000)
+    sweep_intake_parser.set_defaults(handler=sweep_intake)
+
+    args = parser.parse_args()
+    app = create_app()
+    with app.app_context():
+        args.handler(app, args)
+        db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,53 +4,14 @@ Run from backend directory: python seed_data.py
 """
 import requests
 import random
+from seed_pools import (
+    FIRST_NAMES_MALE, FIRST_NAMES_FEMALE, LAST_NAMES, NEIGHBORHOODS, LANGUAGES,
+    GUEST_KOSHER_OPTIONS, HOST_KOSHER_OPTIONS, CONTRIBUTION_AMOUNTS,
+    HOST_CONTRIBUTION_PREFERENCES
+)
 
 API_URL = "http://localhost:5001/api"
 
-# Realistic data pools
-FIRST_NAMES_MALE = ["David", "Michael", "Daniel", "Jonathan", "Benjamin", "Aaron", "Joshua", "Samuel", "Nathan", "Adam", "Eli", "Jacob", "Isaac", "Gabriel", "Noah", "Ethan", "Lucas", "Mateo", "Sebastian", "Diego"]
-FIRST_NAMES_FEMALE = ["Sarah", "Rebecca", "Rachel", "Miriam", "Hannah", "Leah", "Esther", "Naomi", "Ruth", "Maya", "Sofia", "Isabella", "Valentina", "Camila", "Lucia", "Elena", "Ana", "Maria", "Gabriela", "Carolina"]
-LAST_NAMES = ["Cohen", "Levy", "Goldstein", "Friedman", "Rosenberg", "Shapiro", "Katz", "Weiss", "Klein", "Schwartz", "Rubin", "Stern", "Rosen", "Kaplan", "Berger", "Hoffman", "Meyer", "Wolf", "Stein", "Green", "Rodriguez", "Garcia", "Martinez", "Lopez", "Gonzalez", "Fernandez", "Alvarez", "Morales", "Vargas", "Castro"]
-
-NEIGHBORHOODS = [
-    "Upper West Side",
-    "Upper East Side",
-    "Midtown West",
-    "Midtown East",
-    "Murray Hill",
-    "Gramercy / Flatiron",
-    "Chelsea",
-    "Greenwich Village / West Village",
-    "East Village / NoHo",
-    "SoHo / Tribeca",
-    "Lower East Side",
-    "Financial District",
-    "Washington Heights",
-    "Harlem"
-]
-
-LANGUAGES = ["English", "Spanish", "Portuguese"]
-
-GUEST_KOSHER_OPTIONS = [
-    "Kosher House",
-    "Kosher Take out",
-    "Not a Kosher home (Staff member will reach out to you)"
-]
-
-HOST_KOSHER_OPTIONS = [
-    "Full kosher",
-    "Mixed dairy and meat dishes",
-    "Vegetarian kosher home"
-]
-
-CONTRIBUTION_AMOUNTS = ["$15", "$20", "$25", "$30", "$35", "$40", "$50"]
-
-HOST_CONTRIBUTION_PREFERENCES = [
-    "No contribution needed",
-    "$10 to $25",
-    "$25 to $50",
-    "$50+"
-]
 
 def random_phone():
     return f"555-{random.randint(100,999)}-{random.randint(1000,9999)}"
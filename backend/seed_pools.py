@@ -0,0 +1,63 @@
+"""
+Shared data pools for seed and synthetic data scripts.
+
+Kept free of third-party imports so both the HTTP seed script and the
+in-process generator can use them.
+"""
+
+# Realistic data pools
+FIRST_NAMES_MALE = ["David", "Michael", "Daniel", "Jonathan", "Benjamin", "Aaron", "Joshua", "Samuel", "Nathan", "Adam", "Eli", "Jacob", "Isaac", "Gabriel", "Noah", "Ethan", "Lucas", "Mateo", "Sebastian", "Diego"]
+FIRST_NAMES_FEMALE = ["Sarah", "Rebecca", "Rachel", "Miriam", "Hannah", "Leah", "Esther", "Naomi", "Ruth", "Maya", "Sofia", "Isabella", "Valentina", "Camila", "Lucia", "Elena", "Ana", "Maria", "Gabriela", "Carolina"]
+LAST_NAMES = ["Cohen", "Levy", "Goldstein", "Friedman", "Rosenberg", "Shapiro", "Katz", "Weiss", "Klein", "Schwartz", "Rubin", "Stern", "Rosen", "Kaplan", "Berger", "Hoffman", "Meyer", "Wolf", "Stein", "Green", "Rodriguez", "Garcia", "Martinez", "Lopez", "Gonzalez", "Fernandez", "Alvarez", "Morales", "Vargas", "Castro"]
+
+NEIGHBORHOODS = [
+    "Upper West Side",
+    "Upper East Side",
+    "Midtown West",
+    "Midtown East",
+    "Murray Hill",
+    "Gramercy / Flatiron",
+    "Chelsea",
+    "Greenwich Village / West Village",
+    "East Village / NoHo",
+    "SoHo / Tribeca",
+    "Lower East Side",
+    "Financial District",
+    "Washington Heights",
+    "Harlem"
+]
+
+LANGUAGES = ["English", "Spanish", "Portuguese"]
+
+GUEST_KOSHER_OPTIONS = [
+    "Kosher House",
+    "Kosher Take out",
+    "Not a Kosher home (Staff member will reach out to you)"
+]
+
+HOST_KOSHER_OPTIONS = [
+    "Full kosher",
+    "Mixed dairy and meat dishes",
+    "Vegetarian kosher home"
+]
+
+CONTRIBUTION_AMOUNTS = ["$15", "$20", "$25", "$30", "$35", "$40", "$50"]
+
+HOST_CONTRIBUTION_PREFERENCES = [
+    "No contribution needed",
+    "$10 to $25",
+    "$25 to $50",
+    "$50+"
+]
+
+GUEST_CONTRIBUTION_RANGES = [
+    "Prefer not to say",
+    "$0 to $10",
+    "$10 to $25",
+    "$25 to $50",
+    "$50+"
+]
+
+TRAVEL_TIMES = [15, 30, 45, 60, 999]
+
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com"]
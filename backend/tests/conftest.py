@@ -0,0 +1,63 @@
+"""
+Shared fixtures: an app on a fresh, migrated SQLite file per test, and the
+registration payload builders (also used by the benchmarks).
+"""
+import random
+
+import pytest
+
+from app import create_app, db
+from seed_pools import NEIGHBORHOODS, GUEST_KOSHER_OPTIONS, HOST_KOSHER_OPTIONS
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'AUTO_MIGRATE': True,
+        'RATE_LIMIT_ENABLED': False,
+        'SLOW_QUERY_THRESHOLD_MS': 0
+    })
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def guest_payload(rng: random.Random, n: int) -> dict:
+    """A valid guest registration body; n keeps the name unique."""
+    return {
+        'full_name': f"Load Guest {n}",
+        'email': f"load.guest.{n}.{rng.getrandbits(32)}@example.com",
+        'phone': '555-000-0000',
+        'gender': rng.choice(['Male', 'Female']),
+        'party_size': rng.choice([1, 1, 1, 2, 2, 3]),
+        'neighborhood': rng.choice(NEIGHBORHOODS),
+        'max_travel_time': rng.choice([15, 30, 45, 60, 999]),
+        'languages': rng.choice([['English'], ['English', 'Spanish'], ['Spanish']]),
+        'kosher_requirement': rng.choice(GUEST_KOSHER_OPTIONS),
+        'contribution_range': '$10 to $25',
+        'vibe_chabad': rng.randint(1, 5),
+        'vibe_social': rng.randint(1, 5),
+        'vibe_formality': rng.randint(1, 5),
+        'no_show_acknowledged': True
+    }
+
+
+def host_payload(rng: random.Random, n: int) -> dict:
+    """A valid host registration body; n keeps the name unique."""
+    return {
+        'full_name': f"Load Host {n}",
+        'email': f"load.host.{n}.{rng.getrandbits(32)}@example.com",
+        'phone': '555-000-0001',
+        'neighborhood': rng.choice(NEIGHBORHOODS),
+        'address': '1 Load Test Plaza',
+        'seats_available': rng.choice([2, 4, 6, 8]),
+        'languages': ['English', 'Spanish'],
+        'kosher_level': rng.choice(HOST_KOSHER_OPTIONS),
+        'contribution_preference': 'No contribution needed',
+        'vibe_chabad': rng.randint(1, 5),
+        'vibe_social': rng.randint(1, 5),
+        'vibe_formality': rng.randint(1, 5),
+        'no_show_acknowledged': True
+    }
@@ -0,0 +1,46 @@
+"""Bulk day-of emails only reach the current event's matches."""
+import random
+from datetime import datetime, timedelta
+
+from app import db
+from app.config import MatchStatus
+from app.models import Email, Guest, Host, Match
+from app.services.bulk_operations import (
+    send_all_day_of_reminders, send_all_host_summaries, send_all_noshow_requests
+)
+from tests.conftest import guest_payload, host_payload
+
+
+def _confirmed_match(n, finalized_days_ago, no_show_reported=False):
+    rng = random.Random(n)
+    guest = Guest.from_registration(guest_payload(rng, n))
+    host = Host.from_registration(host_payload(rng, n))
+    db.session.add_all([guest, host])
+    db.session.flush()
+    finalized_at = datetime.utcnow() - timedelta(days=finalized_days_ago)
+    match = Match(
+        guest_id=guest.id,
+        host_id=host.id,
+        status=MatchStatus.CONFIRMED.value,
+        finalized_at=finalized_at,
+        guest_no_show=no_show_reported,
+        no_show_reported_at=finalized_at + timedelta(days=1) if no_show_reported else None
+    )
+    db.session.add(match)
+    db.session.flush()
+    return match
+
+
+def test_only_current_event_matches_are_emailed(app):
+    current = _confirmed_match(1, finalized_days_ago=2)
+    last_week = _confirmed_match(2, finalized_days_ago=9)
+    reported = _confirmed_match(3, finalized_days_ago=1, no_show_reported=True)
+
+    jobs = [send_all_day_of_reminders(), send_all_host_summaries(), send_all_noshow_requests()]
+    db.session.commit()
+
+    assert [job['total'] for job in jobs] == [1, 1, 1]
+    recipients = {email.to_email for email in Email.query.all()}
+    assert recipients == {current.guest.email, current.host.email}
+    assert last_week.guest.email not in recipients and last_week.host.email not in recipients
+    assert reported.guest.email not in recipients
@@ -0,0 +1,112 @@
+"""SMTP delivery through create_transport against a local SMTP stand-in."""
+import socketserver
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.config import EmailStatus, EmailType
+from app.models import Email
+from app.services.email_delivery import EmailDeliveryWorker, SMTPTransport, create_transport
+from app.services.email_service import EmailService
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts mail, or refuses every recipient with 451."""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self._reply("220 localhost ESMTP test")
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith('RCPT') and self.server.refuse:
+                self._reply("451 4.3.0 Try again later")
+            elif command == 'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for line in self.rfile:
+                    if line == b'.\r\n':
+                        break
+                    lines.append(line.decode())
+                self.server.messages.append(''.join(lines))
+                self._reply("250 Queued")
+            elif command == 'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.messages = []
+    server.refuse = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def worker(app, smtp_server):
+    app.config.update(EMAIL_TRANSPORT='smtp', SMTP_HOST='127.0.0.1', SMTP_PORT=smtp_server.server_address[1])
+    transport = create_transport(app.config)
+    assert isinstance(transport, SMTPTransport)
+    yield EmailDeliveryWorker(transport, max_attempts=3, backoff_seconds=30)
+    transport.close()
+
+
+def _queue_email():
+    email = EmailService.queue_email(
+        'guest@example.com', 'Test Guest', EmailType.MAGIC_LINK.value,
+        {'name': 'Test Guest', 'link': 'https://example.com/login'}
+    )
+    db.session.commit()
+    return email
+
+
+def test_delivers_over_smtp(worker, smtp_server):
+    email = _queue_email()
+
+    assert worker.run_once() == {'claimed': 1, 'sent': 1, 'failed': 0}
+    assert email.status == EmailStatus.SENT.value and email.sent_at is not None
+    assert len(smtp_server.messages) == 1
+    assert 'To: Test Guest <guest@example.com>' in smtp_server.messages[0]
+    assert 'https://example.com/login' in smtp_server.messages[0]
+
+
+def test_refused_email_backs_off_then_fails(worker, smtp_server):
+    smtp_server.refuse = True
+    email = _queue_email()
+
+    for attempt, delay in ((1, 30), (2, 60)):
+        started = datetime.utcnow()
+        assert worker.run_once() == {'claimed': 1, 'sent': 0, 'failed': 1}
+        assert email.status == EmailStatus.QUEUED.value and email.attempts == attempt
+        assert '451' in email.last_error and email.lease_owner is None
+        assert started + timedelta(seconds=delay - 1) <= email.next_attempt_at <= datetime.utcnow() + timedelta(seconds=delay)
+
+        # Not due until the backoff has passed
+        assert worker.run_once()['claimed'] == 0
+        email.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+    assert worker.run_once() == {'claimed': 1, 'sent': 0, 'failed': 1}
+    assert email.status == EmailStatus.FAILED.value and email.attempts == 3
+    assert email.next_attempt_at is None
+    assert worker.run_once()['claimed'] == 0
+    assert smtp_server.messages == []
+
+
+def test_long_worker_id_fits_the_lease_owner_column(app):
+    _queue_email()
+    worker = EmailDeliveryWorker(transport=None, worker_id='pod-' + 'x' * 250 + '-1234')
+
+    claimed = worker.claim_batch()
+    assert len(claimed) == 1
+    assert len(claimed[0].lease_owner) == Email.lease_owner.type.length
@@ -0,0 +1,32 @@
+"""An expired Idempotency-Key is claimed again as a new row."""
+import random
+import time
+
+from app import db
+from app.models import Guest, IdempotencyKey
+from tests.conftest import guest_payload
+
+
+def test_expired_key_runs_the_view_again_then_replays(app):
+    client = app.test_client()
+    payload = guest_payload(random.Random(1), 1)
+    headers = {'Idempotency-Key': 'retry-1'}
+
+    assert client.post('/api/guests', json=payload, headers=headers).status_code == 201
+    claim = db.session.scalars(db.select(IdempotencyKey)).one()
+    claim.expires_at = time.time() - 1
+    claim.response = {'stale': True}
+    db.session.commit()
+
+    payload['email'] = 'second.' + payload['email']
+    response = client.post('/api/guests', json=payload, headers=headers)
+    assert response.status_code == 201 and 'Idempotent-Replayed' not in response.headers
+    assert Guest.query.count() == 2
+
+    db.session.expire_all()
+    claim = db.session.scalars(db.select(IdempotencyKey)).one()
+    assert claim.expires_at > time.time() and claim.response == response.get_json()
+
+    replay = client.post('/api/guests', json=payload, headers=headers)
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert Guest.query.count() == 2
@@ -0,0 +1,50 @@
+"""The matching lease is freed when its request does not commit."""
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session
+
+from app import db
+from app.models import JobLease
+from app.utils.tokens import generate_session_token
+
+
+def _generate(app):
+    headers = {'Authorization': f"Bearer {generate_session_token('admin', 'admin')}"}
+    return app.test_client().post('/api/admin/matches/generate', headers=headers)
+
+
+def _lease_holder():
+    with db.engine.connect() as connection:
+        return connection.execute(db.select(JobLease.holder).where(JobLease.name == 'matching')).scalar()
+
+
+def test_failed_commit_releases_matching_lease(app, monkeypatch):
+    def failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(scoped_session, 'commit', failing_commit)
+        assert _generate(app).status_code == 500
+
+    assert _lease_holder() is None
+    assert _generate(app).status_code == 200
+
+
+def test_committed_run_keeps_its_result(app):
+    assert _generate(app).status_code == 200
+    with db.engine.connect() as connection:
+        lease = connection.execute(db.select(JobLease.holder, JobLease.result)).first()
+    assert lease.holder is None and lease.result['matches_created'] == 0
+
+
+def test_serialization_failure_is_a_retryable_conflict(app, monkeypatch):
+    class SerializationFailure(Exception):
+        pgcode = '40001'
+
+    def conflicting_run():
+        raise OperationalError('DELETE FROM matches', {}, SerializationFailure())
+
+    monkeypatch.setattr('app.services.matching_adapter.run_matching', conflicting_run)
+    response = _generate(app)
+    assert response.status_code == 409
+    assert response.headers['Retry-After'] == '1'
+    assert _lease_holder() is None
@@ -0,0 +1,47 @@
+"""Sending a match request emails the host once for all its proposed matches."""
+import random
+
+from app import db
+from app.config import EmailType, MatchStatus
+from app.models import Email, Guest, Host, Match
+from app.utils.tokens import generate_session_token
+from tests.conftest import guest_payload, host_payload
+
+
+def _proposed_matches(host_seed, guest_seeds):
+    rng = random.Random(host_seed)
+    host = Host.from_registration(host_payload(rng, host_seed))
+    guests = [Guest.from_registration(guest_payload(rng, n)) for n in guest_seeds]
+    db.session.add_all([host, *guests])
+    db.session.flush()
+    matches = [Match(guest_id=guest.id, host_id=host.id, status=MatchStatus.PROPOSED.value) for guest in guests]
+    db.session.add_all(matches)
+    db.session.commit()
+    return matches
+
+
+def _send(app, match_id):
+    headers = {'Authorization': f"Bearer {generate_session_token('admin', 'admin')}"}
+    return app.test_client().post(f'/api/admin/matches/{match_id}/send', headers=headers)
+
+
+def test_send_groups_the_hosts_proposed_matches(app):
+    first, second = _proposed_matches(1, [10, 11])
+    other_host = _proposed_matches(2, [20])[0]
+
+    response = _send(app, first.id)
+    assert response.status_code == 200
+    assert response.get_json()['data']['requests_sent'] == 2
+
+    statuses = dict(db.session.query(Match.id, Match.status))
+    assert statuses[first.id] == statuses[second.id] == MatchStatus.REQUESTED.value
+    assert statuses[other_host.id] == MatchStatus.PROPOSED.value
+    assert [email.email_type for email in Email.query.all()] == [EmailType.MATCH_REQUEST_DIGEST_TO_HOST.value]
+
+
+def test_send_single_match_uses_the_request_email(app):
+    match = _proposed_matches(1, [10])[0]
+
+    assert _send(app, match.id).status_code == 200
+    assert [email.email_type for email in Email.query.all()] == [EmailType.MATCH_REQUEST_TO_HOST.value]
+    assert _send(app, match.id).status_code == 400
@@ -0,0 +1,32 @@
+"""Migrations bring databases created by older code up to the current indexes."""
+from sqlalchemy import inspect
+
+from app import db
+from app.migrations import upgrade
+
+
+def test_upgrade_indexes_existing_activity_log(app):
+    db.drop_all()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql('DROP TABLE schema_migrations')
+        # activity_logs as created before its created_at index was declared
+        connection.exec_driver_sql(
+            'CREATE TABLE activity_logs (id VARCHAR(36) PRIMARY KEY, action_type VARCHAR(100) NOT NULL, '
+            'actor VARCHAR(50), target_type VARCHAR(50), target_id VARCHAR(36), details JSON, created_at DATETIME)'
+        )
+
+    upgrade(db.engine, log=lambda message: None)
+
+    indexes = {index['name'] for index in inspect(db.engine).get_indexes('activity_logs')}
+    assert 'ix_activity_logs_created_at' in indexes
+
+
+def test_upgrade_indexes_existing_rate_limit_buckets(app):
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql('DROP INDEX ix_rate_limit_buckets_updated_at')
+        connection.exec_driver_sql('DELETE FROM schema_migrations WHERE version = 4')
+
+    upgrade(db.engine, log=lambda message: None)
+
+    indexes = {index['name'] for index in inspect(db.engine).get_indexes('rate_limit_buckets')}
+    assert 'ix_rate_limit_buckets_updated_at' in indexes
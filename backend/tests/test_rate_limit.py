@@ -0,0 +1,49 @@
+"""Client IP resolution behind a reverse proxy, and dropping idle buckets."""
+import time
+
+from app import db
+from app.models import RateLimitBucket
+from app.utils.rate_limit import MemoryBucketStore, RateLimiter, sweep_rate_limit_buckets
+
+
+def _client_ip(app, limiter, forwarded_for):
+    with app.test_request_context(headers={'X-Forwarded-For': forwarded_for}, environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        return limiter.client_ip()
+
+
+def test_untrusted_proxy_uses_remote_addr(app):
+    limiter = RateLimiter(MemoryBucketStore(), '30/minute', '5/minute')
+    assert _client_ip(app, limiter, '203.0.113.9') == '10.0.0.1'
+
+
+def test_trusted_proxy_ignores_client_supplied_entries(app):
+    limiter = RateLimiter(MemoryBucketStore(), '30/minute', '5/minute', trust_proxy=True)
+    assert _client_ip(app, limiter, '203.0.113.9') == '203.0.113.9'
+    assert _client_ip(app, limiter, '1.2.3.4, 203.0.113.9') == '203.0.113.9'
+
+    two_hops = RateLimiter(MemoryBucketStore(), '30/minute', '5/minute', trust_proxy=True, proxy_hops=2)
+    assert _client_ip(app, two_hops, '1.2.3.4, 203.0.113.9, 198.51.100.7') == '203.0.113.9'
+    assert _client_ip(app, two_hops, '203.0.113.9') == '203.0.113.9'
+
+
+def test_memory_store_drops_refilled_buckets_first():
+    store = MemoryBucketStore(stripes=1, max_keys_per_stripe=2)
+    assert store.take('a', rate=1, burst=2, now=0) == 0.0
+    assert store.take('b', rate=1, burst=2, now=0) == 0.0
+    assert store.take('c', rate=1, burst=2, now=0.5) == 0.0  # 'a' is still refilling
+    assert list(store._buckets[0]) == ['a', 'b', 'c']
+
+    assert store.take('d', rate=1, burst=2, now=5) == 0.0
+    assert list(store._buckets[0]) == ['c', 'd']
+
+
+def test_sweep_deletes_only_refilled_database_buckets(app):
+    now = time.time()
+    db.session.add_all([
+        RateLimitBucket(key='idle', tokens=0, updated_at=now - 3600),
+        RateLimitBucket(key='recent', tokens=0, updated_at=now - 10)
+    ])
+    db.session.commit()
+
+    assert sweep_rate_limit_buckets(batch_size=1) == 1
+    assert db.session.scalars(db.select(RateLimitBucket.key)).all() == ['recent']
@@ -0,0 +1,42 @@
+"""The intake worker isolates rows it cannot apply and drops applied payloads."""
+import random
+from datetime import datetime, timedelta
+
+from app import db
+from app.config import IntakeStatus
+from app.models import Guest, RegistrationIntake
+from app.services.registration_intake import IntakeWorker, enqueue_registration, sweep_intake
+from tests.conftest import guest_payload
+
+
+def test_bad_row_is_failed_and_the_rest_applied(app):
+    rng = random.Random(1)
+    good = [enqueue_registration('guest', guest_payload(rng, n)) for n in range(3)]
+    missing_email = {key: value for key, value in guest_payload(rng, 3).items() if key != 'email'}
+    bad = [
+        enqueue_registration('guest', missing_email),
+        enqueue_registration('guest', {**guest_payload(rng, 4), 'full_name': None})  # NOT NULL
+    ]
+    db.session.commit()
+
+    result = IntakeWorker().run_once()
+
+    assert result == {'claimed': 5, 'applied': 3, 'rejected': 0, 'failed': 2}
+    assert Guest.query.count() == 3
+    for intake in good:
+        assert intake.status == IntakeStatus.APPLIED.value and intake.payload == {}
+    for intake in bad:
+        assert intake.status == IntakeStatus.FAILED.value and intake.error and intake.payload
+    assert IntakeWorker().run_once()['claimed'] == 0  # Not re-leased
+
+
+def test_sweep_deletes_finished_rows(app):
+    rng = random.Random(2)
+    old = enqueue_registration('guest', guest_payload(rng, 1))
+    pending = enqueue_registration('guest', guest_payload(rng, 2))
+    old.status = IntakeStatus.APPLIED.value
+    old.processed_at = datetime.utcnow() - timedelta(days=8)
+    db.session.commit()
+
+    assert sweep_intake(older_than_days=7) == 1
+    assert [intake.id for intake in RegistrationIntake.query.all()] == [pending.id]
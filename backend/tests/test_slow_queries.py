@@ -0,0 +1,42 @@
+"""Slow-query entries and log lines keep parameter values out by default."""
+import logging
+
+from flask import g
+
+from app import db
+from app.utils.slow_queries import SlowQueryLog
+
+STATEMENT = 'SELECT id FROM guests WHERE email = ? AND party_size = ?'
+
+
+def _record(keep_parameters, caplog):
+    slow_queries = SlowQueryLog(db.engine, threshold_ms=1, keep_parameters=keep_parameters)
+    with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+        slow_queries.record(STATEMENT, ('guest@example.com', 2), False, 0.5)
+    slow_queries._pending.join()
+    return slow_queries.entries()[0]
+
+
+def test_parameters_are_redacted(app, caplog):
+    entry = _record(False, caplog)
+    assert entry['parameters'] == {'count': 2, 'types': ['str', 'int']}
+    assert entry['plan_status'] == 'captured'
+    assert 'guest@example.com' not in str(entry)
+    assert 'guest@example.com' not in caplog.text and "'count': 2" in caplog.text
+
+
+def test_debug_flag_keeps_values_out_of_the_log(app, caplog):
+    entry = _record(True, caplog)
+    assert entry['parameters'] == ["'guest@example.com'", '2']
+    assert 'guest@example.com' not in caplog.text
+
+
+def test_failed_statement_leaves_no_timer_on_the_connection(app):
+    with app.test_request_context(), db.engine.connect() as conn:
+        try:
+            conn.exec_driver_sql('SELECT * FROM no_such_table')
+        except Exception:
+            pass
+        conn.exec_driver_sql('SELECT 1')
+        assert not [key for key in conn.info if key.endswith('_started')]
+        assert g.sql_count == 1
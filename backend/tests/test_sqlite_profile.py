@@ -0,0 +1,62 @@
+"""The single-writer queue hands its lock over whichever thread releases."""
+import threading
+
+from app.utils.sqlite_profile import SingleWriter
+
+INSERT = 'INSERT INTO guests (email) VALUES (?)'
+
+
+class Conn:
+    def __init__(self):
+        self.info = {}
+
+
+def _write(writer, conn):
+    writer.before_execute(conn, None, INSERT, (), None, False)
+
+
+def test_second_connection_on_the_same_thread_joins_the_hold():
+    writer = SingleWriter(timeout=0.1)
+    first, second = Conn(), Conn()
+    _write(writer, first)
+    _write(writer, second)
+    assert first.info['holds_writer'] and second.info['holds_writer']
+
+    writer.release(first.info)
+    assert writer._lock.locked()
+    writer.release(second.info)
+    assert not writer._lock.locked()
+
+
+def test_release_from_another_thread_frees_the_lock():
+    writer = SingleWriter(timeout=0.1)
+    conn = Conn()
+    _write(writer, conn)
+
+    releaser = threading.Thread(target=writer.release, args=(conn.info,))
+    releaser.start()
+    releaser.join()
+    assert not writer._lock.locked()
+
+    other = Conn()
+    waiter = threading.Thread(target=_write, args=(writer, other))
+    waiter.start()
+    waiter.join()
+    assert other.info['holds_writer']
+    writer.release(other.info)
+    assert not writer._lock.locked()
+
+
+def test_reads_and_timed_out_writes_hold_nothing():
+    writer = SingleWriter(timeout=0.05)
+    holder, reader, late = Conn(), Conn(), Conn()
+    _write(writer, holder)
+    writer.before_execute(reader, None, 'SELECT 1', (), None, False)
+
+    waiter = threading.Thread(target=_write, args=(writer, late))
+    waiter.start()
+    waiter.join()
+    assert 'holds_writer' not in reader.info and 'holds_writer' not in late.info
+    writer.release(late.info)
+    writer.release(holder.info)
+    assert not writer._lock.locked()
@@ -0,0 +1,54 @@
+"""Action token signing and strict decoding."""
+import hashlib
+import hmac
+import uuid
+
+from app.utils import tokens
+from app.utils.tokens import (
+    _b64decode, _b64encode, _mac, generate_action_token, generate_session_token, verify_action_token, verify_session_token
+)
+
+
+def test_mac_matches_hmac_new():
+    assert _mac('secret', b'data').digest() == hmac.new(b'secret', b'data', hashlib.sha256).digest()
+    assert _mac('secret', b'other').hexdigest() == hmac.new(b'secret', b'other', hashlib.sha256).hexdigest()
+
+
+def test_compact_token_round_trip(app):
+    match_id = str(uuid.uuid4())
+    token = generate_action_token('match_accept', match_id)
+    assert '.' not in token
+    assert verify_action_token(token) == {'action': 'match_accept', 'target_id': match_id, 'target_ids': [match_id]}
+
+
+def test_compact_token_with_junk_characters_is_rejected(app):
+    token = generate_action_token('match_accept', str(uuid.uuid4()))
+    for tampered in (token[:10] + '!' + token[10:], token[:10] + '=' + token[10:], token + '\n', token + 'A', token + '=='):
+        assert verify_action_token(tampered) is None
+
+
+def test_legacy_and_session_tokens_still_verify(app):
+    token = generate_action_token('match_accept', 'not-a-uuid')
+    assert '.' in token
+    assert verify_action_token(token)['target_id'] == 'not-a-uuid'
+    assert verify_session_token(generate_session_token('admin', 'admin'), 'admin') == {'type': 'admin', 'user_id': 'admin'}
+
+
+def test_b64decode_rejects_non_canonical_padding_bits():
+    assert _b64decode(_b64encode(b'\xff')) == b'\xff'
+    for text in ('_x', '_-', '__9', '___'):  # Trailing bits set past the data
+        try:
+            _b64decode(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {text!r}")
+
+
+def test_only_valid_tokens_are_cached(app):
+    tokens._verified.clear()
+    token = generate_action_token('match_accept', str(uuid.uuid4()))
+    for n in range(50):
+        assert verify_action_token(f'garbage{n}') is None
+    assert verify_action_token(token[:-2] + 'AA') is None
+    assert verify_action_token(token) is not None
+    assert list(tokens._verified) == [(token, app.config['SECRET_KEY'])]
@@ -8,6 +8,7 @@ import {
   getAdminMatches, 
   generateMatches, 
   sendMatchRequest, 
+  sendMatchRequests,
   finalizeMatch, 
   deleteMatch,
   editMatch,
@@ -29,6 +30,7 @@ function MatchesContent() {
   const [hosts, setHosts] = useState<any[]>([]);
   const [statusFilter, setStatusFilter] = useState(initialStatus);
   const [isGenerating, setIsGenerating] = useState(false);
+  const [isSendingAll, setIsSendingAll] = useState(false);
   const [actionLoading, setActionLoading] = useState<string | null>(null);
   
   // Edit modal
@@ -81,8 +83,9 @@ function MatchesContent() {
   const handleSendRequest = async (matchId: string) => {
     setActionLoading(`send-${matchId}`);
     try {
-      await sendMatchRequest(matchId);
-      setSuccess('Match request sent to host!');
+      // The host's other proposed matches go out in the same email
+      const result = await sendMatchRequest(matchId);
+      setSuccess(result.message);
       await loadData();
     } catch (err) {
       setError('Failed to send request');
@@ -91,6 +94,26 @@ function MatchesContent() {
     }
   };
 
+  const handleSendAll = async () => {
+    setIsSendingAll(true);
+    setError(null);
+    setSuccess(null);
+    
+    try {
+      const result = await sendMatchRequests();
+      setSuccess(result.message);
+      await loadData();
+    } catch (err) {
+      if (err instanceof ApiError) {
+        setError(err.message);
+      } else {
+        setError('Failed to send requests');
+      }
+    } finally {
+      setIsSendingAll(false);
+    }
+  };
+
   const handleFinalize = async (matchId: string) => {
     setActionLoading(`finalize-${matchId}`);
     try {
@@ -242,9 +265,14 @@ function MatchesContent() {
     <div className={styles.container}>
       <header className={styles.header}>
         <h1>Matches</h1>
-        <Button isLoading={isGenerating} onClick={handleGenerate}>
-          Generate Matches
-        </Button>
+        <div className={styles.headerActions}>
+          <Button variant="secondary" isLoading={isSendingAll} onClick={handleSendAll}>
+            Send All Requests
+          </Button>
+          <Button isLoading={isGenerating} onClick={handleGenerate}>
+            Generate Matches
+          </Button>
+        </div>
       </header>
 
       {error && (
@@ -11,6 +11,7 @@ function MatchResponseContent() {
   const searchParams = useSearchParams();
   const token = searchParams.get('token');
   const action = searchParams.get('action');
+  const matchId = searchParams.get('match');
 
   const [isLoading, setIsLoading] = useState(true);
   const [isSubmitting, setIsSubmitting] = useState(false);
@@ -32,7 +33,7 @@ function MatchResponseContent() {
       // Load match details for preview
       loadMatchDetails();
     }
-  }, [token, action]);
+  }, [token, action, matchId]);
 
   const loadMatchDetails = async () => {
     try {
@@ -52,7 +53,11 @@ function MatchResponseContent() {
     setError(null);
 
     try {
-      const result = await respondToMatch(token);
+      const result = await respondToMatch(
+        token,
+        action === 'accept' || action === 'decline' ? action : undefined,
+        matchId ?? undefined
+      );
       setResponseStatus(result.status);
       setMatchData(result);
     } catch (err) {
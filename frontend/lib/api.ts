@@ -288,6 +288,12 @@ export async function sendMatchRequest(id: string): Promise<{ message: string }>
   });
 }
 
+export async function sendMatchRequests(): Promise<{ message: string }> {
+  return apiFetch('/admin/matches/send-requests', {
+    method: 'POST',
+  });
+}
+
 export async function finalizeMatch(id: string): Promise<{ message: string }> {
   return apiFetch(`/admin/matches/${id}/finalize`, {
     method: 'POST',
@@ -318,10 +324,19 @@ export async function getMatchDetails(token: string): Promise<{ match: Match; gu
   return apiFetch(`/matches/details?token=${token}`);
 }
 
-export async function respondToMatch(token: string, action?: 'accept' | 'decline'): Promise<{ message: string; status: string }> {
+export async function respondToMatch(
+  token: string,
+  action?: 'accept' | 'decline',
+  matchId?: string
+): Promise<{ message: string; status: string }> {
+  // Digest tokens cover several matches, so the link also names the match
   return apiFetch('/matches/respond', {
     method: 'POST',
-    body: JSON.stringify(action ? { token, action } : { token }),
+    body: JSON.stringify({
+      token,
+      ...(action ? { action } : {}),
+      ...(matchId ? { match_id: matchId } : {}),
+    }),
   });
 }
 